@@ -0,0 +1,126 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import json
+import logging
+import six
+
+import orquesta
+from orquesta import conducting
+from orquesta.expressions import base as expr_base
+from orquesta import graphing
+from orquesta.specs import loader as spec_loader
+from orquesta.utils import plugin as plugin_util
+from orquesta.utils import specs as spec_util
+
+
+LOG = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = 1
+
+
+def get_expressions(statement):
+    expressions = []
+
+    if isinstance(statement, dict):
+        for k, v in six.iteritems(statement):
+            expressions.extend(get_expressions(k))
+            expressions.extend(get_expressions(v))
+
+    elif isinstance(statement, list):
+        for item in statement:
+            expressions.extend(get_expressions(item))
+
+    elif isinstance(statement, six.string_types) and expr_base.has_expressions(statement):
+        expressions.append(statement)
+
+    return sorted(set(expressions))
+
+
+class WorkflowArtifact(object):
+
+    def __init__(self, spec, graph, expressions=None):
+        self.spec = spec
+        self.graph = graph
+        self.expressions = expressions or []
+
+    @classmethod
+    def build(cls, definition, catalog='native'):
+        spec = spec_util.instantiate(catalog, definition)
+        spec.inspect(raise_exception=True)
+
+        composer = plugin_util.get_module('orquesta.composers', spec.get_catalog())
+        graph = composer.compose(spec)
+
+        return cls(spec, graph, expressions=get_expressions(spec.spec))
+
+    def serialize(self):
+        return {
+            'format': ARTIFACT_FORMAT,
+            'orquesta': orquesta.__version__,
+            'digest': self.spec.get_digest(),
+            'spec': self.spec.serialize(),
+            'graph': self.graph.serialize(),
+            'topology': self.graph.get_topology(),
+            'expressions': copy.deepcopy(self.expressions)
+        }
+
+    @classmethod
+    def deserialize(cls, data, precompile=True):
+        if data.get('format') != ARTIFACT_FORMAT:
+            raise ValueError('Workflow artifact format is not supported "%s".' % ARTIFACT_FORMAT)
+
+        if data.get('orquesta') != orquesta.__version__:
+            raise ValueError(
+                'Workflow artifact is built by a different version of orquesta "%s".' %
+                data.get('orquesta')
+            )
+
+        spec_module = spec_loader.get_spec_module(data['spec']['catalog'])
+        spec = spec_module.WorkflowSpec.deserialize(data['spec'])
+
+        if data.get('digest') != spec.get_digest():
+            raise ValueError('Workflow artifact digest does not match the workflow spec.')
+
+        graph = graphing.WorkflowGraph.deserialize(data['graph'], topology=data.get('topology'))
+        expressions = data.get('expressions', [])
+
+        # Parse the expressions in advance so they are cached by the evaluators
+        # and are not parsed again when the conductor renders the tasks.
+        if precompile:
+            expr_base.precompile(expressions)
+
+        return cls(spec, graph, expressions=list(expressions))
+
+    def get_conductor(self, context=None, inputs=None, expression_options=None):
+        # The conductor does not modify the graph so the precomposed graph
+        # is shared by all the conductors created from the artifact.
+        return conducting.WorkflowConductor(
+            self.spec,
+            context=context,
+            inputs=inputs,
+            graph=self.graph,
+            expression_options=expression_options
+        )
+
+
+def dump(artifact, path):
+    with open(path, 'w') as f:
+        json.dump(artifact.serialize(), f, sort_keys=True)
+
+
+def load(path, precompile=True):
+    with open(path, 'r') as f:
+        data = json.load(f)
+
+    return WorkflowArtifact.deserialize(data, precompile=precompile)
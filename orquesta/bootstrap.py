@@ -0,0 +1,97 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import logging
+import six
+
+from orquesta import artifacts
+from orquesta.expressions import base as expr_base
+from orquesta.expressions.functions import base as func_base
+from orquesta import graphing
+from orquesta.specs import loader as spec_loader
+from orquesta.utils import plugin as plugin_util
+
+
+LOG = logging.getLogger(__name__)
+
+_COMPOSER_NAMESPACE = 'orquesta.composers'
+
+_SPEC_CATALOGS = ['native', 'mistral']
+
+
+def load_evaluators():
+    func_base.load()
+
+    evaluators = expr_base.get_evaluators()
+
+    for name, evaluator in six.iteritems(evaluators):
+        evaluator.initialize()
+
+    return evaluators
+
+
+def load_composers():
+    composers = {}
+
+    for name in plugin_util.get_plugins(_COMPOSER_NAMESPACE).keys():
+        try:
+            composers[name] = plugin_util.get_module(_COMPOSER_NAMESPACE, name)
+        except Exception as e:
+            LOG.warning('Unable to load composer "%s". %s', name, str(e))
+
+    return composers
+
+
+def load_specs(catalogs):
+    for catalog in catalogs:
+        spec_module = spec_loader.get_spec_module(catalog)
+
+        # Merge the schema of the workflow spec and create the schema validator.
+        spec_module.WorkflowSpec.get_schema_validator()
+
+
+def freeze():
+    gc.collect()
+
+    # Move the objects that are alive to a permanent generation that is ignored by the garbage
+    # collector. Otherwise, collections in the child processes write to the memory pages of the
+    # objects and the pages that are shared with the parent process are copied. The freeze is
+    # only available in python 3.7 or newer.
+    gc_freeze = getattr(gc, 'freeze', None)
+
+    if gc_freeze is None:
+        return False
+
+    gc_freeze()
+
+    return True
+
+
+def warmup(definitions=None, catalog='native', catalogs=None, freeze_gc=True):
+    load_evaluators()
+    load_composers()
+    load_specs(catalogs or _SPEC_CATALOGS)
+
+    # Create an empty graph so the graph library is imported.
+    graphing.WorkflowGraph()
+
+    # Inspect and compose the workflow definitions and parse the expressions in advance.
+    compiled = [
+        artifacts.WorkflowArtifact.build(definition, catalog=catalog)
+        for definition in (definitions or [])
+    ]
+
+    if freeze_gc:
+        freeze()
+
+    return compiled
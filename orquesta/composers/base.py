@@ -32,3 +32,7 @@ class WorkflowComposer(object):
     @abc.abstractmethod
     def compose(cls, spec):
         raise NotImplementedError()
+
+    @classmethod
+    def get_status_criteria(cls, task_name, criterion):
+        return None
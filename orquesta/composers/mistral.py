@@ -11,6 +11,7 @@
 # limitations under the License.
 
 import logging
+import re
 from six.moves import queue
 
 from orquesta.composers import base as comp_base
@@ -27,6 +28,10 @@ TASK_TRANSITION_MAP = {
     'on-complete': statuses.COMPLETED_STATUSES
 }
 
+TASK_STATUS_CRITERIA_MAP = {str(v): v for v in TASK_TRANSITION_MAP.values()}
+
+TASK_STATUS_CRITERIA_REGEX = re.compile(r'^<% task_status\((\w+)\) in (\[.*\]) %>$')
+
 
 class WorkflowComposer(comp_base.WorkflowComposer):
     wf_spec_type = mistral_specs.WorkflowSpec
@@ -39,7 +44,22 @@ class WorkflowComposer(comp_base.WorkflowComposer):
         if not isinstance(spec, cls.wf_spec_type):
             raise TypeError('Unsupported spec type "%s".' % str(type(spec)))
 
-        return cls._compose_wf_graph(spec)
+        wf_graph = cls._compose_wf_graph(spec)
+
+        # Compile the task status predicates of the transition criteria in advance
+        # so the conductor does not need to parse the criteria on every task event.
+        wf_graph.compile_status_criteria(cls.get_status_criteria)
+
+        return wf_graph
+
+    @classmethod
+    def get_status_criteria(cls, task_name, criterion):
+        match = TASK_STATUS_CRITERIA_REGEX.match(criterion)
+
+        if not match or match.group(1) != task_name:
+            return None
+
+        return TASK_STATUS_CRITERIA_MAP.get(match.group(2))
 
     @classmethod
     def _compose_transition_criteria(cls, task_name, *args, **kwargs):
@@ -11,15 +11,27 @@
 # limitations under the License.
 
 import logging
+import re
 from six.moves import queue
 
 from orquesta.composers import base as comp_base
 from orquesta import graphing
 from orquesta.specs import native as native_specs
+from orquesta import statuses
 
 
 LOG = logging.getLogger(__name__)
 
+TASK_STATUS_CRITERIA_MAP = {
+    'succeeded': [statuses.SUCCEEDED],
+    'failed': [statuses.FAILED],
+    'completed': statuses.COMPLETED_STATUSES
+}
+
+TASK_STATUS_CRITERIA_REGEX = re.compile(
+    r'^\s*(?:<%\s*(\w+)\(\)\s*%>|{{\s*(\w+)\(\)\s*}})\s*$'
+)
+
 
 class WorkflowComposer(comp_base.WorkflowComposer):
     wf_spec_type = native_specs.WorkflowSpec
@@ -32,7 +44,22 @@ class WorkflowComposer(comp_base.WorkflowComposer):
         if not isinstance(spec, cls.wf_spec_type):
             raise TypeError('Unsupported spec type "%s".' % str(type(spec)))
 
-        return cls._compose_wf_graph(spec)
+        wf_graph = cls._compose_wf_graph(spec)
+
+        # Compile the task status predicates of the transition criteria in advance
+        # so the conductor does not need to parse the criteria on every task event.
+        wf_graph.compile_status_criteria(cls.get_status_criteria)
+
+        return wf_graph
+
+    @classmethod
+    def get_status_criteria(cls, task_name, criterion):
+        match = TASK_STATUS_CRITERIA_REGEX.match(criterion)
+
+        if not match:
+            return None
+
+        return TASK_STATUS_CRITERIA_MAP.get(match.group(1) or match.group(2))
 
     @classmethod
     def _compose_wf_graph(cls, wf_spec):
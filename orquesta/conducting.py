@@ -13,6 +13,7 @@
 import copy
 import logging
 import six
+import threading
 
 from six.moves import queue
 
@@ -33,6 +34,15 @@ from orquesta.utils import plugin as plugin_util
 LOG = logging.getLogger(__name__)
 
 
+class NullLock(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
 class WorkflowState(object):
 
     def __init__(self, conductor=None):
@@ -43,6 +53,15 @@ class WorkflowState(object):
         self.staged = list()
         self.status = statuses.UNSET
         self.tasks = dict()
+        self.transitioning = 0
+        self._contexts_lock = threading.Lock()
+
+    def add_context(self, ctx):
+        # Append and get the index in one step so concurrent appends do not get the same index.
+        with self._contexts_lock:
+            self.contexts.append(ctx)
+
+            return len(self.contexts) - 1
 
     def serialize(self):
         return {
@@ -82,7 +101,24 @@ class WorkflowState(object):
 
     @property
     def has_active_tasks(self):
-        return len(self.get_tasks_by_status(statuses.ACTIVE_STATUSES)) > 0
+        return (
+            self.transitioning > 0 or
+            len(self.get_tasks_by_status(statuses.ACTIVE_STATUSES)) > 0
+        )
+
+    def get_active_tasks_count(self):
+        # Tasks with items count the number of items in progress instead of the task itself.
+        active_items = {
+            (t['id'], t['route']): len([
+                i for i in t['items'] if i['status'] in statuses.ACTIVE_STATUSES
+            ])
+            for t in self.staged if t.get('items')
+        }
+
+        return sum([
+            active_items.get((t['id'], t['route']), 1)
+            for t in self.get_tasks_by_status(statuses.ACTIVE_STATUSES)
+        ])
 
     @property
     def has_pausing_tasks(self):
@@ -148,23 +184,45 @@ class WorkflowState(object):
 
 class WorkflowConductor(object):
 
-    def __init__(self, spec, context=None, inputs=None):
+    def __init__(self, spec, context=None, inputs=None, graph=None, thread_safe=False,
+                 expression_options=None):
         if not spec or not isinstance(spec, spec_base.Spec):
             raise ValueError('The value of "spec" is not type of Spec.')
 
+        if graph is not None and not isinstance(graph, graphing.WorkflowGraph):
+            raise ValueError('The value of "graph" is not type of WorkflowGraph.')
+
+        if expression_options is not None and not isinstance(expression_options, dict):
+            raise ValueError('The value of "expression_options" is not type of dict.')
+
+        expr_base.check_options((expression_options or {}).keys())
+
         self.spec = spec
         self.catalog = self.spec.get_catalog()
         self.spec_module = spec_loader.get_spec_module(self.catalog)
         self.composer = plugin_util.get_module('orquesta.composers', self.catalog)
 
         self._errors = []
-        self._graph = None
+        self._graph = graph
         self._inputs = inputs or {}
         self._log = []
         self._outputs = None
         self._parent_ctx = context or {}
         self._workflow_state = None
 
+        # The expression options such as nested_expansion only apply to this workflow. They
+        # override the global expression options while the conductor evaluates expressions.
+        self.expression_options = dict(expression_options or {})
+
+        # In thread safe mode, events for different tasks can be processed in parallel. The state
+        # lock guards the changes to the workflow state and the task lock serializes the events
+        # of the same task. The criteria and the contexts of the task transitions are evaluated
+        # while only the task lock is held.
+        self.thread_safe = thread_safe
+        self._state_lock = threading.RLock() if thread_safe else NullLock()
+        self._task_locks = {}
+        self._task_locks_lock = threading.Lock()
+
     def restore(self, graph, log=None, errors=None, state=None,
                 inputs=None, outputs=None, context=None):
         if not graph or not isinstance(graph, graphing.WorkflowGraph):
@@ -193,7 +251,7 @@ class WorkflowConductor(object):
         self._workflow_state.conductor = self
 
     def serialize(self):
-        return {
+        data = {
             'spec': self.spec.serialize(),
             'graph': self.graph.serialize(),
             'input': self.get_workflow_input(),
@@ -204,8 +262,13 @@ class WorkflowConductor(object):
             'output': self.get_workflow_output()
         }
 
+        if self.expression_options:
+            data['expression_options'] = copy.deepcopy(self.expression_options)
+
+        return data
+
     @classmethod
-    def deserialize(cls, data):
+    def deserialize(cls, data, thread_safe=False):
         spec_module = spec_loader.get_spec_module(data['spec']['catalog'])
         spec = spec_module.WorkflowSpec.deserialize(data['spec'])
 
@@ -216,8 +279,9 @@ class WorkflowConductor(object):
         log = copy.deepcopy(data.get('log', []))
         errors = copy.deepcopy(data['errors'])
         outputs = copy.deepcopy(data['output'])
+        expression_options = copy.deepcopy(data.get('expression_options'))
 
-        instance = cls(spec)
+        instance = cls(spec, thread_safe=thread_safe, expression_options=expression_options)
         instance.restore(graph, log, errors, state, inputs, outputs, context)
 
         return instance
@@ -227,51 +291,65 @@ class WorkflowConductor(object):
         if not self._graph:
             self._graph = self.composer.compose(self.spec)
 
+        # The task status predicates are not serialized with the graph so they are
+        # compiled once when a deserialized or precomposed graph is first loaded.
+        if not self._graph.has_status_criteria():
+            self._graph.compile_status_criteria(self.composer.get_status_criteria)
+
         return self._graph
 
     @property
     def workflow_state(self):
         if not self._workflow_state:
-            self._workflow_state = WorkflowState(conductor=self)
+            with self._state_lock:
+                if not self._workflow_state:
+                    with self._expression_options():
+                        self._init_workflow_state()
 
-            # Set any given context as the initial context.
-            init_ctx = self.get_workflow_parent_context()
+        return self._workflow_state
 
-            # Render workflow inputs and merge into the initial context.
-            workflow_input = self.get_workflow_input()
-            rendered_inputs, input_errors = self.spec.render_input(workflow_input, init_ctx)
-            init_ctx = dict_util.merge_dicts(init_ctx, rendered_inputs, True)
+    def _expression_options(self):
+        return expr_base.options(**self.expression_options)
 
-            # Render workflow variables and merge into the initial context.
-            rendered_vars, var_errors = self.spec.render_vars(init_ctx)
-            init_ctx = dict_util.merge_dicts(init_ctx, rendered_vars, True)
+    def _init_workflow_state(self):
+        self._workflow_state = WorkflowState(conductor=self)
 
-            # Fail workflow if there are errors.
-            errors = input_errors + var_errors
+        # Set any given context as the initial context.
+        init_ctx = self.get_workflow_parent_context()
 
-            if errors:
-                self.log_errors(errors)
-                self.request_workflow_status(statuses.FAILED)
+        # Render workflow inputs and merge into the initial context.
+        workflow_input = self.get_workflow_input()
+        rendered_inputs, input_errors = self.spec.render_input(workflow_input, init_ctx)
+        init_ctx = dict_util.merge_dicts(init_ctx, rendered_inputs, True)
 
-            # Proceed if there is no issue with rendering of inputs and vars.
-            if self.get_workflow_status() not in statuses.ABENDED_STATUSES:
-                # Set the initial workflow context.
-                self._workflow_state.contexts.append(init_ctx)
+        # Render workflow variables and merge into the initial context.
+        rendered_vars, var_errors = self.spec.render_vars(init_ctx)
+        init_ctx = dict_util.merge_dicts(init_ctx, rendered_vars, True)
 
-                # Set the initial execution route.
-                self._workflow_state.routes.append([])
+        # Fail workflow if there are errors.
+        errors = input_errors + var_errors
 
-                # Identify the starting tasks and set the pointer to the initial context entry.
-                for task_node in self.graph.roots:
-                    ctxs, route = [0], 0
-                    self._workflow_state.add_staged_task(
-                        task_node['id'],
-                        route,
-                        ctxs=ctxs,
-                        ready=True
-                    )
+        if errors:
+            self.log_errors(errors)
+            self.request_workflow_status(statuses.FAILED)
 
-        return self._workflow_state
+        # Proceed if there is no issue with rendering of inputs and vars.
+        if self.get_workflow_status() not in statuses.ABENDED_STATUSES:
+            # Set the initial workflow context.
+            self._workflow_state.add_context(init_ctx)
+
+            # Set the initial execution route.
+            self._workflow_state.routes.append([])
+
+            # Identify the starting tasks and set the pointer to the initial context entry.
+            for task_node in self.graph.roots:
+                ctxs, route = [0], 0
+                self._workflow_state.add_staged_task(
+                    task_node['id'],
+                    route,
+                    ctxs=ctxs,
+                    ready=True
+                )
 
     @property
     def errors(self):
@@ -299,12 +377,13 @@ class WorkflowConductor(object):
         dict_util.set_dict_value(entry, 'result', result, insert_null=False)
         dict_util.set_dict_value(entry, 'data', data, insert_null=False)
 
-        # Ignore if this is a duplicate.
-        if len(list(filter(lambda x: x == entry, log))) > 0:
-            return
+        with self._state_lock:
+            # Ignore if this is a duplicate.
+            if len(list(filter(lambda x: x == entry, log))) > 0:
+                return
 
-        # Append the log entry.
-        log.append(entry)
+            # Append the log entry.
+            log.append(entry)
 
     def log_error(self, e, task_id=None, route=None, task_transition_id=None):
         self.log_entry(
@@ -340,6 +419,10 @@ class WorkflowConductor(object):
         self.workflow_state.status = value
 
     def request_workflow_status(self, status):
+        with self._state_lock, self._expression_options():
+            self._request_workflow_status(status)
+
+    def _request_workflow_status(self, status):
         # Record current workflow status.
         current_status = self.get_workflow_status()
 
@@ -363,6 +446,21 @@ class WorkflowConductor(object):
     def get_workflow_initial_context(self):
         return copy.deepcopy(self.workflow_state.contexts[0])
 
+    def get_workflow_concurrency(self):
+        concurrency = getattr(self.spec, 'concurrency', None)
+
+        if isinstance(concurrency, six.string_types):
+            with self._expression_options():
+                concurrency = expr_base.evaluate(concurrency, self.get_workflow_initial_context())
+
+        if concurrency is not None and not isinstance(concurrency, int):
+            raise TypeError('The value of workflow concurrency is not type of integer.')
+
+        if concurrency is not None and concurrency < 1:
+            raise ValueError('The value of workflow concurrency is less than 1.')
+
+        return concurrency
+
     def get_workflow_terminal_context(self):
         if self.get_workflow_status() not in statuses.COMPLETED_STATUSES:
             raise exc.WorkflowContextError('Workflow is not in completed status.')
@@ -394,12 +492,16 @@ class WorkflowConductor(object):
         return wf_term_ctx
 
     def _render_workflow_outputs(self):
+        with self._state_lock:
+            self._render_workflow_outputs_locked()
+
+    def _render_workflow_outputs_locked(self):
         wf_status = self.get_workflow_status()
 
         # Render workflow outputs if workflow is completed.
         if wf_status in statuses.COMPLETED_STATUSES and not self._outputs:
             workflow_ctx = self.get_workflow_terminal_context()
-            state_ctx = {'__state': self.workflow_state.serialize()}
+            state_ctx = {'__state': self._get_workflow_state_snapshot()}
             workflow_ctx = dict_util.merge_dicts(workflow_ctx, state_ctx, True)
             outputs, errors = self.spec.render_output(workflow_ctx)
 
@@ -441,17 +543,80 @@ class WorkflowConductor(object):
 
         return (len(inbounds_satisfied) >= barrier)
 
-    def get_task(self, task_id, route):
-        try:
-            task_ctx = self.get_task_initial_context(task_id, route)
-        except ValueError:
-            task_ctx = self.get_workflow_initial_context()
+    def get_task_durations(self, durations=None, default_duration=0.0):
+        task_durations = {}
+
+        # Map the duration of the actions to the tasks. Tasks with no action take no time and the
+        # default is used for tasks whose action is an expression or has no duration given.
+        for task_id in self.graph.get_task_attributes('id').keys():
+            action = getattr(self.spec.tasks.get_task(task_id), 'action', None)
+
+            if not action:
+                task_durations[task_id] = 0.0
+            elif expr_base.has_expressions(action):
+                task_durations[task_id] = default_duration
+            else:
+                action = action.split(' ')[0]
+                task_durations[task_id] = (durations or {}).get(action, default_duration)
+
+        return task_durations
+
+    def get_critical_path(self, durations=None, default_duration=0.0, iterations=None,
+                          default_iterations=1, status=statuses.SUCCEEDED):
+        # Only follow the task transitions that check for the given task status
+        # or whose criteria cannot be determined until the workflow runs.
+        def criteria(task_id, criterion):
+            status_criteria = self.composer.get_status_criteria(task_id, criterion)
+
+            return status_criteria is None or status in status_criteria
+
+        return self.graph.get_critical_path(
+            durations=self.get_task_durations(durations, default_duration),
+            default_duration=default_duration,
+            iterations=iterations,
+            default_iterations=default_iterations,
+            criteria=criteria
+        )
+
+    def _get_workflow_state_snapshot(self):
+        # The snapshot of the workflow state is for evaluating the expressions in the task context.
+        return self.workflow_state.serialize()
+
+    def _get_task_context(self, task_id, route):
+        with self._state_lock:
+            try:
+                task_ctx = self.get_task_initial_context(task_id, route)
+            except ValueError:
+                task_ctx = self.get_workflow_initial_context()
+
+            state = self._get_workflow_state_snapshot()
 
-        state_ctx = {'__state': self.workflow_state.serialize()}
         current_task = {'id': task_id, 'route': route}
         task_ctx = ctx_util.set_current_task(task_ctx, current_task)
-        task_ctx = dict_util.merge_dicts(task_ctx, state_ctx, True)
-        task_spec = self.spec.tasks.get_task(task_id).copy()
+
+        # The snapshot is set instead of merged since the copies of the context share it.
+        task_ctx['__state'] = state
+
+        return task_ctx
+
+    def _get_task_priority(self, task_spec, task_ctx=None):
+        task_priority = getattr(task_spec, 'priority', None)
+
+        if isinstance(task_priority, six.string_types):
+            task_priority = expr_base.evaluate(task_priority, task_ctx)
+
+        if task_priority is not None and not isinstance(task_priority, int):
+            raise TypeError('The value of task priority is not type of integer.')
+
+        return task_priority
+
+    def get_task(self, task_id, route):
+        with self._expression_options():
+            return self._get_task(task_id, route)
+
+    def _get_task(self, task_id, route):
+        task_ctx = self._get_task_context(task_id, route)
+        task_spec = self.spec.tasks.get_task(task_id)
         task_spec, action_specs = task_spec.render(task_ctx)
 
         task = {
@@ -474,6 +639,12 @@ class WorkflowConductor(object):
 
             task['delay'] = task_delay
 
+        # If there is a task priority specified, evaluate the priority value.
+        task_priority = self._get_task_priority(task_spec, task_ctx)
+
+        if task_priority is not None:
+            task['priority'] = task_priority
+
         # Add items and related meta data to the task details.
         if task_spec.has_items():
             items_spec = getattr(task_spec, 'with')
@@ -483,7 +654,7 @@ class WorkflowConductor(object):
 
         return task
 
-    def _evaluate_task_actions(self, task):
+    def _evaluate_task_actions(self, task, capacity=None):
         task_id = task['id']
         task_route = task['route']
 
@@ -503,13 +674,17 @@ class WorkflowConductor(object):
         notrun_items = list(filter(lambda x: x[1]['status'] == statuses.UNSET, all_items))
         active_items = list(filter(lambda x: x[1]['status'] in statuses.ACTIVE_STATUSES, all_items))
 
+        availability = len(notrun_items)
+
         if task['concurrency'] is not None:
-            availability = task['concurrency'] - len(active_items)
-            candidates = list(zip(*notrun_items[:availability]))
-            task['actions'] = list(candidates[0]) if candidates and availability > 0 else []
-        else:
-            candidates = list(zip(*notrun_items))
-            task['actions'] = list(candidates[0]) if candidates else []
+            availability = min(availability, task['concurrency'] - len(active_items))
+
+        # Trim the list of actions further per the number of actions the workflow can still run.
+        if capacity is not None:
+            availability = min(availability, capacity)
+
+        candidates = list(zip(*notrun_items[:max(availability, 0)]))
+        task['actions'] = list(candidates[0]) if candidates else []
 
         return task
 
@@ -544,25 +719,62 @@ class WorkflowConductor(object):
 
         return False
 
-    def get_next_tasks(self):
+    def get_next_tasks(self, critical_path=None, limit=None, cursor=None):
         next_tasks = []
 
         # Return an empty list if the workflow is not running.
         if self.get_workflow_status() not in statuses.RUNNING_STATUSES:
             return next_tasks
 
+        try:
+            concurrency = self.get_workflow_concurrency()
+        except Exception as e:
+            self.log_error(e)
+            self.request_workflow_status(statuses.FAILED)
+            return []
+
+        with self._state_lock:
+            staged_tasks = [(t['id'], t['route']) for t in self.workflow_state.get_staged_tasks()]
+
+            # Identify the number of actions that can still run per the workflow concurrency.
+            capacity = (
+                concurrency - self.workflow_state.get_active_tasks_count()
+                if concurrency is not None else None
+            )
+
+        # If paging thru the tasks or if the workflow concurrency is set, order the staged
+        # tasks before they are rendered so only the tasks to be returned are rendered.
+        if limit is not None or cursor is not None or capacity is not None:
+            staged_tasks = self._get_ordered_staged_tasks(staged_tasks, critical_path, cursor)
+
         # Return the list of tasks that are staged and readied.
-        for staged_task in self.workflow_state.get_staged_tasks():
+        for staged_task_id, staged_task_route in staged_tasks:
+            if limit is not None and len(next_tasks) >= limit:
+                break
+
+            # Hold back the rest of the staged tasks if the workflow concurrency is reached.
+            if capacity is not None and capacity <= 0:
+                break
+
             try:
-                next_task = self.get_task(staged_task['id'], staged_task['route'])
-                next_task = self._evaluate_task_actions(next_task)
+                next_task = self.get_task(staged_task_id, staged_task_route)
+
+                with self._state_lock:
+                    # Skip the task if it is removed from staging by another thread.
+                    if not self.workflow_state.get_staged_task(staged_task_id, staged_task_route):
+                        continue
+
+                    next_task = self._evaluate_task_actions(next_task, capacity=capacity)
 
                 if 'actions' in next_task and len(next_task['actions']) > 0:
                     next_tasks.append(next_task)
+
+                    if capacity is not None:
+                        capacity -= len(next_task['actions'])
                 elif 'items_count' in next_task and next_task['items_count'] == 0:
                     next_tasks.append(next_task)
             except Exception as e:
-                self.log_error(e, task_id=staged_task['id'], route=staged_task['route'])
+                self.log_error(e, task_id=staged_task_id, route=staged_task_route)
                 self.request_workflow_status(statuses.FAILED)
                 continue
 
@@ -570,7 +782,51 @@ class WorkflowConductor(object):
         if self.get_workflow_status() in statuses.COMPLETED_STATUSES:
             return []
 
-        return sorted(next_tasks, key=lambda x: (x['id'], x['route']))
+        return sorted(next_tasks, key=lambda x: self._get_task_sort_key(x, critical_path))
+
+    def _get_ordered_staged_tasks(self, staged_tasks, critical_path=None, cursor=None):
+        ordered_tasks = []
+
+        # The cursor is the last task returned in the previous page.
+        cursor_key = self._get_task_sort_key(cursor, critical_path) if cursor else None
+
+        for staged_task_id, staged_task_route in staged_tasks:
+            task = {'id': staged_task_id, 'route': staged_task_route}
+
+            try:
+                task_spec = self.spec.tasks.get_task(staged_task_id)
+                task_priority = getattr(task_spec, 'priority', None)
+
+                # Only get the task context if the priority is an expression.
+                if isinstance(task_priority, six.string_types):
+                    task_ctx = self._get_task_context(staged_task_id, staged_task_route)
+                    task_priority = self._get_task_priority(task_spec, task_ctx)
+                else:
+                    task_priority = self._get_task_priority(task_spec)
+            except Exception as e:
+                self.log_error(e, task_id=staged_task_id, route=staged_task_route)
+                self.request_workflow_status(statuses.FAILED)
+                continue
+
+            if task_priority is not None:
+                task['priority'] = task_priority
+
+            task_key = self._get_task_sort_key(task, critical_path)
+
+            if cursor_key is None or task_key > cursor_key:
+                ordered_tasks.append((task_key, staged_task_id, staged_task_route))
+
+        return [(task_id, route) for sort_key, task_id, route in sorted(ordered_tasks)]
+
+    def _get_task_sort_key(self, task, critical_path=None):
+        # Tasks with higher priority go first. Tasks with the same priority are ordered by the
+        # length of the critical path from the task to the end of the workflow if given.
+        tail = 0.0
+
+        if critical_path:
+            tail = critical_path['tasks'].get(task['id'], {}).get('tail', 0.0)
+
+        return (-task.get('priority', 0), -tail, task['id'], task['route'])
 
     def _get_task_state_idx(self, task_id, route):
         return self.workflow_state.tasks.get(
@@ -608,7 +864,25 @@ class WorkflowConductor(object):
 
         return task_state_entry
 
+    def _get_task_lock(self, task_id, route):
+        if not self.thread_safe:
+            return self._state_lock
+
+        task_lock_id = constants.TASK_STATE_ROUTE_FORMAT % (task_id, str(route))
+
+        with self._task_locks_lock:
+            if task_lock_id not in self._task_locks:
+                self._task_locks[task_lock_id] = threading.RLock()
+
+            return self._task_locks[task_lock_id]
+
     def update_task_state(self, task_id, route, event):
+        with self._expression_options():
+            task_state_entry, wf_completed = self._update_task_state(task_id, route, event)
+
+        return task_state_entry
+
+    def _update_task_state(self, task_id, route, event):
         engine_event_queue = queue.Queue()
 
         # Throw exception if not expected event type.
@@ -619,6 +893,79 @@ class WorkflowConductor(object):
         if not self.graph.has_task(task_id):
             raise exc.InvalidTask(task_id)
 
+        with self._get_task_lock(task_id, route):
+            with self._state_lock:
+                task_state_entry, task_state_idx, task_transitions, current_ctx = (
+                    self._process_task_event(task_id, route, event)
+                )
+
+            # Evaluate the criteria and the outgoing contexts of the task transitions.
+            try:
+                evaluated_transitions = self._evaluate_task_transitions(
+                    task_id,
+                    task_state_entry['status'],
+                    task_transitions,
+                    current_ctx
+                )
+            except Exception:
+                with self._state_lock:
+                    if task_transitions:
+                        self.workflow_state.transitioning -= 1
+
+                raise
+
+            with self._state_lock:
+                for evaluated_transition in evaluated_transitions:
+                    self._apply_task_transition(
+                        task_id,
+                        route,
+                        task_state_entry,
+                        task_state_idx,
+                        evaluated_transition,
+                        engine_event_queue
+                    )
+
+                # Stop tracking the task now that the result of the transitions is applied.
+                if task_transitions:
+                    self.workflow_state.transitioning -= 1
+
+                # Process the task event using the workflow state machine
+                # and update the workflow status.
+                task_ex_event = events.TaskExecutionEvent(
+                    task_id,
+                    route,
+                    task_state_entry['status']
+                )
+
+                machines.WorkflowStateMachine.process_event(self.workflow_state, task_ex_event)
+
+                # Check whether the workflow is completed by this event.
+                wf_completed = self.get_workflow_status() in statuses.COMPLETED_STATUSES
+
+        # Process any engine commands in the queue.
+        while not engine_event_queue.empty():
+            next_task_id, next_task_route = engine_event_queue.get()
+            engine_event = events.ENGINE_EVENT_MAP[next_task_id]
+            next_task_state_entry, next_wf_completed = self._update_task_state(
+                next_task_id,
+                next_task_route,
+                engine_event()
+            )
+
+            wf_completed = wf_completed or next_wf_completed
+
+        # Render workflow output if workflow is completed.
+        if wf_completed:
+            with self._state_lock:
+                task_state_entry['term'] = True
+                self._render_workflow_outputs()
+
+        return task_state_entry, wf_completed
+
+    def _process_task_event(self, task_id, route, event):
+        task_transitions = []
+        current_ctx = None
+
         # Try to get the task metadata from staging or task state.
         staged_task = self.workflow_state.get_staged_task(task_id, route)
         task_state_entry = self.get_task_state_entry(task_id, route)
@@ -693,130 +1040,185 @@ class WorkflowConductor(object):
             current_task = {'id': task_id, 'route': route, 'result': task_result}
             current_ctx = ctx_util.set_current_task(in_ctx_val, current_task)
 
-            # Setup context for evaluating expressions in task transition criteria.
-            state_ctx = {'__state': self.workflow_state.serialize()}
-            current_ctx = dict_util.merge_dicts(current_ctx, state_ctx, True)
-
-        # Evaluate task transitions if task is completed and status change is not processed.
+        # Identify task transitions if task is completed and status change is not processed.
         if new_task_status in statuses.COMPLETED_STATUSES and new_task_status != old_task_status:
-            # Identify task transitions for the current completed task.
             task_transitions = self.graph.get_next_transitions(task_id)
 
             # Mark task as terminal when there is no transitions.
             if not task_transitions:
                 task_state_entry['term'] = True
 
-            # Iterate thru each outbound task transitions.
-            for task_transition in task_transitions:
-                task_transition_id = (
+        # Setup context for evaluating expressions in task transition criteria. The workflow
+        # state is only copied into the context if there are transitions to evaluate.
+        if task_transitions:
+            current_ctx['__state'] = self._get_workflow_state_snapshot()
+
+        # Track the task until the result of the transitions is applied so the workflow is
+        # not considered dormant while the transitions are evaluated by another thread.
+        if task_transitions:
+            self.workflow_state.transitioning += 1
+
+        return task_state_entry, task_state_idx, task_transitions, current_ctx
+
+    def _evaluate_task_transitions(self, task_id, task_status, task_transitions, current_ctx):
+        evaluated_transitions = []
+
+        if not task_transitions:
+            return evaluated_transitions
+
+        task_spec = self.spec.tasks.get_task(task_id)
+
+        # Keep track of evaluated criteria so identical criteria that are shared
+        # across the task transitions are only evaluated once.
+        evaluated_criteria = {}
+
+        # Iterate thru each outbound task transitions.
+        for task_transition in task_transitions:
+            evaluated_transition = {
+                'transition': task_transition,
+                'id': (
                     constants.TASK_STATE_TRANSITION_FORMAT %
                     (task_transition[1], str(task_transition[2]))
                 )
+            }
 
-                # Evaluate the criteria for task transition. If there is a failure while
-                # evaluating expression(s), fail the workflow.
-                try:
-                    criteria = task_transition[3].get('criteria') or []
-                    evaluated_criteria = [expr_base.evaluate(c, current_ctx) for c in criteria]
-                    task_state_entry['next'][task_transition_id] = all(evaluated_criteria)
-                except Exception as e:
-                    self.log_error(e, task_id, route, task_transition_id)
-                    self.request_workflow_status(statuses.FAILED)
-                    continue
+            evaluated_transitions.append(evaluated_transition)
 
-                # If criteria met, then mark the next task staged and calculate outgoing context.
-                if task_state_entry['next'][task_transition_id]:
-                    next_task_node = self.graph.get_task(task_transition[1])
-                    next_task_id = next_task_node['id']
-                    new_ctx_idx = None
-
-                    # Get and process new context for the task transition.
-                    out_ctx, new_ctx, errors = task_spec.finalize_context(
-                        next_task_id,
-                        task_transition,
-                        copy.deepcopy(current_ctx)
-                    )
+            # Evaluate the criteria for task transition. The error is
+            # logged when the result of the evaluation is applied.
+            try:
+                criteria = task_transition[3].get('criteria') or []
+                evaluated_transition['satisfied'] = self._evaluate_criteria(
+                    task_status,
+                    criteria,
+                    self.graph.get_status_criteria(*task_transition[0:3]),
+                    current_ctx,
+                    evaluated_criteria
+                )
+            except Exception as e:
+                evaluated_transition['error'] = e
+                continue
 
-                    if errors:
-                        self.log_errors(errors, task_id, route, task_transition_id)
-                        self.request_workflow_status(statuses.FAILED)
-                        continue
+            # If criteria met, then calculate outgoing context for the next task.
+            if evaluated_transition['satisfied']:
+                next_task_id = self.graph.get_task(task_transition[1])['id']
 
-                    out_ctx_idxs = copy.deepcopy(task_state_entry['ctxs']['in'])
+                out_ctx, new_ctx, errors = task_spec.finalize_context(
+                    next_task_id,
+                    task_transition,
+                    ctx_util.copy_context(current_ctx)
+                )
 
-                    if new_ctx:
-                        self.workflow_state.contexts.append(new_ctx)
-                        new_ctx_idx = len(self.workflow_state.contexts) - 1
+                evaluated_transition['new_ctx'] = new_ctx
+                evaluated_transition['errors'] = errors
 
-                        # Add to the list of contexts for the next task in this transition.
-                        out_ctx_idxs.append(new_ctx_idx)
+        return evaluated_transitions
 
-                        # Record the outgoing context for this task transition.
-                        if 'out' not in task_state_entry['ctxs']:
-                            task_state_entry['ctxs']['out'] = {}
+    def _apply_task_transition(self, task_id, route, task_state_entry, task_state_idx,
+                               evaluated_transition, engine_event_queue):
+        task_transition = evaluated_transition['transition']
+        task_transition_id = evaluated_transition['id']
 
-                        task_state_entry['ctxs']['out'] = {task_transition_id: new_ctx_idx}
+        # If there is a failure while evaluating expression(s), fail the workflow.
+        if 'error' in evaluated_transition:
+            self.log_error(evaluated_transition['error'], task_id, route, task_transition_id)
+            self.request_workflow_status(statuses.FAILED)
+            return
 
-                    # Stage the next task if it is not in staging.
-                    next_task_route = self._evaluate_route(task_transition, route)
+        task_state_entry['next'][task_transition_id] = evaluated_transition['satisfied']
 
-                    staged_next_task = self.workflow_state.get_staged_task(
-                        next_task_id,
-                        next_task_route
-                    )
+        # If criteria not met, then there is nothing to stage.
+        if not evaluated_transition['satisfied']:
+            return
 
-                    backref = (
-                        constants.TASK_STATE_TRANSITION_FORMAT %
-                        (task_id, str(task_transition[2]))
-                    )
+        # Fail the workflow if there are errors processing the new context.
+        if evaluated_transition['errors']:
+            self.log_errors(evaluated_transition['errors'], task_id, route, task_transition_id)
+            self.request_workflow_status(statuses.FAILED)
+            return
 
-                    # If the next task is already staged.
-                    if staged_next_task:
-                        # Remove the root context to avoid overwriting vars.
-                        out_ctx_idxs.remove(0)
-
-                        # Extend the outgoing context from this task.
-                        staged_next_task['ctxs']['in'].extend(out_ctx_idxs)
-
-                        # Add a backref for the current task in the next task.
-                        staged_next_task['prev'][backref] = task_state_idx
-                    else:
-                        # Otherwise create a new entry in staging for the next task.
-                        staged_next_task = self.workflow_state.add_staged_task(
-                            next_task_id,
-                            next_task_route,
-                            ctxs=out_ctx_idxs,
-                            prev={backref: task_state_idx},
-                            ready=False
-                        )
-
-                    # Check if inbound criteria are met. Must use the original route
-                    # to identify the inbound task transitions.
-                    staged_next_task['ready'] = self._inbound_criteria_satisfied(
-                        next_task_id,
-                        route
-                    )
+        next_task_id = self.graph.get_task(task_transition[1])['id']
+        new_ctx = evaluated_transition['new_ctx']
+        out_ctx_idxs = copy.deepcopy(task_state_entry['ctxs']['in'])
 
-                    # If the next task is noop, then mark the task as completed.
-                    if next_task_id in events.ENGINE_EVENT_MAP.keys():
-                        engine_event_queue.put((staged_next_task['id'], staged_next_task['route']))
+        if new_ctx:
+            new_ctx_idx = self.workflow_state.add_context(new_ctx)
 
-        # Process the task event using the workflow state machine and update the workflow status.
-        task_ex_event = events.TaskExecutionEvent(task_id, route, task_state_entry['status'])
-        machines.WorkflowStateMachine.process_event(self.workflow_state, task_ex_event)
+            # Add to the list of contexts for the next task in this transition.
+            out_ctx_idxs.append(new_ctx_idx)
 
-        # Process any engine commands in the queue.
-        while not engine_event_queue.empty():
-            next_task_id, next_task_route = engine_event_queue.get()
-            engine_event = events.ENGINE_EVENT_MAP[next_task_id]
-            self.update_task_state(next_task_id, next_task_route, engine_event())
+            # Record the outgoing context for this task transition.
+            if 'out' not in task_state_entry['ctxs']:
+                task_state_entry['ctxs']['out'] = {}
 
-        # Render workflow output if workflow is completed.
-        if self.get_workflow_status() in statuses.COMPLETED_STATUSES:
-            task_state_entry['term'] = True
-            self._render_workflow_outputs()
+            task_state_entry['ctxs']['out'] = {task_transition_id: new_ctx_idx}
 
-        return task_state_entry
+        # Stage the next task if it is not in staging.
+        next_task_route = self._evaluate_route(task_transition, route)
+
+        staged_next_task = self.workflow_state.get_staged_task(
+            next_task_id,
+            next_task_route
+        )
+
+        backref = (
+            constants.TASK_STATE_TRANSITION_FORMAT %
+            (task_id, str(task_transition[2]))
+        )
+
+        # If the next task is already staged.
+        if staged_next_task:
+            # Remove the root context to avoid overwriting vars.
+            out_ctx_idxs.remove(0)
+
+            # Extend the outgoing context from this task.
+            staged_next_task['ctxs']['in'].extend(out_ctx_idxs)
+
+            # Add a backref for the current task in the next task.
+            staged_next_task['prev'][backref] = task_state_idx
+        else:
+            # Otherwise create a new entry in staging for the next task.
+            staged_next_task = self.workflow_state.add_staged_task(
+                next_task_id,
+                next_task_route,
+                ctxs=out_ctx_idxs,
+                prev={backref: task_state_idx},
+                ready=False
+            )
+
+        # Check if inbound criteria are met. Must use the original route
+        # to identify the inbound task transitions.
+        staged_next_task['ready'] = self._inbound_criteria_satisfied(
+            next_task_id,
+            route
+        )
+
+        # If the next task is noop, then mark the task as completed.
+        if next_task_id in events.ENGINE_EVENT_MAP.keys():
+            engine_event_queue.put((staged_next_task['id'], staged_next_task['route']))
+
+    def _evaluate_criteria(self, task_status, criteria, status_criteria, ctx, evaluated_criteria):
+        for criterion, criterion_statuses in six.moves.zip_longest(criteria, status_criteria or []):
+            # Check the task status directly if the criterion is a simple status check.
+            if criterion not in evaluated_criteria and criterion_statuses is not None:
+                evaluated_criteria[criterion] = (task_status in criterion_statuses, None)
+
+            if criterion not in evaluated_criteria:
+                try:
+                    evaluated_criteria[criterion] = (expr_base.evaluate(criterion, ctx), None)
+                except Exception as e:
+                    evaluated_criteria[criterion] = (None, e)
+
+            result, error = evaluated_criteria[criterion]
+
+            if error:
+                raise error
+
+            # Short circuit if any of the criterion is not met.
+            if not result:
+                return False
+
+        return True
 
     def _evaluate_route(self, task_transition, prev_route):
         task_id = task_transition[1]
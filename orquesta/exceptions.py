@@ -48,6 +48,12 @@ class SchemaIncompatibleError(Exception):
     pass
 
 
+class SpecImmutableError(AttributeError):
+
+    def __init__(self, name):
+        AttributeError.__init__(self, 'Spec is immutable and "%s" cannot be set.' % name)
+
+
 class InvalidTask(Exception):
 
     def __init__(self, task_id):
@@ -123,3 +129,7 @@ class WorkflowContextError(Exception):
 
 class WorkflowLogEntryError(Exception):
     pass
+
+
+class ConductorHostError(Exception):
+    pass
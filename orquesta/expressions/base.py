@@ -11,13 +11,14 @@
 # limitations under the License.
 
 import abc
+import contextlib
 import inspect
 import logging
 import re
 import six
+import threading
 
-from stevedore import extension
-
+from orquesta.expressions.functions import base as func_base
 from orquesta.utils import expression as expr_util
 from orquesta.utils import plugin as plugin_util
 
@@ -27,6 +28,49 @@ LOG = logging.getLogger(__name__)
 _EXP_EVALUATORS = None
 _EXP_EVALUATOR_NAMESPACE = 'orquesta.expressions.evaluators'
 
+_EXP_CTX_FUNC_REGEX = None
+
+# Options that change how expressions are evaluated. The options can be set globally
+# or overridden for the current thread within the scope of the options context manager.
+# The workflow conductor applies the expression options of the workflow this way.
+_EXP_OPTIONS = {
+    # Evaluate into native python types using the native environment if the
+    # evaluator supports it instead of rendering intermediate results to strings.
+    'native_types': False,
+
+    # Evaluate again any string result from an expression in case the string contains
+    # nested expressions. The expansion can be disabled or limited to strings that are
+    # not longer than the max size to avoid scanning large strings such as logs.
+    'nested_expansion': True,
+    'nested_expansion_max_size': None
+}
+
+_EXP_OPTIONS_LOCAL = threading.local()
+
+# Counters to track how often string results are checked for nested expressions and how
+# often the check actually finds new expressions to evaluate.
+_EXP_STATS_LOCK = threading.Lock()
+
+_EXP_STATS = {
+    'nested_expansion_checked': 0,
+    'nested_expansion_expanded': 0,
+    'nested_expansion_skipped': 0
+}
+
+_EXP_BUILTIN_FUNC_PKG = 'orquesta.expressions.functions'
+
+# Regular expressions to identify references to the context in an expression. Any reference
+# to the ctx function that does not match one of the static patterns below is considered
+# dynamic and the variable it accesses cannot be determined until evaluation.
+_REGEX_CTX_REF = re.compile(r'\bctx\s*\(')
+
+_REGEX_CTX_STATIC_REFS = [
+    re.compile(r'\bctx\s*\(\s*\)\.(\w+)\b(?!\s*\()'),
+    re.compile(r'\bctx\s*\(\s*(\w+)\s*\)'),
+    re.compile(r'\bctx\s*\(\s*\'([^\']+)\'\s*\)'),
+    re.compile(r'\bctx\s*\(\s*"([^"]+)"\s*\)')
+]
+
 
 @six.add_metaclass(abc.ABCMeta)
 class Evaluator(object):
@@ -64,6 +108,93 @@ class Evaluator(object):
     def extract_vars(cls, statement):
         raise NotImplementedError()
 
+    @classmethod
+    def precompile(cls, text):
+        return []
+
+    @classmethod
+    def initialize(cls):
+        pass
+
+
+def get_options():
+    opts = dict(_EXP_OPTIONS)
+
+    for overrides in getattr(_EXP_OPTIONS_LOCAL, 'stack', []):
+        opts.update(overrides)
+
+    return opts
+
+
+def check_options(names):
+    for name in names:
+        if name not in _EXP_OPTIONS:
+            raise KeyError('The expression option "%s" is not valid.' % name)
+
+
+def get_option(name):
+    check_options([name])
+
+    for overrides in reversed(getattr(_EXP_OPTIONS_LOCAL, 'stack', [])):
+        if name in overrides:
+            return overrides[name]
+
+    return _EXP_OPTIONS[name]
+
+
+def set_options(**kwargs):
+    check_options(kwargs.keys())
+    _EXP_OPTIONS.update(kwargs)
+
+
+@contextlib.contextmanager
+def options(**kwargs):
+    check_options(kwargs.keys())
+
+    if not hasattr(_EXP_OPTIONS_LOCAL, 'stack'):
+        _EXP_OPTIONS_LOCAL.stack = []
+
+    _EXP_OPTIONS_LOCAL.stack.append(kwargs)
+
+    try:
+        yield get_options()
+    finally:
+        _EXP_OPTIONS_LOCAL.stack.pop()
+
+
+def get_stats():
+    with _EXP_STATS_LOCK:
+        return dict(_EXP_STATS)
+
+
+def reset_stats():
+    with _EXP_STATS_LOCK:
+        for name in _EXP_STATS.keys():
+            _EXP_STATS[name] = 0
+
+
+def _incr_stat(name):
+    with _EXP_STATS_LOCK:
+        _EXP_STATS[name] += 1
+
+
+def is_nested_expansion_required(evaluator, text):
+    max_size = get_option('nested_expansion_max_size')
+
+    if (not get_option('nested_expansion') or
+            (max_size is not None and len(text) > max_size)):
+        _incr_stat('nested_expansion_skipped')
+        return False
+
+    _incr_stat('nested_expansion_checked')
+
+    if not evaluator.has_expressions(text):
+        return False
+
+    _incr_stat('nested_expansion_expanded')
+
+    return True
+
 
 def get_evaluator(language):
     return plugin_util.get_module(_EXP_EVALUATOR_NAMESPACE, language)
@@ -75,12 +206,7 @@ def get_evaluators():
     if _EXP_EVALUATORS is None:
         _EXP_EVALUATORS = {}
 
-        mgr = extension.ExtensionManager(
-            namespace=_EXP_EVALUATOR_NAMESPACE,
-            invoke_on_load=False
-        )
-
-        for name in mgr.names():
+        for name in plugin_util.get_plugins(_EXP_EVALUATOR_NAMESPACE).keys():
             _EXP_EVALUATORS[name] = get_evaluator(name)
 
     return _EXP_EVALUATORS
@@ -141,6 +267,26 @@ def evaluate(statement, data=None):
     return statement
 
 
+def precompile(statement):
+    compiled = []
+
+    if isinstance(statement, dict):
+        for k, v in six.iteritems(statement):
+            compiled.extend(precompile(k))
+            compiled.extend(precompile(v))
+
+    elif isinstance(statement, list):
+        for item in statement:
+            compiled.extend(precompile(item))
+
+    elif isinstance(statement, six.string_types):
+        for name, evaluator in six.iteritems(get_evaluators()):
+            if evaluator.has_expressions(statement):
+                compiled.extend(evaluator.precompile(statement))
+
+    return compiled
+
+
 def extract_vars(statement):
 
     variables = []
@@ -169,3 +315,65 @@ def extract_vars(statement):
 
 def func_has_ctx_arg(func):
     return 'context' in inspect.getargspec(func).args
+
+
+def get_ctx_func_regex():
+    global _EXP_CTX_FUNC_REGEX
+
+    if _EXP_CTX_FUNC_REGEX is None:
+        # The builtin functions only access the context thru the ctx function or the
+        # private variables which are always included. Functions from other packages
+        # that take the context as argument may access any variable in the context.
+        names = [
+            name for name, func in six.iteritems(func_base.load())
+            if func_has_ctx_arg(func) and not func.__module__.startswith(_EXP_BUILTIN_FUNC_PKG)
+        ]
+
+        _EXP_CTX_FUNC_REGEX = (
+            re.compile(r'\b(%s)\b' % '|'.join([re.escape(n) for n in sorted(names)]))
+            if names else False
+        )
+
+    return _EXP_CTX_FUNC_REGEX
+
+
+def get_referenced_vars(text):
+    if not isinstance(text, six.string_types):
+        raise ValueError('Text to be evaluated is not typeof string.')
+
+    # Return None if the entire context is referenced directly.
+    if '__vars' in text:
+        return None
+
+    ctx_func_regex = get_ctx_func_regex()
+
+    if ctx_func_regex and ctx_func_regex.search(text):
+        return None
+
+    refs = set([m.start() for m in _REGEX_CTX_REF.finditer(text)])
+    variables = {}
+
+    for regex in _REGEX_CTX_STATIC_REFS:
+        for m in regex.finditer(text):
+            variables[m.start()] = m.group(1)
+
+    # Return None if any of the reference to the context is dynamic.
+    if refs - set(variables.keys()):
+        return None
+
+    return set(variables.values())
+
+
+def project_context(text, data):
+    if not isinstance(data, dict) or not isinstance(text, six.string_types):
+        return data
+
+    variables = get_referenced_vars(text)
+
+    if variables is None:
+        return data
+
+    return {
+        k: v for k, v in six.iteritems(data)
+        if k in variables or k.startswith('__')
+    }
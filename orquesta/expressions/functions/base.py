@@ -10,10 +10,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from stevedore import extension
+from orquesta.utils import plugin as plugin_util
 
 
 _EXP_FUNC_CATALOG = None
+_EXP_FUNC_NAMESPACE = 'orquesta.expressions.functions'
 
 
 def load():
@@ -22,12 +23,7 @@ def load():
     if _EXP_FUNC_CATALOG is None:
         _EXP_FUNC_CATALOG = {}
 
-        mgr = extension.ExtensionManager(
-            namespace='orquesta.expressions.functions',
-            invoke_on_load=False
-        )
-
-        for name in mgr.names():
-            _EXP_FUNC_CATALOG[name] = mgr[name].plugin
+        for name in plugin_util.get_plugins(_EXP_FUNC_NAMESPACE).keys():
+            _EXP_FUNC_CATALOG[name] = plugin_util.get_module(_EXP_FUNC_NAMESPACE, name)
 
     return _EXP_FUNC_CATALOG
@@ -15,15 +15,18 @@ import inspect
 import logging
 import re
 import six
-
-import jinja2
+import threading
 
 from orquesta import exceptions as exc
 from orquesta.expressions import base as expr_base
 from orquesta.expressions.functions import base as func_base
+from orquesta.utils import cache as cache_util
 from orquesta.utils import expression as expr_util
+from orquesta.utils import imports as import_util
 from orquesta.utils import strings as str_util
 
+jinja2 = import_util.lazy_import('jinja2')
+
 
 LOG = logging.getLogger(__name__)
 
@@ -69,13 +72,14 @@ class JinjaEvaluator(expr_base.Evaluator):
     _regex_raw_block_pattern = '{% raw %}.*?{% endraw %}'
     _regex_raw_block_parser = re.compile(_regex_raw_block_pattern)
 
-    _jinja_env = jinja2.Environment(
-        undefined=jinja2.StrictUndefined,
-        trim_blocks=True,
-        lstrip_blocks=True
-    )
+    # The jinja environments are created on first use.
+    _jinja_env = None
+    _jinja_env_lock = threading.Lock()
+    _jinja_native_env = None
 
-    _custom_functions = register_functions(_jinja_env)
+    _custom_functions = None
+
+    _compiled_exprs = cache_util.LRUCache(max_size=10000)
 
     @classmethod
     def contextualize(cls, data):
@@ -86,11 +90,84 @@ class JinjaEvaluator(expr_base.Evaluator):
             ctx['__current_task'] = ctx['__vars'].get('__current_task')
             ctx['__current_item'] = ctx['__vars'].get('__current_item')
 
-        for name, func in six.iteritems(cls._custom_functions):
+        for name, func in six.iteritems(cls.get_custom_functions()):
             ctx[name] = functools.partial(func, ctx) if expr_base.func_has_ctx_arg(func) else func
 
         return ctx
 
+    @classmethod
+    def get_env(cls):
+        if cls._jinja_env is None:
+            with cls._jinja_env_lock:
+                if cls._jinja_env is None:
+                    env = jinja2.Environment(
+                        undefined=jinja2.StrictUndefined,
+                        trim_blocks=True,
+                        lstrip_blocks=True
+                    )
+
+                    cls._custom_functions = register_functions(env)
+                    cls._jinja_env = env
+
+        return cls._jinja_env
+
+    @classmethod
+    def get_native_env(cls):
+        if cls._jinja_native_env is None:
+            try:
+                from jinja2 import nativetypes as jinja2_native
+            except ImportError:
+                raise JinjaEvaluationException(
+                    'Evaluation into native types requires Jinja2 version 2.10 or newer.'
+                )
+
+            cls._jinja_native_env = jinja2_native.NativeEnvironment(
+                undefined=jinja2.StrictUndefined,
+                trim_blocks=True,
+                lstrip_blocks=True
+            )
+
+            register_functions(cls._jinja_native_env)
+
+        return cls._jinja_native_env
+
+    @classmethod
+    def get_custom_functions(cls):
+        if cls._custom_functions is None:
+            cls._custom_functions = func_base.load()
+
+        return cls._custom_functions
+
+    @classmethod
+    def initialize(cls):
+        cls.get_env()
+
+        if expr_base.get_option('native_types'):
+            cls.get_native_env()
+
+    @classmethod
+    def compile(cls, expr):
+        compiled = cls._compiled_exprs.get(expr)
+
+        if compiled is None:
+            compiled = cls.get_env().compile_expression(expr, undefined_to_none=False)
+            cls._compiled_exprs.set(expr, compiled)
+
+        return compiled
+
+    @classmethod
+    def precompile(cls, text):
+        compiled = []
+
+        for expr in cls._regex_parser.findall(text):
+            try:
+                cls.compile(cls.strip_delimiter(expr))
+                compiled.append(expr)
+            except jinja2.exceptions.TemplateError:
+                continue
+
+        return compiled
+
     @classmethod
     def get_statement_regex(cls):
         return cls._regex_pattern
@@ -115,7 +192,7 @@ class JinjaEvaluator(expr_base.Evaluator):
 
         # Validate the entire text to cover malformed delimiters and blocks.
         try:
-            cls._jinja_env.parse(text)
+            cls.get_env().parse(text)
         except jinja2.exceptions.TemplateError as e:
             errors.append(expr_util.format_error(cls._type, text, e))
 
@@ -127,7 +204,7 @@ class JinjaEvaluator(expr_base.Evaluator):
 
             try:
                 parser = jinja2.parser.Parser(
-                    cls._jinja_env.overlay(),
+                    cls.get_env().overlay(),
                     cls.strip_delimiter(expr),
                     state='variable'
                 )
@@ -143,26 +220,31 @@ class JinjaEvaluator(expr_base.Evaluator):
         output = str_util.unicode(text)
         exprs = cls._regex_parser.findall(text)
         block_exprs = cls._regex_block_parser.findall(text)
-        ctx = cls.contextualize(data)
-        opts = {'undefined_to_none': False}
+        ctx = cls.contextualize(expr_base.project_context(text, data))
 
         try:
             # Evaluate inline jinja expressions first.
             for expr in exprs:
                 stripped = cls.strip_delimiter(expr)
-                compiled = cls._jinja_env.compile_expression(stripped, **opts)
-                result = compiled(**ctx)
+                result = cls.compile(stripped)(**ctx)
 
                 if inspect.isgenerator(result):
                     result = list(result)
 
-                if isinstance(result, six.string_types):
+                if (isinstance(result, six.string_types) and
+                        expr_base.is_nested_expansion_required(cls, result)):
                     result = cls._evaluate_and_expand(result, data)
 
                 # For StrictUndefined values, UndefinedError only gets raised when the value is
-                # accessed, not when it gets created. The simplest way to access it is to try
-                # and cast it to string. When StrictUndefined is cast to str below, this will
-                # raise an exception with error description.
+                # accessed, not when it gets created. If there are jinja blocks, the expression
+                # is left as is since it may reference variables defined in the blocks. The
+                # blocks will raise an exception with error description on render if the
+                # variable is undefined. Otherwise, raise an exception here.
+                if isinstance(result, jinja2.runtime.StrictUndefined) and not block_exprs:
+                    raise JinjaEvaluationException(
+                        'There are unresolved variables: %s' % stripped
+                    )
+
                 if not isinstance(result, jinja2.runtime.StrictUndefined):
                     if len(exprs) > 1 or block_exprs or len(output) > len(expr):
                         output = output.replace(expr, str_util.unicode(result, force=True))
@@ -171,12 +253,15 @@ class JinjaEvaluator(expr_base.Evaluator):
 
             # Evaluate jinja block(s) after inline expressions are evaluated.
             if block_exprs and isinstance(output, six.string_types):
-                output = cls._jinja_env.from_string(output).render(ctx)
+                output = cls.get_env().from_string(output).render(ctx)
 
                 # Traverse and evaulate again in case additional inline epxressions are
                 # introduced after the jinja block is evaluated.
-                output = cls._evaluate_and_expand(output, data)
+                if expr_base.is_nested_expansion_required(cls, output):
+                    output = cls._evaluate_and_expand(output, data)
 
+        except JinjaEvaluationException:
+            raise
         except jinja2.exceptions.UndefinedError as e:
             msg = "Unable to evaluate expression '%s'. %s: %s"
             raise JinjaEvaluationException(msg % (expr, e.__class__.__name__, str(e)))
@@ -186,6 +271,38 @@ class JinjaEvaluator(expr_base.Evaluator):
 
         return output
 
+    @classmethod
+    def _evaluate_native(cls, text, data=None):
+        exprs = cls._regex_parser.findall(text)
+        block_exprs = cls._regex_block_parser.findall(text)
+        ctx = cls.contextualize(expr_base.project_context(text, data))
+        expr = text
+
+        try:
+            # If the text is a single inline expression, compile and evaluate the expression
+            # directly. Otherwise, render the entire text in one pass with the native env.
+            # Any string in the result is returned as is and not evaluated again.
+            if len(exprs) == 1 and not block_exprs and text.strip() == exprs[0]:
+                expr = exprs[0]
+                output = cls.compile(cls.strip_delimiter(expr))(**ctx)
+            else:
+                output = cls.get_native_env().from_string(text).render(ctx)
+
+            if inspect.isgenerator(output):
+                output = list(output)
+
+            if isinstance(output, jinja2.runtime.StrictUndefined):
+                raise JinjaEvaluationException(
+                    'There are unresolved variables: %s' % cls.strip_delimiter(expr)
+                )
+        except JinjaEvaluationException:
+            raise
+        except Exception as e:
+            msg = "Unable to evaluate expression '%s'. %s: %s"
+            raise JinjaEvaluationException(msg % (expr, e.__class__.__name__, str(e)))
+
+        return output
+
     @classmethod
     def evaluate(cls, text, data=None):
         if not isinstance(text, six.string_types):
@@ -194,6 +311,10 @@ class JinjaEvaluator(expr_base.Evaluator):
         if data and not isinstance(data, dict):
             raise ValueError('Provided data is not typeof dict.')
 
+        # Evaluate the expression in one pass if native types is enabled.
+        if expr_base.get_option('native_types'):
+            return cls._evaluate_native(text, data=data)
+
         # Remove raw blocks from the expression.
         raw_blocks = cls._regex_raw_block_parser.findall(text)
 
@@ -203,14 +324,6 @@ class JinjaEvaluator(expr_base.Evaluator):
         # Recursively evaluate the expression.
         output = cls._evaluate_and_expand(text, data=data)
 
-        if isinstance(output, six.string_types):
-            exprs = [cls.strip_delimiter(expr) for expr in cls._regex_parser.findall(output)]
-
-            if exprs:
-                raise JinjaEvaluationException(
-                    'There are unresolved variables: %s' % ', '.join(exprs)
-                )
-
         if isinstance(output, six.string_types) and raw_blocks:
             # Put raw blocks back into the expression.
             for i in range(0, len(raw_blocks)):
@@ -218,7 +331,7 @@ class JinjaEvaluator(expr_base.Evaluator):
 
             # Evaluate the raw blocks.
             ctx = cls.contextualize(data)
-            output = cls._jinja_env.from_string(output).render(ctx)
+            output = cls.get_env().from_string(output).render(ctx)
 
         return output
 
@@ -14,16 +14,20 @@ import inspect
 import logging
 import re
 import six
-
-import yaql
-import yaql.language.exceptions as yaql_exc
+import threading
 
 from orquesta import exceptions as exc
 from orquesta.expressions import base as expr_base
 from orquesta.expressions.functions import base as func_base
+from orquesta.utils import cache as cache_util
 from orquesta.utils import expression as expr_util
+from orquesta.utils import imports as import_util
 from orquesta.utils import strings as str_util
 
+yaql = import_util.lazy_import('yaql')
+yaql_exc = import_util.lazy_import('yaql.language.exceptions')
+yaql_factory = import_util.lazy_import('yaql.language.factory')
+
 
 LOG = logging.getLogger(__name__)
 
@@ -62,13 +66,48 @@ class YAQLEvaluator(expr_base.Evaluator):
     _regex_ctx_extract_2 = 'ctx\([\'|"]?%s(%s)' % (_regex_dot_extract, _regex_dot_pattern)
     _regex_var_extracts = ['%s\.?' % _regex_ctx_extract_1, '%s\.?' % _regex_ctx_extract_2]
 
-    _engine = yaql.language.factory.YaqlFactory().create()
-    _root_ctx = yaql.create_context()
-    _custom_functions = register_functions(_root_ctx)
+    # The yaql engine and root context are created on first use.
+    _engine = None
+    _root_ctx = None
+    _root_ctx_lock = threading.Lock()
+
+    _custom_functions = None
+
+    _parsed_exprs = cache_util.LRUCache(max_size=10000)
+
+    @classmethod
+    def get_engine(cls):
+        if cls._engine is None:
+            cls._engine = yaql_factory.YaqlFactory().create()
+
+        return cls._engine
+
+    @classmethod
+    def get_root_ctx(cls):
+        if cls._root_ctx is None:
+            with cls._root_ctx_lock:
+                if cls._root_ctx is None:
+                    ctx = yaql.create_context()
+                    cls._custom_functions = register_functions(ctx)
+                    cls._root_ctx = ctx
+
+        return cls._root_ctx
+
+    @classmethod
+    def get_custom_functions(cls):
+        if cls._custom_functions is None:
+            cls._custom_functions = func_base.load()
+
+        return cls._custom_functions
+
+    @classmethod
+    def initialize(cls):
+        cls.get_engine()
+        cls.get_root_ctx()
 
     @classmethod
     def contextualize(cls, data):
-        ctx = cls._root_ctx.create_child_context()
+        ctx = cls.get_root_ctx().create_child_context()
         ctx['__vars'] = data or {}
         ctx['__state'] = ctx['__vars'].get('__state')
         ctx['__current_task'] = ctx['__vars'].get('__current_task')
@@ -76,6 +115,29 @@ class YAQLEvaluator(expr_base.Evaluator):
 
         return ctx
 
+    @classmethod
+    def parse(cls, expr):
+        parsed = cls._parsed_exprs.get(expr)
+
+        if parsed is None:
+            parsed = cls.get_engine()(expr)  # pylint: disable=E1102
+            cls._parsed_exprs.set(expr, parsed)
+
+        return parsed
+
+    @classmethod
+    def precompile(cls, text):
+        compiled = []
+
+        for expr in cls._regex_parser.findall(text):
+            try:
+                cls.parse(cls.strip_delimiter(expr))
+                compiled.append(expr)
+            except (yaql_exc.YaqlException, ValueError, TypeError):
+                continue
+
+        return compiled
+
     @classmethod
     def get_statement_regex(cls):
         return cls._regex_pattern
@@ -99,7 +161,7 @@ class YAQLEvaluator(expr_base.Evaluator):
 
         for expr in cls._regex_parser.findall(text):
             try:
-                cls._engine(cls.strip_delimiter(expr))
+                cls.parse(cls.strip_delimiter(expr))
             except (yaql_exc.YaqlException, ValueError, TypeError) as e:
                 errors.append(expr_util.format_error(cls._type, expr, e))
 
@@ -115,17 +177,18 @@ class YAQLEvaluator(expr_base.Evaluator):
 
         output = str_util.unicode(text)
         exprs = cls._regex_parser.findall(text)
-        ctx = cls.contextualize(data)
+        ctx = cls.contextualize(expr_base.project_context(text, data))
 
         try:
             for expr in exprs:
                 stripped = cls.strip_delimiter(expr)
-                result = cls._engine(stripped).evaluate(context=ctx)
+                result = cls.parse(stripped).evaluate(context=ctx)  # pylint: disable=E1101
 
                 if inspect.isgenerator(result):
                     result = list(result)
 
-                if isinstance(result, six.string_types):
+                if (isinstance(result, six.string_types) and
+                        expr_base.is_nested_expansion_required(cls, result)):
                     result = cls.evaluate(result, data)
 
                 if len(exprs) > 1 or len(output) > len(expr):
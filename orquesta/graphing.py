@@ -14,13 +14,14 @@ import abc
 import copy
 import logging
 
-import networkx as nx
-from networkx.readwrite import json_graph
-
 import six
 
 from orquesta import exceptions as exc
 from orquesta.utils import dictionary as dict_util
+from orquesta.utils import imports as import_util
+
+nx = import_util.lazy_import('networkx')
+json_graph = import_util.lazy_import('networkx.readwrite.json_graph')
 
 
 LOG = logging.getLogger(__name__)
@@ -35,6 +36,15 @@ class WorkflowGraph(object):
         # may be cycled and states overwritten.
         self._graph = graph if graph else nx.MultiDiGraph()
 
+        # The topology of the graph such as the roots and cycles are expensive to identify
+        # so they are indexed on first use and the index is reset when the graph changes.
+        self._topology = None
+
+        # The task status predicates of the transition criteria are compiled by the composer
+        # when the graph is composed or first loaded. They are derived from the criteria so
+        # they are not serialized and are reset when the transitions change.
+        self._status_criteria = None
+
     def serialize(self):
         data = json_graph.adjacency_data(self._graph)
 
@@ -46,9 +56,14 @@ class WorkflowGraph(object):
         return data
 
     @classmethod
-    def deserialize(cls, data):
+    def deserialize(cls, data, topology=None):
         g = json_graph.adjacency_graph(copy.deepcopy(data), directed=True, multigraph=True)
-        return cls(graph=g)
+        instance = cls(graph=g)
+
+        if topology is not None:
+            instance._topology = copy.deepcopy(topology)
+
+        return instance
 
     @staticmethod
     def get_root_nodes(graph):
@@ -59,14 +74,28 @@ class WorkflowGraph(object):
 
         return sorted(nodes, key=lambda x: x['id'])
 
+    def _get_topology(self):
+        if self._topology is None:
+            self._topology = {
+                'roots': self.get_root_nodes(self._graph),
+                # Reverse the graph using a copy to identify the root nodes.
+                'leaves': self.get_root_nodes(self._graph.reverse(copy=True)),
+                'cycles': [list(c) for c in nx.simple_cycles(self._graph)]
+            }
+
+        return self._topology
+
+    def get_topology(self):
+        return copy.deepcopy(self._get_topology())
+
     @property
     def roots(self):
-        return self.get_root_nodes(self._graph)
+        # The nodes only contain the id and name so a shallow copy of each is sufficient.
+        return [dict(n) for n in self._get_topology()['roots']]
 
     @property
     def leaves(self):
-        # Reverse the graph using a copy to identify the root nodes.
-        return self.get_root_nodes(self._graph.reverse(copy=True))
+        return [dict(n) for n in self._get_topology()['leaves']]
 
     def has_tasks(self):
         return len(self._graph) > 0
@@ -93,6 +122,7 @@ class WorkflowGraph(object):
     def add_task(self, task_id, **kwargs):
         if not self.has_task(task_id):
             self._graph.add_node(task_id, **kwargs)
+            self._topology = None
         else:
             self.update_task(task_id, **kwargs)
 
@@ -103,6 +133,8 @@ class WorkflowGraph(object):
         for key, value in six.iteritems(kwargs):
             self._graph.node[task_id][key] = value
 
+        self._topology = None
+
     def has_transition(self, source, destination, **kwargs):
         edges = filter(
             lambda e: e[0] == source and e[1] == destination,
@@ -157,6 +189,8 @@ class WorkflowGraph(object):
                 attrs[attr] = value
 
         self._graph.add_edge(source, destination, **attrs)
+        self._topology = None
+        self._status_criteria = None
 
     def update_transition(self, source, destination, key, **kwargs):
         seq = self.get_transition(source, destination, key=key)
@@ -164,6 +198,25 @@ class WorkflowGraph(object):
         for attr, value in six.iteritems(kwargs):
             self._graph[source][destination][seq[2]][attr] = value
 
+        self._status_criteria = None
+
+    def has_status_criteria(self):
+        return self._status_criteria is not None
+
+    def compile_status_criteria(self, compiler):
+        # The compiler maps a criterion of the source task to the list of task statuses
+        # it checks for or to None if the criterion is not a simple task status check.
+        self._status_criteria = {
+            (u, v, k): [compiler(u, c) for c in d.get('criteria') or []]
+            for u, v, k, d in self._graph.edges(data=True, keys=True)
+        }
+
+    def get_status_criteria(self, source, destination, key):
+        if self._status_criteria is None:
+            return None
+
+        return self._status_criteria.get((source, destination, key))
+
     def get_next_transitions(self, task_id):
         return sorted(
             [e for e in self._graph.out_edges([task_id], data=True, keys=True)],
@@ -194,7 +247,7 @@ class WorkflowGraph(object):
         ]
 
     def in_cycle(self, task_id):
-        return [c for c in nx.simple_cycles(self._graph) if task_id in c]
+        return [list(c) for c in self._get_topology()['cycles'] if task_id in c]
 
     def is_cycle_closed(self, cycle):
         # A cycle is closed, for a lack of better term, if there is no task
@@ -205,3 +258,202 @@ class WorkflowGraph(object):
                     return False
 
         return True
+
+    def _get_cyclic_offsets(self, graph, members, durations):
+        # Identify the entry into the cycle from outside of the cycle or from the roots.
+        root_ids = set(r['id'] for r in self.roots)
+
+        entries = sorted(
+            n for n in members
+            if n in root_ids or any(p not in members for p in graph.predecessors(n))
+        ) or sorted(members)[:1]
+
+        # Remove the transitions that close the cycle to get the order of the tasks in a single
+        # iteration. A transition to a task that is on the path from the entry closes the cycle.
+        iteration = nx.DiGraph()
+        iteration.add_nodes_from(members)
+        visited = set()
+
+        for entry in entries:
+            if entry in visited:
+                continue
+
+            visited.add(entry)
+            path = set([entry])
+            stack = [(entry, iter(sorted(s for s in graph.successors(entry) if s in members)))]
+
+            while stack:
+                node, successors = stack[-1]
+                next_node = next(successors, None)
+
+                if next_node is None:
+                    path.discard(node)
+                    stack.pop()
+                    continue
+
+                if next_node in path:
+                    continue
+
+                iteration.add_edge(node, next_node)
+
+                if next_node not in visited:
+                    visited.add(next_node)
+                    path.add(next_node)
+                    next_successors = sorted(s for s in graph.successors(next_node) if s in members)
+                    stack.append((next_node, iter(next_successors)))
+
+        offsets = {}
+
+        for node in nx.topological_sort(iteration):
+            offsets[node] = max(
+                [offsets[p] + durations[p] for p in iteration.predecessors(node)] or [0.0]
+            )
+
+        return offsets
+
+    def get_critical_path(self, durations=None, default_duration=0.0, iterations=None,
+                          default_iterations=1, criteria=None):
+        durations = {
+            n: float((durations or {}).get(n, default_duration) or 0.0)
+            for n in self._graph.nodes()
+        }
+
+        iterations = iterations or {}
+
+        # Skip the task transitions whose criteria are not expected to be met.
+        edges = sorted(set(
+            (u, v) for u, v, d in self._graph.edges(data=True)
+            if criteria is None or all(criteria(u, c) for c in d.get('criteria') or [])
+        ))
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self._graph.nodes())
+        graph.add_edges_from(edges)
+
+        # Leave out the tasks that cannot be reached from the roots thru the remaining transitions.
+        reachable = set()
+
+        for root in self.roots:
+            reachable.add(root['id'])
+            reachable.update(nx.descendants(graph, root['id']))
+
+        if reachable:
+            graph.remove_nodes_from([n for n in list(graph.nodes()) if n not in reachable])
+
+        # Treat each strongly connected component as a single unit. A component that has a cycle
+        # takes the duration of a single iteration multiplied by the expected iteration count.
+        condensed = nx.condensation(graph)
+        components = {}
+
+        for c in condensed.nodes():
+            members = set(condensed.node[c]['members'])
+            cyclic = len(members) > 1 or any(graph.has_edge(n, n) for n in members)
+            offsets = {n: 0.0 for n in members}
+            count = 1
+
+            if cyclic:
+                offsets = self._get_cyclic_offsets(graph, members, durations)
+                counts = [iterations[n] for n in members if n in iterations]
+                count = max(counts) if counts else default_iterations
+
+            per_iteration = max(offsets[n] + durations[n] for n in members)
+
+            components[c] = {
+                'members': members,
+                'cyclic': cyclic,
+                'offsets': offsets,
+                'iterations': count,
+                'duration': per_iteration * count
+            }
+
+        order = list(nx.topological_sort(condensed))
+
+        # Compute the earliest start and finish of each component from the inbound transitions.
+        # A join task with a barrier count starts once the given number of inbounds complete
+        # and only the inbounds that complete by then are counted toward the start.
+        for c in order:
+            component = components[c]
+
+            inbounds = sorted(
+                (components[p]['ef'], min(components[p]['members']), p)
+                for p in condensed.predecessors(c)
+            )
+
+            counted = inbounds
+
+            if not component['cyclic'] and inbounds:
+                barrier = self._graph.node[list(component['members'])[0]].get('barrier')
+
+                if isinstance(barrier, int) and 0 < barrier < len(inbounds):
+                    counted = inbounds[:barrier]
+
+            component['counted'] = set(p for ef, name, p in counted)
+            component['binding'] = counted[-1][2] if counted else None
+            component['es'] = counted[-1][0] if counted else 0.0
+            component['ef'] = component['es'] + component['duration']
+
+        makespan = max([c['ef'] for c in components.values()] or [0.0])
+
+        # Compute the latest start and finish of each component and the length of the longest
+        # path from the start of each component to the end of the workflow.
+        for c in reversed(order):
+            component = components[c]
+
+            successors = [
+                components[s] for s in condensed.successors(c)
+                if c in components[s]['counted']
+            ]
+
+            component['lf'] = min([s['ls'] for s in successors] or [makespan])
+            component['ls'] = component['lf'] - component['duration']
+            component['tail'] = (
+                component['duration'] + max([s['tail'] for s in successors] or [0.0])
+            )
+
+        tasks = {}
+
+        for c, component in six.iteritems(components):
+            slack = max(component['ls'] - component['es'], 0.0)
+
+            for n in component['members']:
+                offset = component['offsets'][n]
+                start = component['es'] + offset
+
+                tasks[n] = {
+                    'duration': durations[n],
+                    'iterations': component['iterations'],
+                    'earliest_start': start,
+                    'earliest_finish': start + durations[n],
+                    'latest_start': start + slack,
+                    'latest_finish': start + durations[n] + slack,
+                    'slack': slack,
+                    'tail': component['tail'] - offset
+                }
+
+        # Trace back from the last component to finish thru the inbounds that determine the start.
+        # Components that finish at the same time are broken by the order in the graph so tasks
+        # that take no time at the end of the workflow are included.
+        critical_path = []
+        rank = {c: i for i, c in enumerate(order)}
+        c = sorted(order, key=lambda x: (-components[x]['ef'], -rank[x]))[0] if order else None
+
+        while c is not None:
+            offsets = components[c]['offsets']
+            critical_path[0:0] = sorted(offsets.keys(), key=lambda n: (offsets[n], n))
+            c = components[c]['binding']
+
+        cycles = [
+            {
+                'tasks': sorted(component['members']),
+                'iterations': component['iterations'],
+                'duration': component['duration']
+            }
+            for component in components.values() if component['cyclic']
+        ]
+
+        return {
+            'makespan': makespan,
+            'critical_path': critical_path,
+            'tasks': tasks,
+            'cycles': sorted(cycles, key=lambda x: x['tasks'])
+        }
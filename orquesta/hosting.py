@@ -0,0 +1,326 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+import hashlib
+import logging
+import multiprocessing
+
+from orquesta import conducting
+from orquesta import exceptions as exc
+from orquesta import scheduling
+
+
+LOG = logging.getLogger(__name__)
+
+
+def get_hash(key):
+    return int(hashlib.md5(str(key).encode('utf-8')).hexdigest()[:16], 16)
+
+
+class HashRing(object):
+
+    def __init__(self, nodes=None, replicas=100):
+        self.replicas = replicas
+        self._keys = []
+        self._nodes = {}
+
+        for node in nodes or []:
+            self.add_node(node)
+
+    def __len__(self):
+        return len(self.get_nodes())
+
+    def get_nodes(self):
+        return sorted(set(self._nodes.values()))
+
+    def add_node(self, node):
+        # Place each node at many points on the ring so the keys are spread
+        # evenly and only the keys of the neighbors move when a node is added.
+        for i in range(0, self.replicas):
+            key = get_hash('%s:%s' % (node, i))
+            self._nodes[key] = node
+            bisect.insort(self._keys, key)
+
+    def remove_node(self, node):
+        self._keys = [k for k in self._keys if self._nodes[k] != node]
+        self._nodes = {k: v for k, v in self._nodes.items() if v != node}
+
+    def get_node(self, key):
+        if not self._keys:
+            raise ValueError('There are no nodes in the hash ring.')
+
+        idx = bisect.bisect(self._keys, get_hash(key)) % len(self._keys)
+
+        return self._nodes[self._keys[idx]]
+
+
+def _shard_add(scheduler, wf_ex_id, data, active):
+    conductor = conducting.WorkflowConductor.deserialize(data)
+    scheduler.add(wf_ex_id, conductor, active=active)
+
+    return scheduler.schedule()
+
+
+def _shard_update(scheduler, updates):
+    wf_ex_statuses = {}
+    errors = []
+
+    for wf_ex_id, task_id, route, event in updates:
+        try:
+            wf_ex_statuses[wf_ex_id] = scheduler.update_task_state(wf_ex_id, task_id, route, event)
+        except Exception as e:
+            errors.append({
+                'type': 'error',
+                'message': '%s: %s' % (type(e).__name__, str(e)),
+                'workflow_id': wf_ex_id,
+                'task_id': task_id,
+                'route': route
+            })
+
+    return {'dispatched': scheduler.schedule(), 'statuses': wf_ex_statuses, 'errors': errors}
+
+
+def _shard_request_status(scheduler, wf_ex_id, status):
+    scheduler.request_workflow_status(wf_ex_id, status)
+
+    return scheduler.schedule()
+
+
+def _shard_get(scheduler, wf_ex_id):
+    return scheduler.get_conductor(wf_ex_id).serialize()
+
+
+def _shard_remove(scheduler, wf_ex_id):
+    active = scheduler.get_active_actions(wf_ex_id)
+
+    return scheduler.remove(wf_ex_id).serialize(), active
+
+
+def _shard_list(scheduler):
+    return scheduler.get_workflow_ids()
+
+
+def _shard_stats(scheduler):
+    return scheduler.get_stats()
+
+
+SHARD_OPERATIONS = {
+    'add': _shard_add,
+    'update': _shard_update,
+    'request_status': _shard_request_status,
+    'get': _shard_get,
+    'remove': _shard_remove,
+    'list': _shard_list,
+    'stats': _shard_stats
+}
+
+
+def serve_shard(conn, options):
+    scheduler = scheduling.WorkflowScheduler(**options)
+
+    while True:
+        op, args = conn.recv()
+
+        if op == 'stop':
+            conn.send(('ok', None))
+            break
+
+        try:
+            conn.send(('ok', SHARD_OPERATIONS[op](scheduler, *args)))
+        except Exception as e:
+            conn.send(('error', '%s: %s' % (type(e).__name__, str(e))))
+
+    conn.close()
+
+
+class ConductorHost(object):
+
+    def __init__(self, shards=2, replicas=100, **options):
+        if shards < 1:
+            raise ValueError('The number of shards must be a positive integer.')
+
+        self.size = shards
+        self.replicas = replicas
+
+        # The options are passed to the scheduler of each shard.
+        self.options = options
+
+        self._shards = {}
+        self._ring = HashRing(replicas=replicas)
+
+    def __enter__(self):
+        self.start()
+
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        for shard_id in range(0, self.size):
+            if shard_id not in self._shards:
+                self._start_shard(shard_id)
+                self._ring.add_node(shard_id)
+
+    def stop(self):
+        for shard_id in list(self._shards.keys()):
+            self._stop_shard(shard_id)
+            self._ring.remove_node(shard_id)
+
+    def _start_shard(self, shard_id):
+        conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=serve_shard, args=(child_conn, self.options))
+        process.daemon = True
+        process.start()
+        child_conn.close()
+
+        self._shards[shard_id] = (process, conn)
+
+    def _stop_shard(self, shard_id):
+        process, conn = self._shards.pop(shard_id)
+
+        try:
+            conn.send(('stop', ()))
+            conn.recv()
+        except (EOFError, IOError, OSError):
+            pass
+
+        conn.close()
+        process.join()
+
+    def _send(self, shard_id, op, *args):
+        self._shards[shard_id][1].send((op, args))
+
+    def _recv(self, shard_id):
+        status, result = self._shards[shard_id][1].recv()
+
+        if status == 'error':
+            raise exc.ConductorHostError(result)
+
+        return result
+
+    def _call(self, shard_id, op, *args):
+        self._send(shard_id, op, *args)
+
+        return self._recv(shard_id)
+
+    def get_shard(self, wf_ex_id):
+        return self._ring.get_node(wf_ex_id)
+
+    def get_shards(self):
+        return sorted(self._shards.keys())
+
+    def add(self, wf_ex_id, conductor, active=None):
+        return self._call(self.get_shard(wf_ex_id), 'add', wf_ex_id, conductor.serialize(), active)
+
+    def get_conductor(self, wf_ex_id):
+        data = self._call(self.get_shard(wf_ex_id), 'get', wf_ex_id)
+
+        return conducting.WorkflowConductor.deserialize(data)
+
+    def remove(self, wf_ex_id):
+        data = self._call(self.get_shard(wf_ex_id), 'remove', wf_ex_id)[0]
+
+        return conducting.WorkflowConductor.deserialize(data)
+
+    def request_workflow_status(self, wf_ex_id, status):
+        return self._call(self.get_shard(wf_ex_id), 'request_status', wf_ex_id, status)
+
+    def update_task_state(self, wf_ex_id, task_id, route, event):
+        return self.update_task_states([(wf_ex_id, task_id, route, event)])
+
+    def update_task_states(self, updates):
+        batches = {}
+
+        for update in updates:
+            batches.setdefault(self.get_shard(update[0]), []).append(update)
+
+        result = {'dispatched': [], 'statuses': {}, 'errors': []}
+        pending = []
+
+        # Send the batches to all the shards first so the shards process them in parallel.
+        for shard_id, batch in batches.items():
+            try:
+                self._send(shard_id, 'update', batch)
+                pending.append(shard_id)
+            except (IOError, OSError) as e:
+                result['errors'].append(self._format_shard_error(shard_id, e))
+
+        # The actions dispatched by the shards are already marked as running by the conductors
+        # so the reply of every shard is read and the errors are returned with the actions.
+        for shard_id in pending:
+            try:
+                shard_result = self._recv(shard_id)
+            except (exc.ConductorHostError, EOFError, IOError, OSError) as e:
+                result['errors'].append(self._format_shard_error(shard_id, e))
+                continue
+
+            result['dispatched'].extend(shard_result['dispatched'])
+            result['statuses'].update(shard_result['statuses'])
+            result['errors'].extend(shard_result['errors'])
+
+        return result
+
+    @staticmethod
+    def _format_shard_error(shard_id, e):
+        return {
+            'type': 'error',
+            'message': '%s: %s' % (type(e).__name__, str(e)),
+            'shard_id': shard_id
+        }
+
+    def get_workflow_ids(self):
+        wf_ex_ids = []
+
+        for shard_id in self.get_shards():
+            wf_ex_ids.extend(self._call(shard_id, 'list'))
+
+        return wf_ex_ids
+
+    def get_stats(self):
+        return {shard_id: self._call(shard_id, 'stats') for shard_id in self.get_shards()}
+
+    def resize(self, shards):
+        if shards < 1:
+            raise ValueError('The number of shards must be a positive integer.')
+
+        old_shard_ids = self.get_shards()
+        new_ring = HashRing(nodes=range(0, shards), replicas=self.replicas)
+
+        for shard_id in range(0, shards):
+            if shard_id not in self._shards:
+                self._start_shard(shard_id)
+
+        result = {'moved': 0, 'dispatched': []}
+
+        # Hand over the workflows whose owner changes from the old shard to the new shard.
+        for shard_id in old_shard_ids:
+            for wf_ex_id in self._call(shard_id, 'list'):
+                new_shard_id = new_ring.get_node(wf_ex_id)
+
+                if new_shard_id == shard_id:
+                    continue
+
+                data, active = self._call(shard_id, 'remove', wf_ex_id)
+                dispatched = self._call(new_shard_id, 'add', wf_ex_id, data, active)
+                result['dispatched'].extend(dispatched)
+                result['moved'] += 1
+
+        for shard_id in old_shard_ids:
+            if shard_id >= shards:
+                self._stop_shard(shard_id)
+
+        self.size = shards
+        self._ring = new_ring
+
+        return result
@@ -0,0 +1,113 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import asyncio
+import functools
+import inspect
+import logging
+
+from orquesta.runners import base as runner_base
+
+
+LOG = logging.getLogger(__name__)
+
+
+class AsyncioRunner(runner_base.WorkflowRunner):
+
+    def __init__(self, conductor, action, loop=None):
+        super(AsyncioRunner, self).__init__(conductor)
+        self.action = action
+        self.loop = loop or asyncio.get_event_loop()
+        self._futures = set()
+        self._done = None
+        self._step_handle = None
+
+    def run(self):
+        self._done = self.loop.create_future()
+        self.start_workflow()
+        self._request_step()
+
+        return self._done
+
+    def pause(self):
+        self.pause_workflow()
+        self._request_step()
+
+    def cancel(self):
+        self.cancel_workflow()
+
+        # Cancel the actions in progress. The actions report back as canceled.
+        for future in list(self._futures):
+            future.cancel()
+
+        self._request_step()
+
+    def _request_step(self):
+        # Coalesce the events that are processed in the same iteration of the
+        # loop so the conductor is only asked for the next tasks once.
+        if self._step_handle is None:
+            self._step_handle = self.loop.call_soon(self._step)
+
+    def _step(self):
+        self._step_handle = None
+        dispatched = self.dispatch()
+
+        if self.is_stopped() or (self.is_idle() and not dispatched):
+            self._finish()
+
+    def _finish(self):
+        if self._done is None or self._done.done():
+            return
+
+        self.stop_workflow()
+        self._done.set_result(self.get_workflow_status())
+
+    def _start_timer(self, delay, callback):
+        return self.loop.call_later(delay, callback)
+
+    def _expire_delay(self, task_key):
+        super(AsyncioRunner, self)._expire_delay(task_key)
+        self._request_step()
+
+    def _execute(self, task, action_spec):
+        try:
+            output = self.action(action_spec, task)
+
+            if inspect.isawaitable(output):  # pylint: disable=E1101
+                future = asyncio.ensure_future(output, loop=self.loop)
+            else:
+                future = self.loop.create_future()
+                future.set_result(output)
+        except Exception as e:
+            future = self.loop.create_future()
+            future.set_exception(e)
+
+        callback = functools.partial(self._on_action_done, task['id'], task['route'], action_spec)
+        self._futures.add(future)
+        future.add_done_callback(callback)
+
+    def _on_action_done(self, task_id, route, action_spec, future):
+        self._futures.discard(future)
+
+        status, result = runner_base.get_action_outcome(future)
+        self.complete_action(task_id, route, action_spec, status, result=result)
+        self._request_step()
+
+
+def run(conductor, action, loop=None):
+    loop = loop or asyncio.get_event_loop()
+    runner = AsyncioRunner(conductor, action, loop=loop)
+    loop.run_until_complete(runner.run())
+
+    return runner
@@ -0,0 +1,305 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import abc
+import functools
+import logging
+import six
+import time
+
+from orquesta import events
+from orquesta import statuses
+
+
+LOG = logging.getLogger(__name__)
+
+
+def get_action_context(action_spec):
+    item_id = action_spec.get('item_id')
+
+    return {'item_id': item_id} if item_id is not None else None
+
+
+def get_action_event(action_spec, status, result=None):
+    return events.ActionExecutionEvent(
+        status,
+        result=result,
+        context=get_action_context(action_spec)
+    )
+
+
+def get_action_error(e):
+    return {'error': '%s: %s' % (type(e).__name__, str(e))}
+
+
+def get_action_outcome(future):
+    if future.cancelled():
+        return statuses.CANCELED, None
+
+    if future.exception() is not None:
+        return statuses.FAILED, get_action_error(future.exception())
+
+    # The action can return an execution event to set the status of the execution.
+    if isinstance(future.result(), events.ActionExecutionEvent):
+        return future.result().status, future.result().result
+
+    return statuses.SUCCEEDED, future.result()
+
+
+def settle_task(task, update_task_state):
+    """Complete the task or the items of the task that have no action to execute.
+
+    The update_task_state callable takes the task ID, the route, the action spec, and the status.
+    Returns the number of actions that are settled and the action specs left to execute.
+    """
+    # A task with items of an empty list has no action to execute.
+    if not task['actions']:
+        update_task_state(task['id'], task['route'], {}, statuses.RUNNING)
+        update_task_state(task['id'], task['route'], {}, statuses.SUCCEEDED)
+        return 1, []
+
+    settled = 0
+    action_specs = []
+
+    for action_spec in task['actions']:
+        # A task with no action completes once it is running.
+        if action_spec.get('action') is None:
+            update_task_state(task['id'], task['route'], action_spec, statuses.RUNNING)
+            update_task_state(task['id'], task['route'], action_spec, statuses.SUCCEEDED)
+            settled += 1
+            continue
+
+        action_specs.append(action_spec)
+
+    return settled, action_specs
+
+
+class TimerHandle(object):
+
+    def __init__(self, deadline, callback):
+        self.deadline = deadline
+        self.callback = callback
+        self.canceled = False
+
+    def cancel(self):
+        self.canceled = True
+
+
+class RunnerMetrics(object):
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started_at = None
+        self.finished_at = None
+        self.tasks_dispatched = 0
+        self.tasks_delayed = 0
+        self.actions_dispatched = 0
+        self.actions_succeeded = 0
+        self.actions_failed = 0
+        self.actions_canceled = 0
+        self.actions_active = 0
+        self.actions_peak = 0
+
+    def start(self):
+        if self.started_at is None:
+            self.started_at = time.time()
+
+        self.finished_at = None
+
+    def stop(self):
+        if self.started_at is not None:
+            self.finished_at = time.time()
+
+    def action_started(self):
+        self.actions_dispatched += 1
+        self.actions_active += 1
+        self.actions_peak = max(self.actions_peak, self.actions_active)
+
+    def action_completed(self, status):
+        self.actions_active -= 1
+
+        if status == statuses.SUCCEEDED:
+            self.actions_succeeded += 1
+        elif status == statuses.CANCELED:
+            self.actions_canceled += 1
+        else:
+            self.actions_failed += 1
+
+    def get_actions_completed(self):
+        return self.actions_succeeded + self.actions_failed + self.actions_canceled
+
+    def get_elapsed(self):
+        if self.started_at is None:
+            return 0.0
+
+        return (self.finished_at or time.time()) - self.started_at
+
+    def get_throughput(self):
+        elapsed = self.get_elapsed()
+
+        return self.get_actions_completed() / elapsed if elapsed > 0 else 0.0
+
+    def serialize(self):
+        return {
+            'elapsed': self.get_elapsed(),
+            'throughput': self.get_throughput(),
+            'tasks_dispatched': self.tasks_dispatched,
+            'tasks_delayed': self.tasks_delayed,
+            'actions_dispatched': self.actions_dispatched,
+            'actions_completed': self.get_actions_completed(),
+            'actions_succeeded': self.actions_succeeded,
+            'actions_failed': self.actions_failed,
+            'actions_canceled': self.actions_canceled,
+            'actions_active': self.actions_active,
+            'actions_peak': self.actions_peak
+        }
+
+
+@six.add_metaclass(abc.ABCMeta)
+class WorkflowRunner(object):
+
+    def __init__(self, conductor):
+        self.conductor = conductor
+        self.metrics = RunnerMetrics()
+
+        # Tasks that are waiting on their delay to expire, keyed by task id and route.
+        self._pending = {}
+
+        # Tasks whose delay has expired and are not to be delayed again until they complete.
+        self._delayed = set()
+
+        # Number of tasks that completed on dispatch.
+        self._settled = 0
+
+    @abc.abstractmethod
+    def _execute(self, task, action_spec):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _start_timer(self, delay, callback):
+        raise NotImplementedError()
+
+    def get_workflow_status(self):
+        return self.conductor.get_workflow_status()
+
+    def get_metrics(self):
+        return self.metrics.serialize()
+
+    def is_running(self):
+        return self.get_workflow_status() in statuses.RUNNING_STATUSES
+
+    def is_stopped(self):
+        status = self.get_workflow_status()
+
+        return status in statuses.COMPLETED_STATUSES or status == statuses.PAUSED
+
+    def is_idle(self):
+        return self.metrics.actions_active <= 0 and not self._pending
+
+    def start_workflow(self):
+        status = self.get_workflow_status()
+
+        if status == statuses.PAUSED:
+            self.conductor.request_workflow_status(statuses.RESUMING)
+        elif status not in statuses.RUNNING_STATUSES + statuses.COMPLETED_STATUSES:
+            self.conductor.request_workflow_status(statuses.RUNNING)
+
+        self.metrics.start()
+
+    def stop_workflow(self):
+        for handle in self._pending.values():
+            handle.cancel()
+
+        self._pending.clear()
+        self.metrics.stop()
+
+    def pause_workflow(self):
+        self.conductor.request_workflow_status(statuses.PAUSING)
+
+        # Tasks that are still delayed are not dispatched and the delay starts over on resume.
+        for handle in self._pending.values():
+            handle.cancel()
+
+        self._pending.clear()
+
+    def cancel_workflow(self):
+        self.conductor.request_workflow_status(statuses.CANCELING)
+
+        for handle in self._pending.values():
+            handle.cancel()
+
+        self._pending.clear()
+
+    def dispatch(self):
+        dispatched = 0
+
+        # Tasks that complete on dispatch such as tasks with no action may stage
+        # more tasks so keep dispatching until no task completes on dispatch.
+        while self.is_running():
+            settled = self._settled
+
+            for task in self.conductor.get_next_tasks():
+                task_key = (task['id'], task['route'])
+
+                if task_key in self._pending:
+                    continue
+
+                if task.get('delay') and task_key not in self._delayed:
+                    callback = functools.partial(self._expire_delay, task_key)
+                    self._pending[task_key] = self._start_timer(task['delay'], callback)
+                    self.metrics.tasks_delayed += 1
+                    continue
+
+                self.dispatch_task(task)
+                dispatched += 1
+
+            if self._settled == settled:
+                break
+
+        return dispatched
+
+    def _expire_delay(self, task_key):
+        self._pending.pop(task_key, None)
+        self._delayed.add(task_key)
+
+    def dispatch_task(self, task):
+        self.metrics.tasks_dispatched += 1
+
+        settled, action_specs = settle_task(task, self.update_task_state)
+        self._settled += settled
+
+        for action_spec in action_specs:
+            self.update_task_state(task['id'], task['route'], action_spec, statuses.RUNNING)
+            self.metrics.action_started()
+            self._execute(task, action_spec)
+
+    def complete_action(self, task_id, route, action_spec, status, result=None):
+        self.metrics.action_completed(status)
+        self.update_task_state(task_id, route, action_spec, status, result=result)
+
+        task_state_entry = self.conductor.get_task_state_entry(task_id, route)
+
+        if task_state_entry and task_state_entry.get('status') in statuses.COMPLETED_STATUSES:
+            self._delayed.discard((task_id, route))
+
+    def update_task_state(self, task_id, route, action_spec, status, result=None):
+        ac_ex_event = get_action_event(action_spec, status, result=result)
+
+        try:
+            self.conductor.update_task_state(task_id, route, ac_ex_event)
+        except Exception as e:
+            self.conductor.log_error(e, task_id=task_id, route=route)
+
+            if self.get_workflow_status() not in statuses.COMPLETED_STATUSES:
+                self.conductor.request_workflow_status(statuses.FAILED)
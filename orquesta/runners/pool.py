@@ -0,0 +1,187 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import itertools
+import logging
+import time
+
+from concurrent import futures
+from six.moves import queue
+
+from orquesta.runners import base as runner_base
+
+
+LOG = logging.getLogger(__name__)
+
+POOL_THREAD = 'thread'
+POOL_PROCESS = 'process'
+
+POOL_EXECUTORS = {
+    POOL_THREAD: futures.ThreadPoolExecutor,
+    POOL_PROCESS: futures.ProcessPoolExecutor
+}
+
+
+class PoolRunner(runner_base.WorkflowRunner):
+
+    def __init__(self, conductor, actions, max_workers=None, routes=None,
+                 default_pool=POOL_THREAD, executors=None):
+        super(PoolRunner, self).__init__(conductor)
+
+        self.actions = actions
+        self.routes = routes or {}
+        self.default_pool = default_pool
+
+        if not isinstance(max_workers, dict):
+            max_workers = {name: max_workers for name in POOL_EXECUTORS.keys()}
+
+        self.max_workers = max_workers
+
+        # Executors provided by the caller are not shut down by the runner.
+        self._executors = dict(executors or {})
+        self._owned_executors = set()
+
+        for pool in [default_pool] + list(self.routes.values()):
+            if pool not in POOL_EXECUTORS and pool not in self._executors:
+                raise ValueError('The pool "%s" is not valid.' % pool)
+
+        # The results of the actions and the requests to pause or cancel are passed thru the
+        # queue so the conductor is only updated from the thread that runs the workflow.
+        self._queue = queue.Queue()
+        self._futures = set()
+        self._timers = []
+        self._timer_seq = itertools.count()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def get_pool(self, action):
+        return self.routes.get(action, self.default_pool)
+
+    def get_executor(self, pool):
+        if pool not in self._executors:
+            executor_cls = POOL_EXECUTORS[pool]
+            self._executors[pool] = executor_cls(max_workers=self.max_workers.get(pool))
+            self._owned_executors.add(pool)
+
+        return self._executors[pool]
+
+    def shutdown(self, wait=True):
+        for pool in list(self._owned_executors):
+            self._executors.pop(pool).shutdown(wait=wait)
+
+        self._owned_executors.clear()
+
+    def run(self):
+        self.start_workflow()
+
+        while True:
+            self._fire_timers()
+            self._process_messages()
+            dispatched = self.dispatch()
+
+            if self.is_stopped() or (self.is_idle() and not dispatched):
+                break
+
+            try:
+                self._process_message(self._queue.get(timeout=self._get_wait_time()))
+            except queue.Empty:
+                pass
+
+        self.stop_workflow()
+
+        return self.get_workflow_status()
+
+    def pause(self):
+        self._queue.put(('pause',))
+
+    def cancel(self):
+        self._queue.put(('cancel',))
+
+    def _process_messages(self):
+        while True:
+            try:
+                self._process_message(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+    def _process_message(self, message):
+        if message[0] == 'action':
+            self._complete(*message[1:])
+        elif message[0] == 'pause':
+            self.pause_workflow()
+        elif message[0] == 'cancel':
+            self.cancel_workflow()
+
+            # Only the actions that are still queued in the pools can be canceled.
+            for future in list(self._futures):
+                future.cancel()
+
+    def _get_wait_time(self):
+        while self._timers and self._timers[0][2].canceled:
+            heapq.heappop(self._timers)
+
+        if not self._timers:
+            return None
+
+        return max(self._timers[0][0] - time.time(), 0)
+
+    def _start_timer(self, delay, callback):
+        handle = runner_base.TimerHandle(time.time() + delay, callback)
+        heapq.heappush(self._timers, (handle.deadline, next(self._timer_seq), handle))
+
+        return handle
+
+    def _fire_timers(self):
+        now = time.time()
+
+        while self._timers and self._timers[0][0] <= now:
+            handle = heapq.heappop(self._timers)[2]
+
+            if not handle.canceled:
+                handle.callback()
+
+    def _execute(self, task, action_spec):
+        action = action_spec['action']
+        action_input = action_spec.get('input') or {}
+
+        try:
+            if action not in self.actions:
+                raise ValueError('The action "%s" is not registered.' % action)
+
+            executor = self.get_executor(self.get_pool(action))
+            future = executor.submit(self.actions[action], **action_input)
+        except Exception as e:
+            future = futures.Future()
+            future.set_exception(e)
+
+        self._futures.add(future)
+
+        message = ('action', task['id'], task['route'], action_spec)
+        future.add_done_callback(lambda f: self._queue.put(message + (f,)))
+
+    def _complete(self, task_id, route, action_spec, future):
+        self._futures.discard(future)
+
+        status, result = runner_base.get_action_outcome(future)
+        self.complete_action(task_id, route, action_spec, status, result=result)
+
+
+def run(conductor, actions, **kwargs):
+    with PoolRunner(conductor, actions, **kwargs) as runner:
+        runner.run()
+
+    return runner
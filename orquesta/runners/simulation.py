@@ -0,0 +1,263 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import functools
+import heapq
+import itertools
+import logging
+import math
+import random
+import six
+
+from orquesta import conducting
+from orquesta.runners import base as runner_base
+from orquesta import statuses
+
+
+LOG = logging.getLogger(__name__)
+
+PERCENTILES = [50, 90, 95, 99]
+
+SIMULATED_FAILURE = {'error': 'SimulatedFailure: The action failed in the simulation.'}
+
+
+def constant(value):
+    return lambda rng: value
+
+
+def uniform(low, high):
+    return lambda rng: rng.uniform(low, high)
+
+
+def exponential(mean):
+    return lambda rng: rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+
+
+def normal(mean, stddev):
+    return lambda rng: max(rng.normalvariate(mean, stddev), 0.0)
+
+
+def lognormal(mean, sigma):
+    # The mu of the underlying normal distribution is derived so the mean is as given.
+    mu = math.log(mean) - sigma ** 2 / 2.0
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def get_distribution(value):
+    if callable(value):
+        return value
+
+    return constant(value or 0.0)
+
+
+def get_percentile(values, percent):
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    rank = int(math.ceil(percent / 100.0 * len(values)))
+
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+def get_summary(values):
+    summary = {'count': len(values)}
+
+    for percent in PERCENTILES:
+        summary['p%s' % percent] = get_percentile(values, percent)
+
+    summary['max'] = max(values) if values else 0.0
+    summary['mean'] = sum(values) / len(values) if values else 0.0
+
+    return summary
+
+
+class SimulationConductor(conducting.WorkflowConductor):
+
+    def _get_workflow_state_snapshot(self):
+        # The simulation processes the events one at a time in a single thread and the
+        # expressions of a task context are evaluated before the workflow state changes
+        # again, so the expressions read the workflow state in place instead of a copy.
+        workflow_state = self.workflow_state
+
+        return {
+            'contexts': workflow_state.contexts,
+            'routes': workflow_state.routes,
+            'sequence': workflow_state.sequence,
+            'staged': workflow_state.staged,
+            'status': workflow_state.status,
+            'tasks': workflow_state.tasks
+        }
+
+
+class SimulationRunner(runner_base.WorkflowRunner):
+
+    def __init__(self, conductor, durations=None, default_duration=0.0, failures=None,
+                 results=None, workers=None, seed=None, rng=None):
+        super(SimulationRunner, self).__init__(conductor)
+
+        self.durations = {k: get_distribution(v) for k, v in six.iteritems(durations or {})}
+        self.default_duration = get_distribution(default_duration)
+        self.failures = failures or {}
+        self.results = results or {}
+        self.workers = workers
+        self.rng = rng or random.Random(seed)
+
+        # The virtual clock only advances to the time of the next event in the queue.
+        self.clock = 0.0
+        self._events = []
+        self._event_seq = itertools.count()
+
+        # Actions that are waiting for a worker when all the workers are busy.
+        self._waiting = collections.deque()
+        self._running = 0
+        self.peak_parallelism = 0
+
+        # The time each task starts and the latency of the tasks once completed.
+        self._task_started = {}
+        self.task_latencies = collections.defaultdict(list)
+
+    def run(self):
+        self.start_workflow()
+
+        while True:
+            dispatched = self.dispatch()
+
+            if self.is_stopped() or (self.is_idle() and not dispatched):
+                break
+
+            if not self._fire_next_event():
+                break
+
+        self.stop_workflow()
+
+        return self.get_workflow_status()
+
+    def get_makespan(self):
+        return self.clock
+
+    def get_report(self):
+        latencies = list(itertools.chain.from_iterable(self.task_latencies.values()))
+
+        return {
+            'status': self.get_workflow_status(),
+            'makespan': self.get_makespan(),
+            'peak_parallelism': self.peak_parallelism,
+            'actions': self.metrics.actions_dispatched,
+            'task_latency': get_summary(latencies),
+            'tasks': {
+                task_id: get_summary(values)
+                for task_id, values in six.iteritems(self.task_latencies)
+            }
+        }
+
+    def _start_timer(self, delay, callback):
+        handle = runner_base.TimerHandle(self.clock + delay, callback)
+        heapq.heappush(self._events, (handle.deadline, next(self._event_seq), handle))
+
+        return handle
+
+    def _fire_next_event(self):
+        while self._events:
+            deadline, seq, handle = heapq.heappop(self._events)
+
+            if handle.canceled:
+                continue
+
+            self.clock = max(self.clock, deadline)
+            handle.callback()
+
+            return True
+
+        return False
+
+    def _execute(self, task, action_spec):
+        self._task_started.setdefault((task['id'], task['route']), self.clock)
+
+        if self.workers is not None and self._running >= self.workers:
+            self._waiting.append((task, action_spec))
+            return
+
+        self._start_action(task, action_spec)
+
+    def _start_action(self, task, action_spec):
+        action = action_spec['action']
+        duration = self.durations.get(action, self.default_duration)(self.rng)
+
+        self._running += 1
+        self.peak_parallelism = max(self.peak_parallelism, self._running)
+
+        self._start_timer(duration, functools.partial(self._complete, task, action_spec))
+
+    def _complete(self, task, action_spec):
+        action = action_spec['action']
+        task_key = (task['id'], task['route'])
+
+        self._running -= 1
+
+        if self.rng.random() < self.failures.get(action, 0.0):
+            status, result = statuses.FAILED, SIMULATED_FAILURE
+        else:
+            status, result = statuses.SUCCEEDED, self.results.get(action)
+
+            if callable(result):
+                result = result(action_spec)
+
+        # Hand the worker over to the next action that is waiting.
+        while self._waiting and (self.workers is None or self._running < self.workers):
+            self._start_action(*self._waiting.popleft())
+
+        self.complete_action(task['id'], task['route'], action_spec, status, result=result)
+
+        task_state_entry = self.conductor.get_task_state_entry(*task_key)
+
+        if task_state_entry and task_state_entry.get('status') in statuses.COMPLETED_STATUSES:
+            started = self._task_started.pop(task_key, self.clock)
+            self.task_latencies[task['id']].append(self.clock - started)
+
+
+def run(conductor, **kwargs):
+    runner = SimulationRunner(conductor, **kwargs)
+    runner.run()
+
+    return runner
+
+
+def simulate(spec, runs=1, inputs=None, context=None, seed=None, **kwargs):
+    rng = random.Random(seed)
+    graph = None
+    results = collections.defaultdict(list)
+    task_latencies = []
+    workflow_statuses = collections.Counter()
+
+    for i in range(0, runs):
+        conductor = SimulationConductor(spec, context=context, inputs=inputs, graph=graph)
+
+        # The graph does not change during execution so it is composed once for all the runs.
+        graph = conductor.graph
+
+        runner = run(conductor, rng=rng, **kwargs)
+        report = runner.get_report()
+
+        workflow_statuses[report['status']] += 1
+        results['makespan'].append(report['makespan'])
+        results['peak_parallelism'].append(report['peak_parallelism'])
+        task_latencies.extend(itertools.chain.from_iterable(runner.task_latencies.values()))
+
+    return {
+        'runs': runs,
+        'statuses': dict(workflow_statuses),
+        'makespan': get_summary(results['makespan']),
+        'peak_parallelism': get_summary(results['peak_parallelism']),
+        'task_latency': get_summary(task_latencies)
+    }
@@ -0,0 +1,424 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import functools
+import heapq
+import itertools
+import json
+import logging
+import time
+import zlib
+
+from orquesta import conducting
+from orquesta.runners import base as runner_base
+from orquesta import statuses
+
+
+LOG = logging.getLogger(__name__)
+
+POLICY_ROUND_ROBIN = 'round_robin'
+POLICY_WEIGHTED = 'weighted'
+
+SCHEDULING_POLICIES = [
+    POLICY_ROUND_ROBIN,
+    POLICY_WEIGHTED
+]
+
+
+def get_action_key(task_id, route, item_id=None):
+    return (task_id, route, item_id)
+
+
+def get_event_item_id(event):
+    return event.context.get('item_id') if isinstance(event.context, dict) else None
+
+
+class ConductorStore(object):
+
+    def __init__(self):
+        self._entries = {}
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        if key not in self._entries:
+            return default
+
+        return json.loads(zlib.decompress(self._entries[key]).decode('utf-8'))
+
+    def set(self, key, value):
+        # The serialized conductors repeat the spec and graph of the workflow
+        # definition so they are compressed to keep the evicted workflows small.
+        text = json.dumps(value, separators=(',', ':'))
+        self._entries[key] = zlib.compress(text.encode('utf-8'))
+
+    def delete(self, key):
+        self._entries.pop(key, None)
+
+
+class ScheduledWorkflow(object):
+
+    def __init__(self, wf_ex_id, conductor, weight=1, seq=0):
+        self.id = wf_ex_id
+        self.seq = seq
+        self.conductor = conductor
+        self.weight = weight
+        self.ready = collections.deque()
+        self.dirty = True
+        self.actions = set()
+        self.vtime = 0.0
+        self.touched = time.time()
+
+    @property
+    def active(self):
+        return len(self.actions)
+
+    def is_loaded(self):
+        return self.conductor is not None
+
+    def is_idle(self):
+        return not self.dirty and not self.ready
+
+
+class WorkflowScheduler(object):
+
+    def __init__(self, policy=POLICY_ROUND_ROBIN, max_active=None, max_loaded=None,
+                 idle_timeout=None, store=None):
+        if policy not in SCHEDULING_POLICIES:
+            raise ValueError('The scheduling policy "%s" is not valid.' % policy)
+
+        self.policy = policy
+        self.max_active = max_active
+        self.max_loaded = max_loaded
+        self.idle_timeout = idle_timeout
+        self.store = store if store is not None else ConductorStore()
+
+        self._workflows = {}
+
+        # The loaded workflows ordered from the least to the most recently used.
+        self._loaded = collections.OrderedDict()
+
+        # The workflows that have changed and need to be asked for the next tasks.
+        self._dirty = set()
+
+        # The workflows that have actions ready to be dispatched.
+        self._ready = set()
+
+        self._active = 0
+        self._vtime = 0.0
+        self._seq = itertools.count()
+
+        self._stats = {
+            'dispatched': 0,
+            'completed': 0,
+            'evicted': 0,
+            'restored': 0
+        }
+
+    def __contains__(self, wf_ex_id):
+        return wf_ex_id in self._workflows
+
+    def __len__(self):
+        return len(self._workflows)
+
+    def get_stats(self):
+        stats = dict(self._stats)
+        stats['workflows'] = len(self._workflows)
+        stats['loaded'] = len(self._loaded)
+        stats['active'] = self._active
+        stats['ready'] = sum([len(wf.ready) for wf in self._workflows.values()])
+
+        return stats
+
+    def get_workflow_ids(self):
+        return list(self._workflows.keys())
+
+    def get_active_count(self, wf_ex_id=None):
+        if wf_ex_id is None:
+            return self._active
+
+        return self._get_workflow(wf_ex_id).active
+
+    def get_active_actions(self, wf_ex_id):
+        return list(self._get_workflow(wf_ex_id).actions)
+
+    def _get_workflow(self, wf_ex_id):
+        if wf_ex_id not in self._workflows:
+            raise KeyError('The workflow execution "%s" is not scheduled.' % wf_ex_id)
+
+        return self._workflows[wf_ex_id]
+
+    def _touch(self, wf):
+        wf.touched = time.time()
+        self._loaded.pop(wf.id, None)
+        self._loaded[wf.id] = True
+
+    def add(self, wf_ex_id, conductor, weight=1, active=None):
+        if wf_ex_id in self._workflows:
+            raise KeyError('The workflow execution "%s" is already scheduled.' % wf_ex_id)
+
+        if weight <= 0:
+            raise ValueError('The weight of the workflow execution must be positive.')
+
+        wf = ScheduledWorkflow(wf_ex_id, conductor, weight=weight, seq=next(self._seq))
+
+        # Start the new workflow at the current virtual time so it does not
+        # take over the scheduling until it catches up with the others.
+        wf.vtime = self._vtime
+
+        # Track the actions that are still in progress if the workflow is handed over.
+        wf.actions.update(get_action_key(*action) for action in active or [])
+        self._active += wf.active
+
+        self._workflows[wf_ex_id] = wf
+        self._dirty.add(wf_ex_id)
+        self._touch(wf)
+        self._enforce_max_loaded()
+
+        return wf
+
+    def remove(self, wf_ex_id):
+        conductor = self.get_conductor(wf_ex_id)
+        wf = self._workflows.pop(wf_ex_id)
+
+        self._active -= wf.active
+        self._loaded.pop(wf_ex_id, None)
+        self._dirty.discard(wf_ex_id)
+        self._ready.discard(wf_ex_id)
+
+        return conductor
+
+    def is_loaded(self, wf_ex_id):
+        return self._get_workflow(wf_ex_id).is_loaded()
+
+    def get_conductor(self, wf_ex_id):
+        wf = self._get_workflow(wf_ex_id)
+
+        if not wf.is_loaded():
+            wf.conductor = conducting.WorkflowConductor.deserialize(self.store.get(wf_ex_id))
+            self.store.delete(wf_ex_id)
+            self._stats['restored'] += 1
+
+        self._touch(wf)
+
+        return wf.conductor
+
+    def evict(self, wf_ex_id):
+        wf = self._get_workflow(wf_ex_id)
+
+        if not wf.is_loaded():
+            return False
+
+        if not wf.is_idle():
+            raise ValueError('The workflow execution "%s" is not idle.' % wf_ex_id)
+
+        self.store.set(wf_ex_id, wf.conductor.serialize())
+        wf.conductor = None
+        self._loaded.pop(wf_ex_id, None)
+        self._stats['evicted'] += 1
+
+        return True
+
+    def evict_idle(self, idle_timeout=None):
+        idle_timeout = idle_timeout if idle_timeout is not None else self.idle_timeout
+
+        if idle_timeout is None:
+            return []
+
+        evicted = []
+        cutoff = time.time() - idle_timeout
+
+        # The loaded workflows are ordered by last use so stop at the first recent one.
+        for wf_ex_id in list(self._loaded.keys()):
+            wf = self._workflows[wf_ex_id]
+
+            if wf.touched > cutoff:
+                break
+
+            if wf.is_idle() and self.evict(wf_ex_id):
+                evicted.append(wf_ex_id)
+
+        return evicted
+
+    def _enforce_max_loaded(self):
+        if self.max_loaded is None:
+            return
+
+        for wf_ex_id in list(self._loaded.keys()):
+            if len(self._loaded) <= self.max_loaded:
+                break
+
+            if self._workflows[wf_ex_id].is_idle():
+                self.evict(wf_ex_id)
+
+    def request_workflow_status(self, wf_ex_id, status):
+        conductor = self.get_conductor(wf_ex_id)
+        conductor.request_workflow_status(status)
+        self._dirty.add(wf_ex_id)
+        self._workflows[wf_ex_id].dirty = True
+
+    def update_task_state(self, wf_ex_id, task_id, route, event):
+        conductor = self.get_conductor(wf_ex_id)
+        wf = self._workflows[wf_ex_id]
+
+        # Release the slot of the action once the action execution completes. Only the actions
+        # dispatched by the scheduler hold a slot so events of other actions are not counted.
+        action_key = get_action_key(task_id, route, get_event_item_id(event))
+
+        if event.status in statuses.COMPLETED_STATUSES and action_key in wf.actions:
+            wf.actions.remove(action_key)
+            self._active -= 1
+            self._stats['completed'] += 1
+
+        try:
+            conductor.update_task_state(task_id, route, event)
+        finally:
+            self._dirty.add(wf_ex_id)
+            wf.dirty = True
+
+        return conductor.get_workflow_status()
+
+    def _settle(self, wf, task_id, route, action_spec, status):
+        wf.conductor.update_task_state(
+            task_id,
+            route,
+            runner_base.get_action_event(action_spec, status)
+        )
+
+    def _refresh(self, wf):
+        wf.dirty = False
+        wf.ready.clear()
+
+        conductor = wf.conductor
+
+        settle = functools.partial(self._settle, wf)
+
+        # Tasks that complete on dispatch such as tasks with no action may
+        # stage more tasks so keep asking until no task completes on dispatch.
+        while conductor.get_workflow_status() in statuses.RUNNING_STATUSES:
+            settled = 0
+            wf.ready.clear()
+
+            for task in conductor.get_next_tasks():
+                task_settled, action_specs = runner_base.settle_task(task, settle)
+                settled += task_settled
+
+                for action_spec in action_specs:
+                    wf.ready.append((task['id'], task['route'], task.get('delay'), action_spec))
+
+            if not settled:
+                break
+
+        if conductor.get_workflow_status() not in statuses.RUNNING_STATUSES:
+            wf.ready.clear()
+
+    def _dispatch(self, wf):
+        task_id, route, delay, action_spec = wf.ready.popleft()
+        ac_ex_event = runner_base.get_action_event(action_spec, statuses.RUNNING)
+        wf.conductor.update_task_state(task_id, route, ac_ex_event)
+
+        wf.actions.add(get_action_key(task_id, route, action_spec.get('item_id')))
+        self._active += 1
+        self._stats['dispatched'] += 1
+
+        dispatch = {
+            'workflow_id': wf.id,
+            'task_id': task_id,
+            'route': route,
+            'action': action_spec['action'],
+            'input': action_spec.get('input')
+        }
+
+        if action_spec.get('item_id') is not None:
+            dispatch['item_id'] = action_spec['item_id']
+
+        if delay:
+            dispatch['delay'] = delay
+
+        return dispatch
+
+    def schedule(self, limit=None):
+        dispatched = []
+
+        # Ask the workflows that have changed since the last pass for their next tasks.
+        for wf_ex_id in list(self._dirty):
+            wf = self._workflows.get(wf_ex_id)
+
+            if wf is None:
+                continue
+
+            self.get_conductor(wf_ex_id)
+
+            try:
+                self._refresh(wf)
+            except Exception as e:
+                wf.ready.clear()
+                wf.conductor.log_error(e)
+
+                if wf.conductor.get_workflow_status() not in statuses.COMPLETED_STATUSES:
+                    wf.conductor.request_workflow_status(statuses.FAILED)
+
+            if wf.ready:
+                self._ready.add(wf_ex_id)
+            else:
+                self._ready.discard(wf_ex_id)
+
+        self._dirty.clear()
+
+        capacity = limit
+
+        if self.max_active is not None:
+            available = max(self.max_active - self._active, 0)
+            capacity = available if capacity is None else min(capacity, available)
+
+        # Dispatch one action at a time from the workflow with the lowest virtual time. The
+        # virtual time of the workflow advances by the inverse of its weight on each dispatch
+        # so the workflows get a share of the capacity that is proportional to their weight.
+        ready = [self._workflows[wf_ex_id] for wf_ex_id in self._ready]
+
+        # Workflows that were idle resume at the current virtual time instead of catching up.
+        for wf in ready:
+            wf.vtime = max(wf.vtime, self._vtime)
+
+        ready_heap = [(wf.vtime, wf.seq, wf) for wf in ready]
+        heapq.heapify(ready_heap)
+
+        while ready_heap and (capacity is None or len(dispatched) < capacity):
+            vtime, seq, wf = heapq.heappop(ready_heap)
+
+            weight = wf.weight if self.policy == POLICY_WEIGHTED else 1
+            wf.vtime = vtime + 1.0 / weight
+            self._vtime = vtime
+
+            try:
+                dispatched.append(self._dispatch(wf))
+            except Exception as e:
+                wf.ready.clear()
+                wf.conductor.log_error(e)
+                self._ready.discard(wf.id)
+                self._dirty.add(wf.id)
+                wf.dirty = True
+                continue
+
+            if wf.ready:
+                heapq.heappush(ready_heap, (wf.vtime, wf.seq, wf))
+            else:
+                self._ready.discard(wf.id)
+
+        self._enforce_max_loaded()
+
+        return dispatched
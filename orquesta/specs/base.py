@@ -10,31 +10,93 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import abc
 import collections
+import copy
 import inspect
 import json
-import jsonschema
 import logging
 import re
 import six
-import yaml
 
+import orquesta
 from orquesta import exceptions as exc
 from orquesta.expressions import base as expr_base
 from orquesta.specs import types as spec_types
+from orquesta.utils import cache as cache_util
 from orquesta.utils import expression as expr_util
 from orquesta.utils import parameters as args_util
 from orquesta.utils import schema as schema_util
+from orquesta.utils import specs as spec_util
 from orquesta.utils import strings as str_util
 
 
 LOG = logging.getLogger(__name__)
 
+_INSPECTION_CACHE = {
+    'enabled': False,
+    'memory': cache_util.LRUCache(max_size=1024),
+    'disk': None
+}
+
 
 def isspec(value):
     return inspect.isclass(value) and issubclass(value, Spec)
 
 
+def configure_inspection_cache(enabled=None, max_size=None, path=None):
+    if enabled is not None:
+        _INSPECTION_CACHE['enabled'] = enabled
+
+    if max_size is not None:
+        _INSPECTION_CACHE['memory'] = cache_util.LRUCache(max_size=max_size)
+
+    if path is not None:
+        _INSPECTION_CACHE['disk'] = cache_util.FileCache(path) if path else None
+
+
+def is_inspection_cache_enabled():
+    return _INSPECTION_CACHE['enabled']
+
+
+def clear_inspection_cache():
+    _INSPECTION_CACHE['memory'].clear()
+
+    if _INSPECTION_CACHE['disk']:
+        _INSPECTION_CACHE['disk'].clear()
+
+
+def get_cached_inspection(key):
+    errors = _INSPECTION_CACHE['memory'].get(key)
+
+    if errors is None and _INSPECTION_CACHE['disk']:
+        errors = _INSPECTION_CACHE['disk'].get(key)
+
+        if errors is not None:
+            _INSPECTION_CACHE['memory'].set(key, errors)
+
+    return errors
+
+
+def set_cached_inspection(key, errors):
+    _INSPECTION_CACHE['memory'].set(key, errors)
+
+    if _INSPECTION_CACHE['disk']:
+        _INSPECTION_CACHE['disk'].set(key, errors)
+
+
+class SpecMeta(abc.ABCMeta):
+
+    # Freeze the spec once it is fully constructed, including the
+    # __init__ of subclasses that further process the spec properties.
+    def __call__(cls, *args, **kwargs):
+        instance = super(SpecMeta, cls).__call__(*args, **kwargs)
+        instance.__dict__['_frozen'] = True
+
+        return instance
+
+
+@six.add_metaclass(SpecMeta)
 class Spec(object):
     _catalog = None
 
@@ -65,40 +127,47 @@ class Spec(object):
     # Override __getattr__ so we can dynamically map class attributes to spec properties.
     # Per documentation, __getattr__ is called by __getattribute__ on AttributeError. In
     # this case, the attribute does not physically exist on the class and so __getattr__
-    # is called which it is overridden here to access the spec dict.
+    # is called which it is overridden here to access the spec dict. The values of the spec
+    # properties are mapped to attribute names on construction so the lookup here is cheap.
     def __getattr__(self, name):
-        # Retrieve from spec if attribute is a meta schema property.
-        if name in self._meta_schema.get('properties', {}):
-            return self.spec.get(name)
+        attrs = self.__dict__.get('_attrs')
 
-        if name.replace('_', '-') in self._meta_schema.get('properties', {}):
-            return self.spec.get(name.replace('_', '-'))
+        if attrs is not None and name in attrs:
+            return attrs[name]
 
-        # Retrieve from spec if attribute is a schema property.
-        if name in self._schema.get('properties', {}):
-            return self.spec.get(name)
-
-        if name.replace('_', '-') in self._schema.get('properties', {}):
-            return self.spec.get(name.replace('_', '-'))
+        spec = self.__dict__.get('spec')
 
         # Retrieve from spec if attribute match a regex pattern in the schema.
-        for pattern in self._schema.get('patternProperties', {}).keys():
-            if re.match(pattern, name):
-                return self.spec.get(name)
+        if isinstance(spec, dict) and not name.startswith('__'):
+            for pattern in self._get_pattern_regexes():
+                if pattern.match(name):
+                    return spec.get(name)
 
         # Use default for all other attributes.
         return self.__getattribute__(name)
 
+    def __setattr__(self, name, value):
+        if self.__dict__.get('_frozen'):
+            raise exc.SpecImmutableError(name)
+
+        super(Spec, self).__setattr__(name, value)
+
+    def __delattr__(self, name):
+        if self.__dict__.get('_frozen'):
+            raise exc.SpecImmutableError(name)
+
+        super(Spec, self).__delattr__(name)
+
     def __init__(self, spec, name=None, member=False):
         # Update the schema to include schema parts from parent classes.
-        self._schema = self.get_schema(includes=None, resolve_specs=False)
-        self._meta_schema = self.get_meta_schema()
+        self._schema = self._get_merged_schema()
+        self._meta_schema = self._get_merged_meta_schema()
 
         if not spec:
             raise ValueError('The spec cannot be type of None.')
 
         self.spec = (
-            yaml.safe_load(spec)
+            spec_util.load_definition(spec)
             if not isinstance(spec, dict) and not isinstance(spec, list)
             else spec
         )
@@ -106,6 +175,22 @@ class Spec(object):
         if not isinstance(self.spec, dict) and not isinstance(spec, list):
             raise ValueError('The spec is not type of json or yaml.')
 
+        # Map the attribute names to the values of the spec properties.
+        self._attrs = {}
+
+        if isinstance(self.spec, dict):
+            for attr_name, prop_name in six.iteritems(self._get_attr_map()):
+                self._attrs[attr_name] = self.spec.get(prop_name)
+
+            for prop_name in self.spec.keys():
+                if prop_name in self._attrs or not isinstance(prop_name, six.string_types):
+                    continue
+
+                for pattern in self._get_pattern_regexes():
+                    if pattern.match(prop_name):
+                        self._attrs[prop_name] = self.spec.get(prop_name)
+                        break
+
         if name:
             self.name = name
 
@@ -139,6 +224,50 @@ class Spec(object):
                 if re.match(pattern, name) and value:
                     setattr(self, name, spec_cls(value, member=True))
 
+    @classmethod
+    def _get_merged_schema(cls):
+        if '_merged_schema' not in cls.__dict__:
+            cls._merged_schema = cls._get_schema(includes=None, resolve_specs=False)
+
+        return cls._merged_schema
+
+    @classmethod
+    def _get_merged_meta_schema(cls):
+        if '_merged_meta_schema' not in cls.__dict__:
+            cls._merged_meta_schema = cls.get_meta_schema()
+
+        return cls._merged_meta_schema
+
+    @classmethod
+    def _get_attr_map(cls):
+        if '_attr_map' not in cls.__dict__:
+            attr_map = {}
+
+            prop_names = (
+                list(cls._get_merged_meta_schema().get('properties', {}).keys()) +
+                list(cls._get_merged_schema().get('properties', {}).keys())
+            )
+
+            for prop_name in prop_names:
+                attr_map[prop_name] = prop_name
+
+            for prop_name in prop_names:
+                attr_map.setdefault(prop_name.replace('-', '_'), prop_name)
+
+            cls._attr_map = attr_map
+
+        return cls._attr_map
+
+    @classmethod
+    def _get_pattern_regexes(cls):
+        if '_pattern_regexes' not in cls.__dict__:
+            cls._pattern_regexes = [
+                re.compile(pattern)
+                for pattern in cls._get_merged_schema().get('patternProperties', {}).keys()
+            ]
+
+        return cls._pattern_regexes
+
     def copy(self):
         return self.deserialize(self.serialize())
 
@@ -177,10 +306,15 @@ class Spec(object):
 
     @classmethod
     def get_schema_validator(cls):
-        if not cls._schema_validator:
-            cls._schema_validator = jsonschema.Draft4Validator(cls.get_schema())
+        backend = schema_util.get_validator_backend()
+        cached = cls.__dict__.get('_schema_validator')
+
+        # The validator is cached per spec class and is created again if the backend changes.
+        if not cached or cached[0] != backend:
+            cached = (backend, schema_util.get_validator(cls._get_schema()))
+            cls._schema_validator = cached
 
-        return cls._schema_validator
+        return cached[1]
 
     @classmethod
     def get_meta_schema(cls):
@@ -196,12 +330,30 @@ class Spec(object):
 
     @classmethod
     def get_schema(cls, includes=['meta'], resolve_specs=True):
+        return copy.deepcopy(cls._get_schema(includes=includes, resolve_specs=resolve_specs))
+
+    @classmethod
+    def _get_schema(cls, includes=['meta'], resolve_specs=True):
+        # The schema is only built once per class for each combination of arguments.
+        # The cached schema is shared and must not be modified by the caller.
+        if '_schemas' not in cls.__dict__:
+            cls._schemas = {}
+
+        key = (tuple(includes or []), resolve_specs)
+
+        if key not in cls._schemas:
+            cls._schemas[key] = cls._build_schema(includes=includes, resolve_specs=resolve_specs)
+
+        return cls._schemas[key]
+
+    @classmethod
+    def _build_schema(cls, includes=['meta'], resolve_specs=True):
         schema = {}
 
         bases = [b for b in cls.__bases__ if issubclass(b, Spec)]
 
         for base_cls in bases:
-            parent_schema = base_cls.get_schema(includes=None)
+            parent_schema = base_cls._get_schema(includes=None)
             schema = schema_util.merge_schema(schema, parent_schema)
 
         schema = schema_util.merge_schema(schema, cls._schema)
@@ -216,23 +368,23 @@ class Spec(object):
         # Resolve the schema for children specs under properties.
         for k, v in six.iteritems(schema.get('properties', {})):
             if inspect.isclass(v) and issubclass(v, Spec):
-                schema['properties'][k] = v.get_schema(includes=None)
+                schema['properties'][k] = v._get_schema(includes=None)
 
         # Resolve the schema for children specs under patternProperties.
         for k, v in six.iteritems(schema.get('patternProperties', {})):
             if inspect.isclass(v) and issubclass(v, Spec):
-                schema['patternProperties'][k] = v.get_schema(includes=None)
+                schema['patternProperties'][k] = v._get_schema(includes=None)
 
         # Resolve the schema for children specs under items.
         items_schema = schema.get('items', {})
 
         if (inspect.isclass(items_schema) and issubclass(items_schema, Spec)):
-            schema['items'] = items_schema.get_schema(includes=None)
+            schema['items'] = items_schema._get_schema(includes=None)
         elif isinstance(items_schema, dict):
             for k, v in six.iteritems(items_schema.get('properties', {})):
                 if inspect.isclass(v) and issubclass(v, Spec):
                     schema_properties = schema['items']['properties']
-                    schema_properties[k] = v.get_schema(includes=None)
+                    schema_properties[k] = v._get_schema(includes=None)
 
         return schema
 
@@ -245,10 +397,52 @@ class Spec(object):
             if parent else 'properties.' + prop_name
         )
 
+    def get_digest(self):
+        # The spec is immutable so the digest is computed once and kept with the instance.
+        if '_digest' not in self.__dict__:
+            self.__dict__['_digest'] = cache_util.get_digest(self.serialize())
+
+        return self.__dict__['_digest']
+
+    def get_inspection_cache_key(self, app_ctx=None):
+        key = {
+            'orquesta': orquesta.__version__,
+            'type': self.__class__.__module__ + '.' + self.__class__.__name__,
+            'spec': self.get_digest(),
+            'ctx': sorted(str(k) for k in (app_ctx or {}).keys())
+        }
+
+        return cache_util.get_digest(key)
+
     def inspect(self, app_ctx=None, raise_exception=False):
         if app_ctx and not isinstance(app_ctx, dict):
             raise TypeError('Application context is not type of dict.')
 
+        errors = None
+        cache_key = None
+
+        # Look up the result of a previous inspection of the same definition.
+        if is_inspection_cache_enabled():
+            try:
+                cache_key = self.get_inspection_cache_key(app_ctx=app_ctx)
+                errors = get_cached_inspection(cache_key)
+            except (TypeError, ValueError) as e:
+                LOG.warning('Unable to identify inspection cache key for spec. %s', str(e))
+
+        if errors is None:
+            errors = self._inspect(app_ctx=app_ctx)
+
+            if cache_key:
+                set_cached_inspection(cache_key, copy.deepcopy(errors))
+        else:
+            errors = copy.deepcopy(errors)
+
+        if errors and raise_exception:
+            raise exc.WorkflowInspectionError(errors)
+
+        return errors
+
+    def _inspect(self, app_ctx=None):
         errors = {}
         app_ctx_metadata = None
 
@@ -283,9 +477,6 @@ class Spec(object):
         if ctx_errors:
             errors['context'] = ctx_errors
 
-        if errors and raise_exception:
-            raise exc.WorkflowInspectionError(errors)
-
         return errors
 
     def inspect_syntax(self):
@@ -327,7 +518,7 @@ class Spec(object):
 
         errors = []
         properties = {}
-        schema = self.get_schema(includes=None)
+        schema = self._get_schema(includes=None)
 
         for prop_name, prop_type in six.iteritems(schema.get('properties', {})):
             properties[prop_name] = getattr(self, prop_name)
@@ -379,7 +570,7 @@ class Spec(object):
 
         errors = []
         properties = {}
-        schema = self.get_schema(includes=None)
+        schema = self._get_schema(includes=None)
 
         for prop_name, prop_type in six.iteritems(schema.get('properties', {})):
             properties[prop_name] = getattr(self, prop_name)
@@ -490,14 +681,13 @@ class Spec(object):
                     errors.append(decorate_ctx_var_error(ctx_var, err_msg))
 
             if prop_name in self._context_inputs:
-                updated_ctx = get_ctx_inputs(prop_name, prop_value)
-                rolling_ctx = list(set(rolling_ctx + updated_ctx))
+                rolling_ctx = rolling_ctx | set(get_ctx_inputs(prop_name, prop_value))
 
             return rolling_ctx, errors
 
         errors = []
         parent_ctx = parent.get('ctx', []) if parent else []
-        rolling_ctx = list(set(parent_ctx))
+        rolling_ctx = set(parent_ctx)
 
         for prop_name in self._context_evaluation_sequence:
             prop_value = getattr(self, prop_name)
@@ -518,7 +708,7 @@ class Spec(object):
 
                 result = prop_value.inspect_context(parent=item_parent)
                 errors.extend(result[0])
-                rolling_ctx = list(set(rolling_ctx + result[1]))
+                rolling_ctx |= result[1]
 
                 continue
 
@@ -10,7 +10,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import copy
 import logging
 import re
 import six
@@ -290,18 +289,20 @@ class TaskMappingSpec(mistral_spec_base.MappingSpec):
     def inspect_context(self, parent=None):
         ctxs = {}
         errors = []
+        traversed = set()
         parent_ctx = parent.get('ctx', []) if parent else []
-        rolling_ctx = list(set(parent_ctx))
+        rolling_ctx = set(parent_ctx)
         q = queue.Queue()
 
         for task in self.get_start_tasks():
-            q.put((task[0], copy.deepcopy(rolling_ctx)))
+            q.put((task[0], set(rolling_ctx)))
 
         while not q.empty():
             task_name, task_ctx = q.get()
+            traversed.add(task_name)
 
             if not task_ctx:
-                task_ctx = ctxs.get(task_name, [])
+                task_ctx = ctxs.get(task_name, set())
 
             task_spec = self.get_task(task_name)
 
@@ -318,16 +319,20 @@ class TaskMappingSpec(mistral_spec_base.MappingSpec):
 
             result = task_spec.inspect_context(parent=task_parent)
             errors.extend(result[0])
-            task_ctx = list(set(task_ctx + result[1]))
-            rolling_ctx = list(set(rolling_ctx + task_ctx))
+            task_ctx = task_ctx | result[1]
+            rolling_ctx |= task_ctx
 
             for task in self.get_next_tasks(task_name):
+                # Skip tasks that have already been traversed to avoid looping in cycles.
+                if task[0] in traversed:
+                    continue
+
                 next_task_spec = self.get_task(task[0])
 
                 if not next_task_spec.has_join():
                     q.put((task[0], task_ctx))
                 else:
-                    ctxs[task[0]] = list(set(ctxs.get(task[0], []) + task_ctx))
+                    ctxs[task[0]] = ctxs.get(task[0], set()) | task_ctx
                     q.put((task[0], None))
 
         return (errors, rolling_ctx)
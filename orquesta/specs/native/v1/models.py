@@ -10,11 +10,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import copy
 import logging
 import six
 from six.moves import queue
-import yaml
 
 from orquesta import events
 from orquesta import exceptions as exc
@@ -24,6 +24,7 @@ from orquesta.specs import types as spec_types
 from orquesta.utils import context as ctx_util
 from orquesta.utils import dictionary as dict_util
 from orquesta.utils import parameters as args_util
+from orquesta.utils import specs as spec_util
 
 
 LOG = logging.getLogger(__name__)
@@ -123,6 +124,7 @@ class TaskSpec(native_v1_specs.Spec):
         'type': 'object',
         'properties': {
             'delay': spec_types.STRING_OR_POSITIVE_INTEGER,
+            'priority': spec_types.STRING_OR_INTEGER,
             'join': {
                 'oneOf': [
                     {'enum': ['all']},
@@ -144,6 +146,7 @@ class TaskSpec(native_v1_specs.Spec):
 
     _context_evaluation_sequence = [
         'delay',
+        'priority',
         'with',
         'action',
         'input',
@@ -216,7 +219,7 @@ class TaskSpec(native_v1_specs.Spec):
         return self, action_specs
 
     def finalize_context(self, next_task_name, task_transition_meta, in_ctx):
-        rolling_ctx = copy.deepcopy(in_ctx)
+        rolling_ctx = ctx_util.copy_context(in_ctx)
         new_ctx = {}
         errors = []
 
@@ -236,7 +239,10 @@ class TaskSpec(native_v1_specs.Spec):
                 except exc.ExpressionEvaluationException as e:
                     errors.append(e)
 
-        out_ctx = dict_util.merge_dicts(in_ctx, new_ctx, overwrite=True)
+        # Leave out the internal keys before merging so the workflow state snapshot that
+        # is shared among the copies of the context is not merged into.
+        out_ctx = {k: v for k, v in six.iteritems(in_ctx) if not k.startswith('__')}
+        out_ctx = dict_util.merge_dicts(out_ctx, new_ctx, overwrite=True)
 
         for key in list(out_ctx.keys()):
             if key.startswith('__'):
@@ -254,19 +260,28 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
         }
     }
 
-    def has_task(self, task_name):
-        if task_name in RESERVED_TASK_NAMES:
-            return True
+    def __init__(self, *args, **kwargs):
+        super(TaskMappingSpec, self).__init__(*args, **kwargs)
 
-        return task_name in self
+        # The spec is immutable so the task transitions are identified once here
+        # instead of walking through all the task specs on every lookup.
+        self._next_tasks = {}
+        self._prev_tasks = {}
 
-    def get_task(self, task_name):
-        if task_name in RESERVED_TASK_NAMES:
-            return TaskSpec({'name': task_name})
+        for task_name in self.keys():
+            self._next_tasks[task_name] = self._identify_next_tasks(task_name)
 
-        return self[task_name]
+        for task_name in self.keys():
+            for next_task_name, condition, task_transition_item_idx in self._next_tasks[task_name]:
+                prev_task = (task_name, condition, task_transition_item_idx)
+                self._prev_tasks.setdefault(next_task_name, []).append(prev_task)
 
-    def get_next_tasks(self, task_name, *args, **kwargs):
+        for task_name, prev_tasks in six.iteritems(self._prev_tasks):
+            prev_tasks.sort(key=lambda x: x[0])
+
+        self._cyclic_tasks = self._identify_cyclic_tasks()
+
+    def _identify_next_tasks(self, task_name):
         task_spec = self.get_task(task_name)
 
         next_tasks = []
@@ -285,21 +300,100 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
 
         return sorted(next_tasks, key=lambda x: x[0])
 
-    def get_prev_tasks(self, task_name, *args, **kwargs):
-        prev_tasks = []
+    def _identify_cyclic_tasks(self):
+        # Identify the strongly connected tasks using an iterative version of the
+        # Tarjan's algorithm. A task is in a cycle if it is strongly connected with
+        # other tasks or if the task transitions back to itself.
+        cyclic_tasks = set()
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+
+        for root_task_name in sorted(self._next_tasks.keys()):
+            if root_task_name in index:
+                continue
+
+            work = [(root_task_name, 0)]
+
+            while work:
+                task_name, i = work.pop()
 
-        for name, task_spec in six.iteritems(self):
-            for next_task in self.get_next_tasks(name):
-                if task_name == next_task[0]:
-                    prev_tasks.append((name, next_task[1], next_task[2]))
+                if i == 0:
+                    index[task_name] = lowlink[task_name] = len(index)
+                    stack.append(task_name)
+                    on_stack.add(task_name)
 
-        return sorted(prev_tasks, key=lambda x: x[0])
+                next_task_names = [t[0] for t in self._next_tasks.get(task_name, [])]
+                recurse = False
+
+                for j in range(i, len(next_task_names)):
+                    next_task_name = next_task_names[j]
+
+                    if next_task_name == task_name:
+                        cyclic_tasks.add(task_name)
+
+                    if next_task_name not in index:
+                        work.append((task_name, j + 1))
+                        work.append((next_task_name, 0))
+                        recurse = True
+                        break
+
+                    if next_task_name in on_stack:
+                        lowlink[task_name] = min(lowlink[task_name], index[next_task_name])
+
+                if recurse:
+                    continue
+
+                if lowlink[task_name] == index[task_name]:
+                    component = []
+
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+
+                        if member == task_name:
+                            break
+
+                    if len(component) > 1:
+                        cyclic_tasks.update(component)
+
+                if work:
+                    parent_task_name = work[-1][0]
+                    lowlink[parent_task_name] = min(lowlink[parent_task_name], lowlink[task_name])
+
+        return cyclic_tasks
+
+    def has_task(self, task_name):
+        if task_name in RESERVED_TASK_NAMES:
+            return True
+
+        return task_name in self
+
+    def get_task(self, task_name):
+        if task_name in RESERVED_TASK_NAMES:
+            return TaskSpec({'name': task_name})
+
+        return self[task_name]
+
+    def get_next_tasks(self, task_name, *args, **kwargs):
+        if task_name in RESERVED_TASK_NAMES:
+            return []
+
+        if task_name not in self._next_tasks:
+            raise KeyError(task_name)
+
+        return list(self._next_tasks[task_name])
+
+    def get_prev_tasks(self, task_name, *args, **kwargs):
+        return list(self._prev_tasks.get(task_name, []))
 
     def get_start_tasks(self):
         start_tasks = [
             (task_name, None, None)
             for task_name in self.keys()
-            if not self.get_prev_tasks(task_name)
+            if task_name not in self._prev_tasks
         ]
 
         return sorted(start_tasks, key=lambda x: x[0])
@@ -312,42 +406,14 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
     def is_split_task(self, task_name):
         return (
             not self.is_join_task(task_name) and
-            len(self.get_prev_tasks(task_name)) > 1
+            len(self._prev_tasks.get(task_name, [])) > 1
         )
 
     def in_cycle(self, task_name):
-        traversed = []
-        q = queue.Queue()
-
-        for task in self.get_next_tasks(task_name):
-            q.put(task[0])
-
-        while not q.empty():
-            next_task_name = q.get()
-
-            # If the next task matches the original task, then it's in a loop.
-            if next_task_name == task_name:
-                return True
-
-            # If the next task has already been traversed but didn't match the
-            # original task, then there's a loop but the original task is not
-            # in the loop.
-            if next_task_name in traversed:
-                continue
-
-            for task in self.get_next_tasks(next_task_name):
-                q.put(task[0])
-
-            traversed.append(next_task_name)
-
-        return False
+        return task_name in self._cyclic_tasks
 
     def has_cycles(self):
-        for task_name, task_spec in six.iteritems(self):
-            if self.in_cycle(task_name):
-                return True
-
-        return False
+        return len(self._cyclic_tasks) > 0
 
     def detect_reserved_names(self, parent=None):
         result = []
@@ -366,15 +432,15 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
     def detect_undefined_tasks(self, parent=None):
         # Identify the undefined task in task transitions.
         result = []
-        traversed = []
+        queued = set()
         q = queue.Queue()
 
         for task in self.get_start_tasks():
+            queued.add(task[0])
             q.put(task[0])
 
         while not q.empty():
             task_name = q.get()
-            traversed.append(task_name)
 
             # Identify the next set of tasks and related transition specs.
             # The get_next_tasks function is not used here because it doesn't
@@ -392,12 +458,13 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
                     next_task_names = [x.strip() for x in next_task_names.split(',')]
 
                 for next_task_name in next_task_names:
-                    # If the next task has already been traversed, then skip.
-                    if next_task_name in traversed:
+                    # If the next task has already been queued, then skip.
+                    if next_task_name in queued:
                         continue
 
                     if self.has_task(next_task_name):
-                        if next_task_name not in RESERVED_TASK_NAMES + traversed:
+                        if next_task_name not in RESERVED_TASK_NAMES:
+                            queued.add(next_task_name)
                             q.put(next_task_name)
                     else:
                         entry = {
@@ -414,44 +481,62 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
         # Identify tasks that are not reachable.
         result = []
         staging = {}
+        traversed = set()
+        queued = set()
         q = queue.Queue()
 
-        # Traverse the tasks spec and prep data for evaluation.
-        for task_name, condition, task_transition_item_idict_util in self.get_start_tasks():
-            q.put((None, task_name, []))
-
-        while not q.empty():
-            prev_task_name, task_name, splits = q.get()
-
-            # If the task is undefined, then move on.
-            if task_name not in self:
-                continue
-
-            # Determine if the task is a split task and if it is in a cycle. If the task is a
-            # split task, keep track of where the split(s) occurs.
-            if self.is_split_task(task_name) and not self.in_cycle(task_name):
-                splits.append(task_name)
-
+        def stage(task_name):
             if task_name not in staging:
                 staging[task_name] = {
                     'spec_path': parent.get('spec_path') + '.' + task_name,
                     'schema_path': parent.get('schema_path') + '.patternProperties.^\\w+$',
                     'join': self.is_join_task(task_name),
-                    'splits': [],
-                    'prev': []
+                    'splits': set(),
+                    'prev': set()
                 }
 
-            staging[task_name]['splits'] = list(set(staging[task_name]['splits']) | set(splits))
+            return staging[task_name]
 
-            if prev_task_name:
-                inbounds = list(set(staging[task_name]['prev']) | set([prev_task_name]))
-                staging[task_name]['prev'] = inbounds
+        # Traverse the tasks spec and prep data for evaluation. A task is queued again
+        # only if there are new splits leading to the task so each task is processed
+        # once for graphs that fan out and join.
+        for task_name, condition, task_transition_item_idict_util in self.get_start_tasks():
+            stage(task_name)
+            queued.add(task_name)
+            q.put(task_name)
+
+        while not q.empty():
+            task_name = q.get()
+            queued.discard(task_name)
+            traversed.add(task_name)
+            meta = staging[task_name]
+
+            # Determine if the task is a split task and if it is in a cycle. If the task is a
+            # split task, keep track of where the split(s) occurs.
+            if self.is_split_task(task_name) and not self.in_cycle(task_name):
+                meta['splits'].add(task_name)
 
             next_tasks = self.get_next_tasks(task_name)
 
             for next_task_name, condition, task_transition_item_idict_util in next_tasks:
-                if next_task_name not in staging or not self.in_cycle(next_task_name):
-                    q.put((task_name, next_task_name, list(splits)))
+                # If the task is undefined, then move on.
+                if next_task_name not in self:
+                    continue
+
+                if next_task_name in traversed and self.in_cycle(next_task_name):
+                    continue
+
+                next_meta = stage(next_task_name)
+                next_meta['prev'].add(task_name)
+
+                if next_task_name in traversed and meta['splits'] <= next_meta['splits']:
+                    continue
+
+                next_meta['splits'] |= meta['splits']
+
+                if next_task_name not in queued:
+                    queued.add(next_task_name)
+                    q.put(next_task_name)
 
         # Use the prepped data to identify tasks that are not reachable.
         for task_name, meta in six.iteritems(staging):
@@ -459,7 +544,7 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
                 meta['reachable'] = True
                 continue
 
-            for prev_task_name in meta['prev']:
+            for prev_task_name in sorted(meta['prev']):
                 meta['reachable'] = (meta['splits'] == staging[prev_task_name]['splits'])
 
                 if not meta['reachable']:
@@ -482,87 +567,114 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
 
         return result
 
-    def inspect_context(self, parent=None):
-        ctxs = {}
+    def _inspect_task_context(self, task_name, task_ctx, parent):
         errors = []
-        traversed = []
-        parent_ctx = parent.get('ctx', []) if parent else []
-        rolling_ctx = list(set(parent_ctx))
-        q = queue.Queue()
+        branches = []
+        task_spec = self.get_task(task_name)
 
-        for task in self.get_start_tasks():
-            q.put((task[0], copy.deepcopy(rolling_ctx)))
+        spec_path = parent.get('spec_path') + '.' + task_name
+        schema_path = parent.get('schema_path') + '.patternProperties.^\\w+$'
 
-        while not q.empty():
-            task_name, task_ctx = q.get()
-            traversed.append(task_name)
+        task_parent = {
+            'ctx': task_ctx,
+            'spec_path': spec_path,
+            'schema_path': schema_path
+        }
 
-            if not task_ctx:
-                task_ctx = ctxs.get(task_name, [])
+        result = task_spec.inspect_context(parent=task_parent)
+        errors.extend(result[0])
+        task_ctx = frozenset(task_ctx | result[1])
 
-            task_spec = self.get_task(task_name)
+        # Identify the next set of tasks and related transition specs.
+        transitions = []
+        task_transition_specs = getattr(task_spec, 'next') or []
 
-            spec_path = parent.get('spec_path') + '.' + task_name
-            schema_path = parent.get('schema_path') + '.patternProperties.^\\w+$'
+        for i in range(0, len(task_transition_specs)):
+            task_transition_spec = task_transition_specs[i]
+            next_task_names = getattr(task_transition_spec, 'do') or []
+
+            if not next_task_names:
+                transitions.append((None, task_transition_spec, str(i)))
+                continue
 
-            task_parent = {
+            if isinstance(next_task_names, six.string_types):
+                next_task_names = [x.strip() for x in next_task_names.split(',')]
+
+            for next_task_name in next_task_names:
+                entry = (next_task_name, task_transition_spec, str(i))
+                transitions.append(entry)
+
+        # A task transition with more than one next task is only inspected once.
+        transition_ctxs = {}
+
+        for entry in transitions:
+            next_task_name = entry[0]
+            task_transition_spec = entry[1]
+            seq_num = entry[2]
+
+            parent_ctx = {
                 'ctx': task_ctx,
-                'spec_path': spec_path,
-                'schema_path': schema_path
+                'spec_path': spec_path + '.next[' + seq_num + ']',
+                'schema_path': schema_path + '.properties.next.items'
             }
 
-            result = task_spec.inspect_context(parent=task_parent)
-            errors.extend(result[0])
-            task_ctx = list(set(task_ctx + result[1]))
-            rolling_ctx = list(set(rolling_ctx + task_ctx))
+            if seq_num not in transition_ctxs:
+                result = task_transition_spec.inspect_context(parent_ctx)
+                transition_ctxs[seq_num] = (result[0], frozenset(task_ctx | result[1]))
 
-            # Identify the next set of tasks and related transition specs.
-            transitions = []
-            task_transition_specs = getattr(task_spec, 'next') or []
+            # The errors are reported once for each next task of the task transition.
+            errors.extend(copy.deepcopy(transition_ctxs[seq_num][0]))
 
-            for i in range(0, len(task_transition_specs)):
-                task_transition_spec = task_transition_specs[i]
-                next_task_names = getattr(task_transition_spec, 'do') or []
+            if next_task_name and self.has_task(next_task_name):
+                branch_ctx = transition_ctxs[seq_num][1]
+                has_join = self.get_task(next_task_name).has_join()
+                branches.append((next_task_name, branch_ctx, has_join))
 
-                if not next_task_names:
-                    transitions.append((None, task_transition_spec, str(i)))
-                    continue
+        return errors, task_ctx, branches
 
-                if isinstance(next_task_names, six.string_types):
-                    next_task_names = [x.strip() for x in next_task_names.split(',')]
+    def inspect_context(self, parent=None):
+        ctxs = {}
+        errors = []
+        traversed = set()
+        parent_ctx = parent.get('ctx', []) if parent else []
+        rolling_ctx = set(parent_ctx)
+        q = collections.deque()
 
-                for next_task_name in next_task_names:
-                    entry = (next_task_name, task_transition_spec, str(i))
-                    transitions.append(entry)
-
-            for entry in transitions:
-                next_task_name = entry[0]
-                task_transition_spec = entry[1]
-                seq_num = entry[2]
-
-                parent_ctx = {
-                    'ctx': task_ctx,
-                    'spec_path': spec_path + '.next[' + seq_num + ']',
-                    'schema_path': schema_path + '.properties.next.items'
-                }
+        # A task is queued once for each inbound branch that reaches it before it is traversed.
+        # The task and its transitions are only inspected once for each distinct context since
+        # inspecting them again with the same context returns the same result.
+        inspected = {}
 
-                result = task_transition_spec.inspect_context(parent_ctx)
-                errors.extend(result[0])
-                branch_ctx = list(set(task_ctx + result[1]))
+        for task in self.get_start_tasks():
+            q.append((task[0], frozenset(rolling_ctx)))
 
-                if (not next_task_name or
-                        next_task_name in traversed or
-                        not self.has_task(next_task_name)):
-                    continue
+        while q:
+            task_name, task_ctx = q.popleft()
+            traversed.add(task_name)
+
+            if not task_ctx:
+                task_ctx = ctxs.get(task_name, frozenset())
+
+            inspected_key = (task_name, task_ctx)
 
-                next_task_spec = self.get_task(next_task_name)
+            if inspected_key not in inspected:
+                inspected[inspected_key] = self._inspect_task_context(task_name, task_ctx, parent)
+                rolling_ctx |= inspected[inspected_key][1]
+
+            task_errors, task_ctx, branches = inspected[inspected_key]
+
+            if task_errors:
+                errors.extend(copy.deepcopy(task_errors))
+
+            for next_task_name, branch_ctx, has_join in branches:
+                if next_task_name in traversed:
+                    continue
 
-                if not next_task_spec.has_join():
-                    q.put((next_task_name, branch_ctx))
+                if not has_join:
+                    q.append((next_task_name, branch_ctx))
                 else:
-                    next_task_ctx = ctxs.get(next_task_name, [])
-                    ctxs[next_task_name] = list(set(next_task_ctx + branch_ctx))
-                    q.put((next_task_name, None))
+                    ctxs[next_task_name] = ctxs.get(next_task_name, frozenset()) | branch_ctx
+                    q.append((next_task_name, None))
 
         return (errors, rolling_ctx)
 
@@ -574,6 +686,7 @@ class WorkflowSpec(native_v1_specs.Spec):
             'vars': spec_types.UNIQUE_ONE_KEY_DICT_LIST,
             'input': spec_types.UNIQUE_STRING_OR_ONE_KEY_DICT_LIST,
             'output': spec_types.UNIQUE_ONE_KEY_DICT_LIST,
+            'concurrency': spec_types.STRING_OR_NONZERO_POSITIVE_INTEGER,
             'tasks': TaskMappingSpec
         },
         'required': ['tasks'],
@@ -583,6 +696,7 @@ class WorkflowSpec(native_v1_specs.Spec):
     _context_evaluation_sequence = [
         'input',
         'vars',
+        'concurrency',
         'tasks',
         'output'
     ]
@@ -598,7 +712,7 @@ class WorkflowSpec(native_v1_specs.Spec):
             raise ValueError('The spec cannot be type of None.')
 
         spec = (
-            yaml.safe_load(spec)
+            spec_util.load_definition(spec)
             if not isinstance(spec, dict) and not isinstance(spec, list)
             else spec
         )
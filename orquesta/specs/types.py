@@ -22,11 +22,20 @@ UNIQUE_STRING_LIST = {
     "minItems": 1
 }
 
+INTEGER = {
+    "type": "integer"
+}
+
 POSITIVE_INTEGER = {
     "type": "integer",
     "minimum": 0
 }
 
+NONZERO_POSITIVE_INTEGER = {
+    "type": "integer",
+    "minimum": 1
+}
+
 POSITIVE_NUMBER = {
     "type": "number",
     "minimum": 0.0
@@ -87,6 +96,20 @@ STRING_OR_POSITIVE_INTEGER = {
     ]
 }
 
+STRING_OR_NONZERO_POSITIVE_INTEGER = {
+    "oneOf": [
+        NONEMPTY_STRING,
+        NONZERO_POSITIVE_INTEGER
+    ]
+}
+
+STRING_OR_INTEGER = {
+    "oneOf": [
+        NONEMPTY_STRING,
+        INTEGER
+    ]
+}
+
 STRING_OR_BOOLEAN = {
     "oneOf": [
         NONEMPTY_STRING,
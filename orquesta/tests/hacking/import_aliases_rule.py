@@ -16,17 +16,25 @@ from hacking import core
 CODE = 'O102'
 
 REQS = {
+    'orquesta.artifacts': None,
+    'orquesta.bootstrap': None,
     'orquesta.composers.base': 'comp_base',
     'orquesta.conducting': None,
     'orquesta.constants': None,
     'orquesta.events': None,
     'orquesta.graphing': None,
+    'orquesta.hosting': None,
     'orquesta.exceptions': 'exc',
     'orquesta.expressions.base': 'expr_base',
     'orquesta.expressions.functions.base': 'func_base',
     'orquesta.expressions.jinja': 'jinja_expr',
     'orquesta.expressions.yql': 'yaql_expr',
     'orquesta.machines': None,
+    'orquesta.runners.asyncio': 'asyncio_runner',
+    'orquesta.runners.base': 'runner_base',
+    'orquesta.runners.pool': 'pool_runner',
+    'orquesta.runners.simulation': 'sim_runner',
+    'orquesta.scheduling': None,
     'orquesta.specs.base': 'spec_base',
     'orquesta.specs.loader': 'spec_loader',
     'orquesta.specs.mistral': 'mistral_specs',
@@ -41,10 +49,12 @@ REQS = {
     'orquesta.tests.fixtures.loader': 'fixture_loader',
     'orquesta.tests.unit.base': 'test_base',
     'orquesta.tests.unit.specs.base': 'test_specs',
+    'orquesta.utils.cache': 'cache_util',
     'orquesta.utils.context': 'ctx_util',
     'orquesta.utils.date': 'date_util',
     'orquesta.utils.dictionary': 'dict_util',
     'orquesta.utils.expression': 'expr_util',
+    'orquesta.utils.imports': 'import_util',
     'orquesta.utils.jsonify': 'json_util',
     'orquesta.utils.parameters': 'args_util',
     'orquesta.utils.plugin': 'plugin_util',
@@ -143,7 +143,7 @@ class WorkflowComposerTest(WorkflowGraphTest, WorkflowSpecTest):
 class WorkflowConductorTest(WorkflowComposerTest):
 
     def format_task_item(self, task_id, route, ctx, spec, actions=None, delay=None,
-                         items_count=None, items_concurrency=None):
+                         items_count=None, items_concurrency=None, priority=None):
 
         if not actions and items_count is None:
             actions = [{'action': spec.action, 'input': spec.input}]
@@ -159,6 +159,9 @@ class WorkflowConductorTest(WorkflowComposerTest):
         if delay:
             task['delay'] = delay
 
+        if priority is not None:
+            task['priority'] = priority
+
         if items_count is not None:
             task['items_count'] = items_count
             task['concurrency'] = items_concurrency
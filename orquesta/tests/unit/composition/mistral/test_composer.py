@@ -11,6 +11,7 @@
 # limitations under the License.
 
 from orquesta.composers import mistral as mistral_comp
+from orquesta import statuses
 from orquesta.tests.unit.composition.mistral import base as mistral_comp_test_base
 from orquesta.utils import plugin as plugin_util
 
@@ -22,3 +23,23 @@ class WorkflowComposerTest(mistral_comp_test_base.MistralWorkflowComposerTest):
             plugin_util.get_module('orquesta.composers', self.spec_module_name),
             mistral_comp.WorkflowComposer
         )
+
+    def test_get_status_criteria(self):
+        composer = mistral_comp.WorkflowComposer
+
+        for condition, expected in mistral_comp.TASK_TRANSITION_MAP.items():
+            criteria = composer._compose_transition_criteria('task1', condition=condition)
+            self.assertListEqual(composer.get_status_criteria('task1', criteria[0]), expected)
+            self.assertIsNone(composer.get_status_criteria('task2', criteria[0]))
+
+        criterion = '<% task_status(task1) in ' + str([statuses.RUNNING]) + ' %>'
+        self.assertIsNone(composer.get_status_criteria('task1', criterion))
+        self.assertIsNone(composer.get_status_criteria('task1', '<% $.foobar %>'))
+
+    def test_compose_status_criteria(self):
+        wf_graph = self.compose_wf_ex_graph('sequential')
+
+        self.assertTrue(wf_graph.has_status_criteria())
+        expected = [[statuses.SUCCEEDED]]
+        self.assertListEqual(wf_graph.get_status_criteria('task1', 'task2', 0), expected)
+        self.assertListEqual(wf_graph.get_status_criteria('task2', 'task3', 0), expected)
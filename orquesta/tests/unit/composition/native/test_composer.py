@@ -11,6 +11,8 @@
 # limitations under the License.
 
 from orquesta.composers import native as native_comp
+from orquesta import graphing
+from orquesta import statuses
 from orquesta.tests.unit.composition.native import base as native_comp_test_base
 from orquesta.utils import plugin as plugin_util
 
@@ -22,3 +24,38 @@ class WorkflowComposerTest(native_comp_test_base.OrchestraWorkflowComposerTest):
             plugin_util.get_module('orquesta.composers', self.spec_module_name),
             native_comp.WorkflowComposer
         )
+
+    def test_get_status_criteria(self):
+        composer = native_comp.WorkflowComposer
+
+        self.assertListEqual(
+            composer.get_status_criteria('task1', '<% succeeded() %>'),
+            [statuses.SUCCEEDED]
+        )
+
+        self.assertListEqual(
+            composer.get_status_criteria('task1', '{{ failed() }}'),
+            [statuses.FAILED]
+        )
+
+        self.assertListEqual(
+            composer.get_status_criteria('task1', '<%completed()  %>'),
+            statuses.COMPLETED_STATUSES
+        )
+
+        self.assertIsNone(composer.get_status_criteria('task1', '<% succeeded() }}'))
+        self.assertIsNone(composer.get_status_criteria('task1', '<% succeeded() and true %>'))
+        self.assertIsNone(composer.get_status_criteria('task1', '<% result() %>'))
+
+    def test_compose_status_criteria(self):
+        wf_graph = self.compose_wf_ex_graph('sequential')
+
+        self.assertTrue(wf_graph.has_status_criteria())
+        expected = [[statuses.SUCCEEDED]]
+        self.assertListEqual(wf_graph.get_status_criteria('task1', 'task2', 0), expected)
+        self.assertListEqual(wf_graph.get_status_criteria('task2', 'task3', 0), expected)
+
+        # The status predicates are not serialized with the graph.
+        wf_graph = graphing.WorkflowGraph.deserialize(wf_graph.serialize())
+        self.assertFalse(wf_graph.has_status_criteria())
+        self.assertIsNone(wf_graph.get_status_criteria('task1', 'task2', 0))
@@ -276,3 +276,207 @@ class WorkflowConductorTaskRenderingTest(test_base.WorkflowConductorTest):
         self.assert_next_task(conductor, has_next_task=False)
         self.assertEqual(conductor.get_workflow_status(), statuses.FAILED)
         self.assertListEqual(conductor.errors, expected_errors)
+
+    def test_task_priority_rendering(self):
+        wf_def = """
+        version: 1.0
+
+        description: A basic workflow with task priorities.
+
+        vars:
+          - priority: 10
+
+        tasks:
+          init:
+            action: core.noop
+            next:
+              - do: task1, task2, task3
+          task1:
+            action: core.noop
+          task2:
+            priority: <% ctx().priority %>
+            action: core.noop
+          task3:
+            priority: -1
+            action: core.noop
+        """
+
+        # Instantiate workflow spec.
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        # Instantiate conductor
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+        self.forward_task_statuses(conductor, 'init', [statuses.RUNNING, statuses.SUCCEEDED])
+
+        # Ensure the tasks are ordered by priority and the priority is rendered correctly.
+        next_tasks = conductor.get_next_tasks()
+
+        self.assertListEqual([t['id'] for t in next_tasks], ['task2', 'task1', 'task3'])
+        self.assertNotIn('priority', next_tasks[1])
+        self.assertEqual(next_tasks[0]['priority'], 10)
+        self.assertEqual(next_tasks[2]['priority'], -1)
+
+    def test_task_priority_rendering_bad_type(self):
+        wf_def = """
+        version: 1.0
+
+        description: A basic sequential workflow.
+
+        vars:
+          - priority: foobar
+
+        tasks:
+          task1:
+            priority: <% ctx().priority %>
+            action: core.noop
+        """
+
+        expected_errors = [
+            {
+                'type': 'error',
+                'message': 'TypeError: The value of task priority is not type of integer.',
+                'task_id': 'task1',
+                'route': 0
+            }
+        ]
+
+        # Instantiate workflow spec.
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        # Instantiate conductor
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        # Assert failed status and errors.
+        self.assert_next_task(conductor, has_next_task=False)
+        self.assertEqual(conductor.get_workflow_status(), statuses.FAILED)
+        self.assertListEqual(conductor.errors, expected_errors)
+
+    def test_task_ordering_by_critical_path(self):
+        wf_def = """
+        version: 1.0
+
+        description: A workflow with a long and a short branch.
+
+        tasks:
+          init:
+            action: core.noop
+            next:
+              - do: task1, task2, task3
+          task1:
+            action: core.noop
+          task2:
+            action: core.long
+            next:
+              - do: task4
+          task3:
+            priority: 1
+            action: core.noop
+          task4:
+            action: core.noop
+        """
+
+        # Instantiate workflow spec.
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        # Instantiate conductor
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+        self.forward_task_statuses(conductor, 'init', [statuses.RUNNING, statuses.SUCCEEDED])
+
+        critical_path = conductor.get_critical_path(
+            durations={'core.long': 10.0},
+            default_duration=1.0
+        )
+
+        # The tasks with the same priority are ordered by the length of the remaining path.
+        next_tasks = conductor.get_next_tasks(critical_path=critical_path)
+        self.assertListEqual([t['id'] for t in next_tasks], ['task3', 'task2', 'task1'])
+
+        # The tasks are ordered by priority then task ID if critical path is not given.
+        next_tasks = conductor.get_next_tasks()
+        self.assertListEqual([t['id'] for t in next_tasks], ['task3', 'task1', 'task2'])
+
+    def test_get_next_tasks_with_limit(self):
+        wf_def = """
+        version: 1.0
+
+        description: A workflow with a wide split.
+
+        vars:
+          - xs:
+              - fee
+              - fi
+              - fo
+
+        tasks:
+          init:
+            action: core.noop
+            next:
+              - do: task1, task2, task3, task4, task5
+          task1:
+            action: core.noop
+          task2:
+            priority: <% len(ctx().xs) %>
+            action: core.noop
+          task3:
+            with:
+              items: <% ctx().xs %>
+              concurrency: 1
+            action: core.echo message=<% item() %>
+          task4:
+            priority: -1
+            action: core.noop
+          task5:
+            action: core.noop
+        """
+
+        # Instantiate workflow spec.
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        # Instantiate conductor
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+        self.forward_task_statuses(conductor, 'init', [statuses.RUNNING, statuses.SUCCEEDED])
+
+        expected_tasks = conductor.get_next_tasks()
+        expected_task_ids = ['task2', 'task1', 'task3', 'task5', 'task4']
+        self.assertListEqual([t['id'] for t in expected_tasks], expected_task_ids)
+
+        # Keep track of the tasks that are rendered.
+        rendered = []
+        get_task = conductor.get_task
+
+        def spy(task_id, route):
+            rendered.append(task_id)
+            return get_task(task_id, route)
+
+        conductor.get_task = spy
+
+        # Page thru the tasks with the last task in the page as the cursor.
+        pages = [conductor.get_next_tasks(limit=2)]
+        self.assertListEqual(rendered, ['task2', 'task1'])
+
+        while pages[-1]:
+            pages.append(conductor.get_next_tasks(limit=2, cursor=pages[-1][-1]))
+
+        self.assertListEqual([len(page) for page in pages], [2, 2, 1, 0])
+        self.assertListEqual(rendered, expected_task_ids)
+        self.assert_task_list(conductor, sum(pages, []), expected_tasks)
+
+        # Without cursor, the tasks dispatched are no longer returned.
+        self.forward_task_statuses(conductor, 'task2', [statuses.RUNNING])
+        item_ctx = {'item_id': 0}
+        self.forward_task_statuses(conductor, 'task3', [statuses.RUNNING], ctxs=[item_ctx])
+
+        # The task with items is skipped since there is no item left to run per concurrency.
+        next_tasks = conductor.get_next_tasks(limit=2)
+        self.assertListEqual([t['id'] for t in next_tasks], ['task1', 'task5'])
+
+        next_tasks = conductor.get_next_tasks(limit=0)
+        self.assertListEqual(next_tasks, [])
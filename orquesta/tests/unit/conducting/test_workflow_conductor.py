@@ -379,6 +379,9 @@ class WorkflowConductorTest(test_base.WorkflowConductorTest):
         self.assertEqual(task['route'], task_route)
         self.assertDictEqual(task['ctx'], expected_ctx)
 
+        # The task spec is immutable and is not copied on render.
+        self.assertIs(task['spec'], conductor.spec.tasks.get_task(task_name))
+
     def test_get_next_tasks(self):
         inputs = {'a': 123}
         conductor = self._prep_conductor(inputs=inputs, status=statuses.RUNNING)
@@ -0,0 +1,228 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from orquesta import conducting
+from orquesta.runners import simulation as sim_runner
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.unit import base as test_base
+
+
+class WorkflowConductorConcurrencyTest(test_base.WorkflowConductorTest):
+
+    def _prep_conductor(self, wf_def, inputs=None):
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        conductor = conducting.WorkflowConductor(spec, inputs=inputs)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        return conductor
+
+    def test_concurrency(self):
+        wf_def = """
+        version: 1.0
+
+        concurrency: 2
+
+        tasks:
+          init:
+            action: core.noop
+            next:
+              - do: task1, task2, task3, task4
+          task1:
+            action: core.noop
+          task2:
+            action: core.noop
+          task3:
+            priority: 1
+            action: core.noop
+          task4:
+            action: core.noop
+        """
+
+        conductor = self._prep_conductor(wf_def)
+        self.assertEqual(conductor.get_workflow_concurrency(), 2)
+
+        self.forward_task_statuses(conductor, 'init', [statuses.RUNNING, statuses.SUCCEEDED])
+
+        # The tasks with higher priority get the slots first.
+        next_tasks = conductor.get_next_tasks()
+        self.assertListEqual([t['id'] for t in next_tasks], ['task3', 'task1'])
+
+        # The staged tasks are held back while the active tasks are at the limit.
+        self.forward_task_statuses(conductor, 'task3', [statuses.RUNNING])
+        self.forward_task_statuses(conductor, 'task1', [statuses.RUNNING])
+        self.assertEqual(conductor.workflow_state.get_active_tasks_count(), 2)
+        self.assert_next_task(conductor, has_next_task=False)
+
+        # A slot is released when an active task completes.
+        self.forward_task_statuses(conductor, 'task3', [statuses.SUCCEEDED])
+        next_tasks = conductor.get_next_tasks()
+        self.assertListEqual([t['id'] for t in next_tasks], ['task2'])
+
+        self.forward_task_statuses(conductor, 'task2', [statuses.RUNNING, statuses.SUCCEEDED])
+        self.forward_task_statuses(conductor, 'task1', [statuses.SUCCEEDED])
+        next_tasks = conductor.get_next_tasks()
+        self.assertListEqual([t['id'] for t in next_tasks], ['task4'])
+
+        self.forward_task_statuses(conductor, 'task4', [statuses.RUNNING, statuses.SUCCEEDED])
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+    def test_concurrency_with_items(self):
+        wf_def = """
+        version: 1.0
+
+        input:
+          - xs
+          - concurrency: 3
+
+        concurrency: <% ctx().concurrency %>
+
+        tasks:
+          init:
+            action: core.noop
+            next:
+              - do: task1, task2, task3
+          task1:
+            with:
+              items: <% ctx().xs %>
+              concurrency: 2
+            action: core.echo message=<% item() %>
+          task2:
+            action: core.noop
+          task3:
+            action: core.noop
+        """
+
+        conductor = self._prep_conductor(wf_def, inputs={'xs': ['fee', 'fi', 'fo', 'fum']})
+        self.forward_task_statuses(conductor, 'init', [statuses.RUNNING, statuses.SUCCEEDED])
+
+        # The items are limited by the task concurrency and task3 by the workflow concurrency.
+        next_tasks = conductor.get_next_tasks()
+        self.assertListEqual([t['id'] for t in next_tasks], ['task1', 'task2'])
+        self.assertListEqual([a['item_id'] for a in next_tasks[0]['actions']], [0, 1])
+
+        self.forward_task_statuses(conductor, 'task2', [statuses.RUNNING])
+
+        for i in range(0, 2):
+            ctx = {'item_id': i}
+            self.forward_task_statuses(conductor, 'task1', [statuses.RUNNING], ctxs=[ctx])
+
+        # The active items of a task count toward the workflow concurrency.
+        self.assertEqual(conductor.workflow_state.get_active_tasks_count(), 3)
+        self.assert_next_task(conductor, has_next_task=False)
+
+        # The slot released by the item goes to the next item and the other task is held back.
+        ctx, result = {'item_id': 0}, 'fee'
+        self.forward_task_statuses(conductor, 'task1', [statuses.SUCCEEDED], [ctx], [result])
+        self.assertEqual(conductor.workflow_state.get_active_tasks_count(), 2)
+        next_tasks = conductor.get_next_tasks()
+        self.assertListEqual([t['id'] for t in next_tasks], ['task1'])
+        self.assertListEqual([a['item_id'] for a in next_tasks[0]['actions']], [2])
+
+        # The task concurrency still applies when the workflow has slots to spare.
+        self.forward_task_statuses(conductor, 'task1', [statuses.RUNNING], ctxs=[{'item_id': 2}])
+        self.forward_task_statuses(conductor, 'task2', [statuses.SUCCEEDED])
+        next_tasks = conductor.get_next_tasks()
+        self.assertListEqual([t['id'] for t in next_tasks], ['task3'])
+
+    def test_concurrency_bad_type(self):
+        wf_def = """
+        version: 1.0
+
+        input:
+          - concurrency: foobar
+
+        concurrency: <% ctx().concurrency %>
+
+        tasks:
+          task1:
+            action: core.noop
+        """
+
+        expected_errors = [
+            {
+                'type': 'error',
+                'message': 'TypeError: The value of workflow concurrency is not type of integer.'
+            }
+        ]
+
+        conductor = self._prep_conductor(wf_def)
+
+        self.assert_next_task(conductor, has_next_task=False)
+        self.assertEqual(conductor.get_workflow_status(), statuses.FAILED)
+        self.assertListEqual(conductor.errors, expected_errors)
+
+    def test_concurrency_less_than_one(self):
+        wf_def = """
+        version: 1.0
+
+        input:
+          - concurrency: 0
+
+        concurrency: <% ctx().concurrency %>
+
+        tasks:
+          task1:
+            action: core.noop
+        """
+
+        expected_errors = [
+            {
+                'type': 'error',
+                'message': 'ValueError: The value of workflow concurrency is less than 1.'
+            }
+        ]
+
+        conductor = self._prep_conductor(wf_def)
+
+        self.assert_next_task(conductor, has_next_task=False)
+        self.assertEqual(conductor.get_workflow_status(), statuses.FAILED)
+        self.assertListEqual(conductor.errors, expected_errors)
+
+    def test_concurrency_with_runner(self):
+        wf_def = """
+        version: 1.0
+
+        input:
+          - xs
+
+        concurrency: 3
+
+        tasks:
+          init:
+            action: core.noop
+            next:
+              - do: task1, task2, task3
+          task1:
+            with:
+              items: <% ctx().xs %>
+              concurrency: 2
+            action: core.noop
+          task2:
+            with: <% ctx().xs %>
+            action: core.noop
+          task3:
+            action: core.noop
+        """
+
+        conductor = self._prep_conductor(wf_def, inputs={'xs': list(range(0, 10))})
+
+        runner = sim_runner.run(conductor, default_duration=1.0)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+        # The 21 actions after the init task run 3 at a time.
+        report = runner.get_report()
+        self.assertEqual(report['peak_parallelism'], 3)
+        self.assertEqual(report['makespan'], 8.0)
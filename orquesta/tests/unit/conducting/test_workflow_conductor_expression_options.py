@@ -0,0 +1,99 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from orquesta import conducting
+from orquesta.expressions import base as expr_base
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.unit import base as test_base
+
+
+class WorkflowConductorExpressionOptionsTest(test_base.WorkflowConductorTest):
+
+    wf_def = """
+    version: 1.0
+
+    vars:
+      - fee: fee-fi-fo-fum
+
+    output:
+      - fi: <% ctx().fi %>
+
+    tasks:
+      task1:
+        action: core.noop
+        next:
+          - publish: fi=<% result() %>
+    """
+
+    def _prep_conductor(self, expression_options=None):
+        spec = native_specs.WorkflowSpec(self.wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        conductor = conducting.WorkflowConductor(spec, expression_options=expression_options)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        return conductor
+
+    def test_expression_options_per_workflow(self):
+        conductor1 = self._prep_conductor()
+        conductor2 = self._prep_conductor(expression_options={'nested_expansion': False})
+
+        # Interleave the events of the two workflows in the same thread.
+        result = '<% ctx().fee %>'
+        self.forward_task_statuses(conductor1, 'task1', [statuses.RUNNING])
+        self.forward_task_statuses(conductor2, 'task1', [statuses.RUNNING])
+        self.forward_task_statuses(conductor1, 'task1', [statuses.SUCCEEDED], results=[result])
+        self.forward_task_statuses(conductor2, 'task1', [statuses.SUCCEEDED], results=[result])
+
+        self.assertEqual(conductor1.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertDictEqual(conductor1.get_workflow_output(), {'fi': 'fee-fi-fo-fum'})
+        self.assertEqual(conductor2.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertDictEqual(conductor2.get_workflow_output(), {'fi': '<% ctx().fee %>'})
+
+        # The options of the workflow do not leak into the global expression options.
+        self.assertTrue(expr_base.get_option('nested_expansion'))
+
+    def test_expression_options_serialization(self):
+        conductor = self._prep_conductor(expression_options={'nested_expansion': False})
+
+        data = conductor.serialize()
+        self.assertDictEqual(data['expression_options'], {'nested_expansion': False})
+
+        conductor = conducting.WorkflowConductor.deserialize(data)
+        self.assertDictEqual(conductor.expression_options, {'nested_expansion': False})
+
+        result = '<% ctx().fee %>'
+        status_changes = [statuses.RUNNING, statuses.SUCCEEDED]
+        self.forward_task_statuses(conductor, 'task1', status_changes, results=[None, result])
+        self.assertDictEqual(conductor.get_workflow_output(), {'fi': '<% ctx().fee %>'})
+
+    def test_expression_options_not_serialized_if_unset(self):
+        conductor = self._prep_conductor()
+        self.assertNotIn('expression_options', conductor.serialize())
+
+    def test_bad_expression_options(self):
+        spec = native_specs.WorkflowSpec(self.wf_def)
+
+        self.assertRaises(
+            ValueError,
+            conducting.WorkflowConductor,
+            spec,
+            expression_options=[('nested_expansion', False)]
+        )
+
+        self.assertRaises(
+            KeyError,
+            conducting.WorkflowConductor,
+            spec,
+            expression_options={'foobar': False}
+        )
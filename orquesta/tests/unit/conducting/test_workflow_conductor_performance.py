@@ -13,6 +13,8 @@
 import random
 import string
 
+import mock
+
 from orquesta import conducting
 from orquesta.specs import native as native_specs
 from orquesta import statuses
@@ -64,6 +66,50 @@ class WorkflowConductorStressTest(test_base.WorkflowConductorTest):
 
         self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
 
+    def test_state_copies_function_of_graph_size(self):
+        num_tasks = 50
+
+        wf_def = {
+            'tasks': {
+                'init': {
+                    'action': 'core.noop',
+                    'next': [{'do': ['t' + str(i) for i in range(1, num_tasks + 1)]}]
+                },
+                'join': {'join': 'all', 'action': 'core.noop'}
+            }
+        }
+
+        for i in range(1, num_tasks + 1):
+            wf_def['tasks']['t' + str(i)] = {
+                'action': 'core.noop',
+                'next': [{'when': '<% succeeded() %>', 'do': 'join'}]
+            }
+
+        conductor = conducting.WorkflowConductor(native_specs.WorkflowSpec(wf_def))
+        conductor.request_workflow_status(statuses.RUNNING)
+        serialize = conducting.WorkflowState.serialize
+
+        with mock.patch.object(conducting.WorkflowState, 'serialize', autospec=True) as mock_ser:
+            mock_ser.side_effect = serialize
+            next_tasks = conductor.get_next_tasks()
+
+            while next_tasks:
+                for task in next_tasks:
+                    self.forward_task_statuses(
+                        conductor,
+                        task['id'],
+                        [statuses.RUNNING, statuses.SUCCEEDED]
+                    )
+
+                next_tasks = conductor.get_next_tasks()
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+        # The state is copied once for the context of each task, once for the transitions
+        # of each task other than the join, and once to render the workflow output.
+        expected_count = (num_tasks + 2) + (num_tasks + 1) + 1
+        self.assertEqual(mock_ser.call_count, expected_count)
+
     def test_serialization_function_of_graph_size(self):
         num_tasks = 100
         conductor = self._prep_conductor(num_tasks, status=statuses.RUNNING)
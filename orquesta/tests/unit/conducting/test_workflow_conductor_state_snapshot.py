@@ -0,0 +1,132 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+
+import mock
+
+from orquesta import conducting
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.unit import base as test_base
+
+
+class WorkflowConductorStateSnapshotTest(test_base.WorkflowConductorTest):
+
+    wf_def = """
+    version: 1.0
+
+    input:
+      - xs
+
+    vars:
+      - data:
+          a:
+            b: 1
+
+    tasks:
+      task1:
+        with: <% ctx(xs) %>
+        action: core.echo message=<% item() %>
+        next:
+          - when: <% succeeded() and task_status(task1) = 'succeeded' %>
+            publish:
+              - data: <% dict(a => dict(c => 2)) %>
+              - items: <% result() %>
+              - status: '{{ task_status("task1") }}'
+            do: task2, task3
+          - when: <% failed() %>
+            do: task4
+      task2:
+        action: core.echo message=<% ctx(status) %>
+        next:
+          - when: '{{ succeeded() }}'
+            publish:
+              - __state: <% dict(foo => bar) %>
+            do: task5
+      task3:
+        action: core.noop
+        next:
+          - when: <% succeeded() %>
+            do: task5
+      task4:
+        action: core.noop
+      task5:
+        join: all
+        action: core.noop
+
+    output:
+      - data: <% ctx(data) %>
+      - items: <% ctx(items) %>
+      - status: <% ctx(status) %>
+    """
+
+    def assert_state_snapshots_not_mutated(self, thread_safe=False):
+        spec = native_specs.WorkflowSpec(self.wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        inputs = {'xs': ['fee', 'fi', 'fo']}
+        conductor = conducting.WorkflowConductor(spec, inputs=inputs, thread_safe=thread_safe)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        # Keep a copy of each snapshot of the workflow state as it is taken.
+        snapshots = []
+        serialize = conducting.WorkflowState.serialize
+
+        def record(workflow_state):
+            snapshot = serialize(workflow_state)
+            snapshots.append((snapshot, copy.deepcopy(snapshot)))
+            return snapshot
+
+        with mock.patch.object(conducting.WorkflowState, 'serialize', autospec=True) as mock_ser:
+            mock_ser.side_effect = record
+            next_tasks = conductor.get_next_tasks()
+
+            while next_tasks:
+                for task in next_tasks:
+                    for action_spec in task['actions']:
+                        item_id = action_spec.get('item_id')
+                        ctx = {'item_id': item_id} if item_id is not None else None
+                        result = (action_spec['input'] or {}).get('message')
+
+                        self.forward_task_statuses(
+                            conductor,
+                            task['id'],
+                            [statuses.RUNNING, statuses.SUCCEEDED],
+                            ctxs=[ctx, ctx],
+                            results=[None, result]
+                        )
+
+                next_tasks = conductor.get_next_tasks()
+
+        expected_output = {
+            'data': {'a': {'b': 1, 'c': 2}},
+            'items': ['fee', 'fi', 'fo'],
+            'status': statuses.SUCCEEDED
+        }
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertListEqual(conductor.errors, [])
+        self.assertDictEqual(conductor.get_workflow_output(), expected_output)
+
+        # The snapshots are shared by the copies of the context for the items, the transitions,
+        # and the rendering of the tasks so none of the callers can change them.
+        self.assertGreater(len(snapshots), 0)
+
+        for snapshot, expected_snapshot in snapshots:
+            self.assertDictEqual(snapshot, expected_snapshot)
+
+    def test_state_snapshots_not_mutated(self):
+        self.assert_state_snapshots_not_mutated()
+
+    def test_state_snapshots_not_mutated_when_thread_safe(self):
+        self.assert_state_snapshots_not_mutated(thread_safe=True)
@@ -0,0 +1,210 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import threading
+
+from six.moves import queue
+
+from orquesta import conducting
+from orquesta import events
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.unit import base as test_base
+
+
+MEMBERS = ['Picard', 'Riker', 'Data', 'Worf', 'Troi', 'Crusher', 'La Forge', 'Yar']
+
+
+def get_action_result(action_spec):
+    return (action_spec['input'] or {}).get('message')
+
+
+def get_action_event(action_spec, status, result=None):
+    ctx = {'item_id': action_spec['item_id']} if 'item_id' in action_spec else None
+
+    return events.ActionExecutionEvent(status, result=result, context=ctx)
+
+
+class WorkflowConductorThreadSafeTest(test_base.WorkflowConductorTest):
+    spec_module_name = 'native'
+
+    def setUp(self):
+        super(WorkflowConductorThreadSafeTest, self).setUp()
+
+        # Switch threads more often to interleave the events of the workers. The switch
+        # interval is not available in python 2.
+        get_switch_interval = getattr(sys, 'getswitchinterval', None)
+        set_switch_interval = getattr(sys, 'setswitchinterval', None)
+
+        if set_switch_interval is not None:
+            self.addCleanup(set_switch_interval, get_switch_interval())
+            set_switch_interval(0.00001)
+
+    def _prep_conductor(self, wf_name, inputs=None, thread_safe=False):
+        spec = native_specs.WorkflowSpec(self.get_wf_def(wf_name, raw=True))
+        conductor = conducting.WorkflowConductor(spec, inputs=inputs, thread_safe=thread_safe)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        return conductor
+
+    def _run_serially(self, conductor):
+        while conductor.get_workflow_status() in statuses.RUNNING_STATUSES:
+            next_tasks = conductor.get_next_tasks()
+
+            if not next_tasks:
+                break
+
+            for task in next_tasks:
+                for action_spec in task['actions']:
+                    event = get_action_event(action_spec, statuses.RUNNING)
+                    conductor.update_task_state(task['id'], task['route'], event)
+
+                for action_spec in task['actions']:
+                    result = get_action_result(action_spec)
+                    event = get_action_event(action_spec, statuses.SUCCEEDED, result)
+                    conductor.update_task_state(task['id'], task['route'], event)
+
+    def _run_in_parallel(self, conductor, num_workers=4):
+        work_queue = queue.Queue()
+        done_queue = queue.Queue()
+        errors = []
+
+        def work():
+            while True:
+                item = work_queue.get()
+
+                if item is None:
+                    break
+
+                task, action_spec = item
+
+                try:
+                    result = get_action_result(action_spec)
+                    event = get_action_event(action_spec, statuses.SUCCEEDED, result)
+                    conductor.update_task_state(task['id'], task['route'], event)
+                except Exception as e:
+                    errors.append(e)
+                finally:
+                    done_queue.put(item)
+
+        workers = [threading.Thread(target=work) for i in range(0, num_workers)]
+
+        for worker in workers:
+            worker.start()
+
+        in_flight = 0
+
+        try:
+            while conductor.get_workflow_status() in statuses.RUNNING_STATUSES:
+                for task in conductor.get_next_tasks():
+                    for action_spec in task['actions']:
+                        event = get_action_event(action_spec, statuses.RUNNING)
+                        conductor.update_task_state(task['id'], task['route'], event)
+                        work_queue.put((task, action_spec))
+                        in_flight += 1
+
+                if not in_flight:
+                    break
+
+                done_queue.get()
+                in_flight -= 1
+        finally:
+            for worker in workers:
+                work_queue.put(None)
+
+            for worker in workers:
+                worker.join()
+
+        self.assertListEqual(errors, [])
+
+    def _get_task_statuses(self, conductor):
+        # The index of the routes depends on the order the tasks are completed
+        # so compare the task transitions that make up the routes instead.
+        routes = conductor.workflow_state.routes
+
+        return sorted([
+            (t['id'], sorted(routes[t['route']]), t['status'])
+            for t in conductor.workflow_state.sequence
+        ])
+
+    def assert_parallel_equals_serial(self, wf_name, inputs=None, repeat=20):
+        serial = self._prep_conductor(wf_name, inputs=inputs)
+        self._run_serially(serial)
+
+        self.assertEqual(serial.get_workflow_status(), statuses.SUCCEEDED)
+
+        for i in range(0, repeat):
+            conductor = self._prep_conductor(wf_name, inputs=inputs, thread_safe=True)
+            self._run_in_parallel(conductor)
+
+            self.assertListEqual(conductor.errors, serial.errors)
+            self.assertEqual(conductor.get_workflow_status(), serial.get_workflow_status())
+            self.assertEqual(conductor.get_workflow_output(), serial.get_workflow_output())
+            self.assertListEqual(
+                self._get_task_statuses(conductor),
+                self._get_task_statuses(serial)
+            )
+
+            self.assertEqual(
+                len(conductor.workflow_state.contexts),
+                len(serial.workflow_state.contexts)
+            )
+
+    def test_add_context(self):
+        state = conducting.WorkflowState()
+        idxs = []
+
+        def add(n):
+            for i in range(0, n):
+                idxs.append(state.add_context({'i': i}))
+
+        threads = [threading.Thread(target=add, args=(100,)) for i in range(0, 4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertListEqual(sorted(idxs), list(range(0, 400)))
+
+    def test_serialization(self):
+        conductor = self._prep_conductor('join-context', thread_safe=True)
+
+        data = conductor.serialize()
+        restored = conducting.WorkflowConductor.deserialize(data, thread_safe=True)
+
+        self.assertTrue(restored.thread_safe)
+        self.assertDictEqual(restored.serialize(), data)
+        self.assertFalse(conducting.WorkflowConductor.deserialize(data).thread_safe)
+
+    def test_join(self):
+        self.assert_parallel_equals_serial('join-context')
+
+    def test_splits(self):
+        self.assert_parallel_equals_serial('splits')
+
+    def test_with_items(self):
+        self.assert_parallel_equals_serial('with-items', inputs={'members': MEMBERS})
+
+    def test_with_items_concurrency(self):
+        self.assert_parallel_equals_serial(
+            'with-items-concurrency',
+            inputs={'members': MEMBERS}
+        )
+
+    def test_join_count(self):
+        self.assert_parallel_equals_serial('join-count')
+
+    def test_cycles(self):
+        self.assert_parallel_equals_serial('cycles')
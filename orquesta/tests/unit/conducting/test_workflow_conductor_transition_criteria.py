@@ -0,0 +1,232 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from orquesta import conducting
+from orquesta.expressions import base as expr_base
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.unit import base as test_base
+
+
+class WorkflowConductorTransitionCriteriaTest(test_base.WorkflowConductorTest):
+
+    def test_shared_criteria_evaluated_once(self):
+        wf_def = """
+        version: 1.0
+
+        vars:
+          - skip: false
+
+        tasks:
+          task1:
+            action: core.noop
+            next:
+              - when: <% succeeded() and not ctx().skip %>
+                do: task2
+              - when: <% succeeded() and not ctx().skip %>
+                do: task3
+              - when: <% succeeded() and not ctx().skip %>
+                do: task4
+              - when: <% failed() and not ctx().skip %>
+                do: task5
+          task2:
+            action: core.noop
+          task3:
+            action: core.noop
+          task4:
+            action: core.noop
+          task5:
+            action: core.noop
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        self.forward_task_statuses(conductor, 'task1', [statuses.RUNNING])
+
+        with mock.patch.object(expr_base, 'evaluate', wraps=expr_base.evaluate) as evaluate:
+            self.forward_task_statuses(conductor, 'task1', [statuses.SUCCEEDED])
+
+            evaluated = [call[0][0] for call in evaluate.call_args_list]
+            self.assertEqual(evaluated.count('<% succeeded() and not ctx().skip %>'), 1)
+            self.assertEqual(evaluated.count('<% failed() and not ctx().skip %>'), 1)
+
+        task_state_entry = conductor.get_task_state_entry('task1', 0)
+
+        expected_next = {
+            'task2__t0': True,
+            'task3__t0': True,
+            'task4__t0': True,
+            'task5__t0': False
+        }
+
+        self.assertDictEqual(task_state_entry['next'], expected_next)
+
+        next_task_ids = [task['id'] for task in conductor.get_next_tasks()]
+        self.assertListEqual(next_task_ids, ['task2', 'task3', 'task4'])
+
+    def test_criteria_short_circuit(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            action: core.noop
+            next:
+              - when: <% failed() %>
+                do: task2
+          task2:
+            action: core.noop
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        # Add an additional criterion that would fail evaluation if it is evaluated.
+        task_transition = conductor.graph.get_next_transitions('task1')[0]
+        criteria = task_transition[3]['criteria'] + ['<% ctx().foobar %>']
+        conductor.graph.update_transition('task1', 'task2', task_transition[2], criteria=criteria)
+
+        self.forward_task_statuses(conductor, 'task1', [statuses.RUNNING, statuses.SUCCEEDED])
+
+        task_state_entry = conductor.get_task_state_entry('task1', 0)
+        self.assertDictEqual(task_state_entry['next'], {'task2__t0': False})
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertListEqual(conductor.errors, [])
+
+    def test_shared_criteria_evaluation_error(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            action: core.noop
+            next:
+              - when: <% ctx().foobar %>
+                do: task2
+              - when: <% ctx().foobar %>
+                do: task3
+          task2:
+            action: core.noop
+          task3:
+            action: core.noop
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        self.forward_task_statuses(conductor, 'task1', [statuses.RUNNING, statuses.SUCCEEDED])
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.FAILED)
+
+        actual_task_transition_ids = [e['task_transition_id'] for e in conductor.errors]
+        self.assertListEqual(actual_task_transition_ids, ['task2__t0', 'task3__t0'])
+
+    def test_status_criteria_not_evaluated_as_expression(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            action: core.noop
+            next:
+              - when: <% succeeded() %>
+                do: task2
+              - when: "{{ failed() }}"
+                do: task3
+              - when: <% completed() %>
+                do: task4
+          task2:
+            action: core.noop
+          task3:
+            action: core.noop
+          task4:
+            action: core.noop
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        self.forward_task_statuses(conductor, 'task1', [statuses.RUNNING])
+
+        with mock.patch.object(expr_base, 'evaluate', wraps=expr_base.evaluate) as evaluate:
+            self.forward_task_statuses(conductor, 'task1', [statuses.SUCCEEDED])
+
+            evaluated = [call[0][0] for call in evaluate.call_args_list]
+            self.assertNotIn('<% succeeded() %>', evaluated)
+            self.assertNotIn('{{ failed() }}', evaluated)
+            self.assertNotIn('<% completed() %>', evaluated)
+
+        task_state_entry = conductor.get_task_state_entry('task1', 0)
+
+        expected_next = {
+            'task2__t0': True,
+            'task3__t0': False,
+            'task4__t0': True
+        }
+
+        self.assertDictEqual(task_state_entry['next'], expected_next)
+
+    def test_status_criteria_compiled_once(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            action: core.noop
+            next:
+              - when: <% succeeded() %>
+                do: task2
+              - when: <% failed() %>
+                do: task4
+          task2:
+            action: core.noop
+            next:
+              - when: <% succeeded() %>
+                do: task3
+          task3:
+            action: core.noop
+          task4:
+            action: core.noop
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        # The criteria are not parsed again on task events once the graph is composed.
+        with mock.patch.object(
+                conductor.composer,
+                'get_status_criteria',
+                wraps=conductor.composer.get_status_criteria) as get_status_criteria:
+            self.forward_task_statuses(conductor, 'task1', [statuses.RUNNING, statuses.SUCCEEDED])
+            get_status_criteria.assert_not_called()
+
+        # The status predicates are compiled once when a serialized graph is first loaded.
+        conductor = conducting.WorkflowConductor.deserialize(conductor.serialize())
+
+        with mock.patch.object(
+                conductor.composer,
+                'get_status_criteria',
+                wraps=conductor.composer.get_status_criteria) as get_status_criteria:
+            self.forward_task_statuses(conductor, 'task2', [statuses.RUNNING, statuses.SUCCEEDED])
+            self.assertEqual(get_status_criteria.call_count, 3)
+            self.forward_task_statuses(conductor, 'task3', [statuses.RUNNING, statuses.SUCCEEDED])
+            self.assertEqual(get_status_criteria.call_count, 3)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
@@ -0,0 +1,80 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from orquesta.expressions import base as expr_base
+
+
+class ContextProjectionTest(unittest.TestCase):
+
+    def test_get_referenced_vars(self):
+        self.assertSetEqual(expr_base.get_referenced_vars('foobar'), set())
+        self.assertSetEqual(expr_base.get_referenced_vars('<% ctx().foo %>'), {'foo'})
+        self.assertSetEqual(expr_base.get_referenced_vars('<% ctx(foo) %>'), {'foo'})
+        self.assertSetEqual(expr_base.get_referenced_vars('<% ctx("foo") %>'), {'foo'})
+        self.assertSetEqual(expr_base.get_referenced_vars('{{ ctx(\'foo\') }}'), {'foo'})
+        self.assertSetEqual(expr_base.get_referenced_vars('{{ ctx().foo.bar }}'), {'foo'})
+
+        self.assertSetEqual(
+            expr_base.get_referenced_vars('<% ctx(foo) %> and <% ctx().bar %>'),
+            {'foo', 'bar'}
+        )
+
+        self.assertSetEqual(
+            expr_base.get_referenced_vars('{% for x in ctx(xs) %}{{ x }}{% endfor %}'),
+            {'xs'}
+        )
+
+    def test_get_referenced_vars_dynamic(self):
+        self.assertIsNone(expr_base.get_referenced_vars('<% ctx() %>'))
+        self.assertIsNone(expr_base.get_referenced_vars('<% ctx().keys() %>'))
+        self.assertIsNone(expr_base.get_referenced_vars('<% ctx(ctx(foo)) %>'))
+        self.assertIsNone(expr_base.get_referenced_vars('{{ ctx() | length }}'))
+        self.assertIsNone(expr_base.get_referenced_vars('{{ ctx()["foo"] }}'))
+        self.assertIsNone(expr_base.get_referenced_vars('{{ ctx().foo }} {{ ctx() }}'))
+        self.assertIsNone(expr_base.get_referenced_vars('<% $__vars.foo %>'))
+
+    def test_project_context(self):
+        data = {
+            'foo': 'bar',
+            'fu': 'bar',
+            'xs': list(range(0, 10)),
+            '__current_task': {'id': 't1', 'route': 0}
+        }
+
+        expected_data = {
+            'foo': 'bar',
+            '__current_task': {'id': 't1', 'route': 0}
+        }
+
+        self.assertDictEqual(expr_base.project_context('<% ctx().foo %>', data), expected_data)
+        self.assertDictEqual(expr_base.project_context('<% ctx() %>', data), data)
+        self.assertIsNone(expr_base.project_context('<% ctx().foo %>', None))
+
+    def test_evaluate_with_projected_context(self):
+        data = {'foo': 'bar', 'fu': 'bar', 'xs': list(range(0, 10))}
+
+        self.assertEqual(expr_base.evaluate('<% ctx().foo %>', data), 'bar')
+        self.assertEqual(expr_base.evaluate('{{ ctx("foo") }}', data), 'bar')
+        self.assertDictEqual(expr_base.evaluate('<% ctx() %>', data), data)
+        self.assertDictEqual(expr_base.evaluate('{{ ctx() }}', data), data)
+        self.assertEqual(expr_base.evaluate('<% ctx().xs.len() %>', data), 10)
+
+    def test_evaluate_nested_expression_with_projected_context(self):
+        data = {'foo': '<% ctx().fu %>', 'fu': 'bar', 'xs': list(range(0, 10))}
+
+        self.assertEqual(expr_base.evaluate('<% ctx().foo %>', data), 'bar')
+
+        data = {'foo': '{{ ctx().fu }}', 'fu': 'bar', 'xs': list(range(0, 10))}
+
+        self.assertEqual(expr_base.evaluate('{{ ctx().foo }}', data), 'bar')
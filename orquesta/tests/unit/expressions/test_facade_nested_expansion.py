@@ -0,0 +1,99 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from orquesta.expressions import base as expr_base
+from orquesta.expressions import jinja as jinja_expr
+
+
+class NestedExpansionTest(unittest.TestCase):
+
+    def setUp(self):
+        super(NestedExpansionTest, self).setUp()
+        expr_base.reset_stats()
+
+    def test_yaql_nested_expansion(self):
+        data = {'fee': '<% ctx().fi %>', 'fi': 'fee-fi-fo-fum', 'foo': 'bar'}
+
+        self.assertEqual(expr_base.evaluate('<% ctx().fee %>', data), 'fee-fi-fo-fum')
+        self.assertEqual(expr_base.evaluate('<% ctx().foo %>', data), 'bar')
+
+        expected_stats = {
+            'nested_expansion_checked': 3,
+            'nested_expansion_expanded': 1,
+            'nested_expansion_skipped': 0
+        }
+
+        self.assertDictEqual(expr_base.get_stats(), expected_stats)
+
+    def test_jinja_nested_expansion(self):
+        data = {'fee': '{{ ctx().fi }}', 'fi': 'fee-fi-fo-fum', 'foo': 'bar'}
+
+        self.assertEqual(expr_base.evaluate('{{ ctx().fee }}', data), 'fee-fi-fo-fum')
+        self.assertEqual(expr_base.evaluate('{{ ctx().foo }}', data), 'bar')
+
+        expected_stats = {
+            'nested_expansion_checked': 3,
+            'nested_expansion_expanded': 1,
+            'nested_expansion_skipped': 0
+        }
+
+        self.assertDictEqual(expr_base.get_stats(), expected_stats)
+
+    def test_nested_expansion_disabled(self):
+        with expr_base.options(nested_expansion=False):
+            data = {'fee': '<% ctx().fi %>', 'fi': 'fee-fi-fo-fum'}
+            self.assertEqual(expr_base.evaluate('<% ctx().fee %>', data), '<% ctx().fi %>')
+
+            data = {'fee': '{{ ctx().fi }}', 'fi': 'fee-fi-fo-fum'}
+            self.assertEqual(expr_base.evaluate('{{ ctx().fee }}', data), '{{ ctx().fi }}')
+
+            expr = '{% for i in ctx().xs %}{{ i }}{% endfor %}'
+            data = {'xs': ['{{ ctx().a }}', 'b'], 'a': 'a'}
+            self.assertEqual(expr_base.evaluate(expr, data), '{{ ctx().a }}b')
+
+        expected_stats = {
+            'nested_expansion_checked': 0,
+            'nested_expansion_expanded': 0,
+            'nested_expansion_skipped': 3
+        }
+
+        self.assertDictEqual(expr_base.get_stats(), expected_stats)
+
+    def test_nested_expansion_max_size(self):
+        data = {'fee': '<% ctx().fi %>', 'fi': 'fee-fi-fo-fum', 'log': 'x' * 1000}
+
+        with expr_base.options(nested_expansion_max_size=100):
+            self.assertEqual(expr_base.evaluate('<% ctx().fee %>', data), 'fee-fi-fo-fum')
+            self.assertEqual(expr_base.evaluate('<% ctx().log %>', data), data['log'])
+
+        expected_stats = {
+            'nested_expansion_checked': 2,
+            'nested_expansion_expanded': 1,
+            'nested_expansion_skipped': 1
+        }
+
+        self.assertDictEqual(expr_base.get_stats(), expected_stats)
+
+    def test_undefined_variable_with_nested_expansion_disabled(self):
+        with expr_base.options(nested_expansion=False):
+            self.assertRaises(
+                jinja_expr.JinjaEvaluationException,
+                expr_base.evaluate,
+                '{{ ctx().fee }}',
+                {'foo': 'bar'}
+            )
+
+    def test_set_invalid_option(self):
+        self.assertRaises(KeyError, expr_base.set_options, foobar=True)
+        self.assertRaises(KeyError, expr_base.get_option, 'foobar')
@@ -0,0 +1,126 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from orquesta.expressions import base as expr_base
+from orquesta.expressions import jinja as jinja_expr
+from orquesta.tests.unit import base as test_base
+
+
+class JinjaNativeTypesEvaluationTest(test_base.ExpressionEvaluatorTest):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.language = 'jinja'
+        super(JinjaNativeTypesEvaluationTest, cls).setUpClass()
+
+    def setUp(self):
+        super(JinjaNativeTypesEvaluationTest, self).setUp()
+
+        # Turn on the option for the scope of each test.
+        patcher = mock.patch.object(
+            expr_base._EXP_OPTIONS_LOCAL,
+            'stack',
+            [{'native_types': True}],
+            create=True
+        )
+
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_options_scope(self):
+        self.assertTrue(expr_base.get_option('native_types'))
+
+        with expr_base.options(native_types=False):
+            self.assertFalse(expr_base.get_option('native_types'))
+
+        self.assertTrue(expr_base.get_option('native_types'))
+
+    def test_eval(self):
+        data = {'foo': 'bar', 'xs': [1, 2, 3], 'x': {'y': 'z'}}
+
+        self.assertEqual('bar', self.evaluator.evaluate('{{ ctx().foo }}', data))
+        self.assertListEqual([1, 2, 3], self.evaluator.evaluate('{{ ctx().xs }}', data))
+        self.assertDictEqual({'y': 'z'}, self.evaluator.evaluate('{{ ctx("x") }}', data))
+
+        expr = '{{ ctx().foo }} and {{ ctx().x.y }}'
+        self.assertEqual('bar and z', self.evaluator.evaluate(expr, data))
+
+    def test_eval_string_of_numbers(self):
+        data = {'foo': '123'}
+
+        self.assertEqual('123', self.evaluator.evaluate('{{ ctx().foo }}', data))
+
+    def test_eval_not_recursive(self):
+        data = {'fee': '{{ ctx().fi }}', 'fi': 'fee-fi-fo-fum'}
+
+        self.assertEqual('{{ ctx().fi }}', self.evaluator.evaluate('{{ ctx().fee }}', data))
+
+    def test_eval_undefined(self):
+        data = {'foo': 'bar'}
+
+        self.assertRaises(
+            jinja_expr.JinjaEvaluationException,
+            self.evaluator.evaluate,
+            '{{ ctx().fee }}',
+            data
+        )
+
+        self.assertRaises(
+            jinja_expr.JinjaEvaluationException,
+            self.evaluator.evaluate,
+            '{{ ctx().foo }} and {{ ctx().fee }}',
+            data
+        )
+
+    def test_block_eval(self):
+        expr = '{% for i in ctx().x %}{{ i }}{% endfor %}'
+        data = {'x': ['a', 'b', 'c']}
+
+        self.assertEqual('abc', self.evaluator.evaluate(expr, data))
+
+    def test_block_eval_with_native_result(self):
+        expr = '{% if ctx().y %}{{ ctx().x }}{% else %}{{ [] }}{% endif %}'
+        data = {'x': [{'a': 1}, {'b': 2}], 'y': True}
+
+        self.assertListEqual(data['x'], self.evaluator.evaluate(expr, data))
+
+    def test_block_eval_undefined(self):
+        expr = '{% for i in ctx().x %}{{ ctx().y }}{% endfor %}'
+        data = {'x': ['a', 'b', 'c']}
+
+        self.assertRaises(
+            jinja_expr.JinjaEvaluationException,
+            self.evaluator.evaluate,
+            expr,
+            data
+        )
+
+    def test_raw_block_eval(self):
+        expr = '{% raw %}{{ ctx().x }}{% endraw %} {{ ctx().y }}'
+        data = {'y': 'foobar'}
+
+        self.assertEqual('{{ ctx().x }} foobar', self.evaluator.evaluate(expr, data))
+
+    def test_facade_eval(self):
+        data = {'xs': [1, 2, 3]}
+
+        self.assertListEqual([1, 2, 3], expr_base.evaluate('{{ ctx().xs }}', data))
+
+        expr = (
+            '{% set ys = [] %}'
+            '{% for x in ctx().xs %}{% set _ = ys.append(x * 2) %}{% endfor %}'
+            '{{ ys }}'
+        )
+
+        self.assertListEqual([2, 4, 6], expr_base.evaluate(expr, data))
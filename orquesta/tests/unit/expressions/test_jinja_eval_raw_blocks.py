@@ -29,8 +29,8 @@ class JinjaEvaluationTest(test_base.ExpressionEvaluatorTest):
         )
 
         self.assertEqual(e, jinja_expr.JinjaEvaluator)
-        self.assertIn('ctx', e._custom_functions.keys())
-        self.assertIn('task_status', e._custom_functions.keys())
+        self.assertIn('ctx', e.get_custom_functions().keys())
+        self.assertIn('task_status', e.get_custom_functions().keys())
 
     def test_block_eval(self):
         expr = '{% for i in ctx().x %}{{ i }}{% endfor %}'
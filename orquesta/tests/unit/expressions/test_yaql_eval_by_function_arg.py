@@ -29,7 +29,7 @@ class YAQLEvaluationTest(test_base.ExpressionEvaluatorTest):
         )
 
         self.assertEqual(e, yaql_expr.YAQLEvaluator)
-        self.assertIn('ctx', e._custom_functions.keys())
+        self.assertIn('ctx', e.get_custom_functions().keys())
 
     def test_basic_eval(self):
         expr = '<% ctx(foo) %>'
@@ -29,7 +29,7 @@ class YAQLEvaluationTest(test_base.ExpressionEvaluatorTest):
         )
 
         self.assertEqual(e, yaql_expr.YAQLEvaluator)
-        self.assertIn('json', e._custom_functions.keys())
+        self.assertIn('json', e.get_custom_functions().keys())
 
     def test_custom_function(self):
         expr = '<% json(\'{"a": 123}\') %>'
@@ -0,0 +1,164 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from orquesta import conducting
+from orquesta import graphing
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.unit import base as test_base
+
+
+class CriticalPathTest(test_base.WorkflowGraphTest):
+
+    def _prep_graph(self, barrier='*'):
+        wf_graph = graphing.WorkflowGraph()
+
+        wf_graph.add_transition('task1', 'task2')
+        wf_graph.add_transition('task1', 'task3')
+        wf_graph.add_transition('task2', 'task4')
+        wf_graph.add_transition('task3', 'task4')
+        wf_graph.set_barrier('task4', value=barrier)
+
+        return wf_graph
+
+    def test_critical_path(self):
+        wf_graph = self._prep_graph()
+        durations = {'task1': 1, 'task2': 5, 'task3': 2, 'task4': 1}
+
+        result = wf_graph.get_critical_path(durations=durations)
+
+        self.assertEqual(result['makespan'], 7.0)
+        self.assertListEqual(result['critical_path'], ['task1', 'task2', 'task4'])
+        self.assertListEqual(result['cycles'], [])
+
+        expected_task3 = {
+            'duration': 2.0,
+            'iterations': 1,
+            'earliest_start': 1.0,
+            'earliest_finish': 3.0,
+            'latest_start': 4.0,
+            'latest_finish': 6.0,
+            'slack': 3.0,
+            'tail': 3.0
+        }
+
+        self.assertDictEqual(result['tasks']['task3'], expected_task3)
+        self.assertEqual(result['tasks']['task1']['tail'], 7.0)
+        self.assertEqual(result['tasks']['task2']['slack'], 0.0)
+        self.assertEqual(result['tasks']['task4']['earliest_start'], 6.0)
+
+    def test_critical_path_default_duration(self):
+        wf_graph = self._prep_graph()
+
+        result = wf_graph.get_critical_path(durations={'task2': 3}, default_duration=1)
+
+        self.assertEqual(result['makespan'], 5.0)
+        self.assertEqual(result['tasks']['task3']['slack'], 2.0)
+
+    def test_critical_path_barrier_count(self):
+        wf_graph = self._prep_graph(barrier=1)
+        durations = {'task1': 1, 'task2': 5, 'task3': 2, 'task4': 1}
+
+        result = wf_graph.get_critical_path(durations=durations)
+
+        # The join task starts once the first inbound task completes.
+        self.assertEqual(result['tasks']['task4']['earliest_start'], 3.0)
+        self.assertEqual(result['makespan'], 6.0)
+        self.assertListEqual(result['critical_path'], ['task1', 'task2'])
+
+    def test_critical_path_with_cycle(self):
+        wf_graph = graphing.WorkflowGraph()
+
+        wf_graph.add_transition('prep', 'task1')
+        wf_graph.add_transition('task1', 'task2')
+        wf_graph.add_transition('task2', 'task1')
+        wf_graph.add_transition('task2', 'task3')
+
+        result = wf_graph.get_critical_path(default_duration=1, iterations={'task1': 3})
+
+        expected_cycles = [{'tasks': ['task1', 'task2'], 'iterations': 3, 'duration': 6.0}]
+
+        self.assertEqual(result['makespan'], 8.0)
+        self.assertListEqual(result['cycles'], expected_cycles)
+        self.assertListEqual(result['critical_path'], ['prep', 'task1', 'task2', 'task3'])
+        self.assertEqual(result['tasks']['task1']['earliest_start'], 1.0)
+        self.assertEqual(result['tasks']['task2']['earliest_start'], 2.0)
+        self.assertEqual(result['tasks']['task2']['tail'], 6.0)
+        self.assertEqual(result['tasks']['task3']['earliest_start'], 7.0)
+
+        # The default iteration count is used for cycles with no count given.
+        result = wf_graph.get_critical_path(default_duration=1, default_iterations=2)
+
+        self.assertEqual(result['makespan'], 6.0)
+
+    def test_critical_path_with_criteria(self):
+        wf_graph = graphing.WorkflowGraph()
+
+        wf_graph.add_transition('task1', 'task2', criteria=['ok'])
+        wf_graph.add_transition('task1', 'task3', criteria=['error'])
+        wf_graph.add_transition('task3', 'task4')
+
+        result = wf_graph.get_critical_path(
+            default_duration=1,
+            criteria=lambda task_id, criterion: criterion == 'ok'
+        )
+
+        # The tasks that cannot be reached thru the transitions that are met are left out.
+        self.assertEqual(result['makespan'], 2.0)
+        self.assertListEqual(result['critical_path'], ['task1', 'task2'])
+        self.assertListEqual(sorted(result['tasks'].keys()), ['task1', 'task2'])
+
+    def test_conductor_critical_path(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            action: core.noop
+            next:
+              - when: <% succeeded() %>
+                do: task2, task3
+              - when: <% failed() %>
+                do: task5
+          task2:
+            action: core.http url=<% ctx().url %>
+            next:
+              - do: task4
+          task3:
+            action: core.echo message="foobar"
+            next:
+              - do: task4
+          task4:
+            join: all
+          task5:
+            action: core.noop
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        conductor = conducting.WorkflowConductor(spec)
+
+        durations = {'core.http': 4.0, 'core.noop': 1.0}
+        expected_durations = {'task1': 1.0, 'task2': 4.0, 'task3': 2.0, 'task4': 0.0, 'task5': 1.0}
+
+        self.assertDictEqual(conductor.get_task_durations(durations, 2.0), expected_durations)
+
+        result = conductor.get_critical_path(durations=durations, default_duration=2.0)
+
+        self.assertEqual(result['makespan'], 5.0)
+        self.assertListEqual(result['critical_path'], ['task1', 'task2', 'task4'])
+        self.assertEqual(result['tasks']['task3']['slack'], 2.0)
+        self.assertNotIn('task5', result['tasks'])
+
+        result = conductor.get_critical_path(durations=durations, status=statuses.FAILED)
+
+        self.assertEqual(result['makespan'], 2.0)
+        self.assertListEqual(result['critical_path'], ['task1', 'task5'])
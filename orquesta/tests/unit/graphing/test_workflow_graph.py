@@ -359,3 +359,41 @@ class WorkflowGraphTest(test_base.WorkflowGraphTest):
             len(wf_graph.get_prev_transitions('task9')) > 1 and
             not wf_graph.has_barrier('task9')
         )
+
+    def test_graph_topology(self):
+        wf_graph = self._prep_graph()
+
+        expected = {
+            'roots': [{'id': 'task1', 'name': 'task1'}],
+            'leaves': [{'id': 'task6', 'name': 'task6'}, {'id': 'task9', 'name': 'task9'}],
+            'cycles': []
+        }
+
+        self.assertDictEqual(wf_graph.get_topology(), expected)
+
+        # Ensure the topology is reset when the graph is changed.
+        wf_graph.add_task('task10')
+        wf_graph.add_transition('task9', 'task10')
+        wf_graph.add_transition('task10', 'task1')
+
+        self.assertListEqual(wf_graph.roots, [])
+        self.assertListEqual(wf_graph.leaves, [{'id': 'task6', 'name': 'task6'}])
+        self.assertTrue(wf_graph.in_cycle('task10'))
+        self.assertFalse(wf_graph.in_cycle('task6'))
+
+        # Ensure the topology is reset when the task is updated.
+        wf_graph.update_task('task6', name='task6a')
+        self.assertListEqual(wf_graph.leaves, [{'id': 'task6', 'name': 'task6a'}])
+
+        # Ensure the cached topology is not modified by the caller.
+        wf_graph.leaves[0]['name'] = 'foobar'
+        self.assertListEqual(wf_graph.leaves, [{'id': 'task6', 'name': 'task6a'}])
+
+    def test_graph_deserialize_with_topology(self):
+        wf_graph = self._prep_graph()
+        topology = wf_graph.get_topology()
+
+        wf_graph = graphing.WorkflowGraph.deserialize(wf_graph.serialize(), topology=topology)
+
+        self.assertIsNotNone(wf_graph._topology)
+        self.assertDictEqual(wf_graph.get_topology(), topology)
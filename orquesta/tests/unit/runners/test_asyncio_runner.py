@@ -0,0 +1,303 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+
+from orquesta import conducting
+from orquesta import events
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.fixtures import loader as fixture_loader
+
+try:
+    import asyncio
+
+    from orquesta.runners import asyncio as asyncio_runner
+except ImportError:
+    asyncio = None
+
+
+def echo(action_spec, task):
+    return asyncio.sleep(0, result=(action_spec['input'] or {}).get('message'))
+
+
+def sleeper(delay):
+    def action(action_spec, task):
+        return asyncio.sleep(delay, result=(action_spec['input'] or {}).get('message'))
+
+    return action
+
+
+@unittest.skipIf(asyncio is None, 'The asyncio module is not available.')
+class AsyncioRunnerTest(unittest.TestCase):
+
+    def setUp(self):
+        super(AsyncioRunnerTest, self).setUp()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+        super(AsyncioRunnerTest, self).tearDown()
+
+    def get_conductor(self, wf_def, inputs=None):
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        return conducting.WorkflowConductor(spec, inputs=inputs)
+
+    def test_run_sequential(self):
+        wf_def = fixture_loader.get_fixture_content('native/sequential.yaml', 'workflows', raw=True)
+        conductor = self.get_conductor(wf_def, inputs={'name': 'Stanley'})
+
+        runner = asyncio_runner.run(conductor, echo, loop=self.loop)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        expected_output = {'greeting': 'Stanley, All your base are belong to us!'}
+        self.assertDictEqual(conductor.get_workflow_output(), expected_output)
+
+        metrics = runner.get_metrics()
+        self.assertEqual(metrics['tasks_dispatched'], 3)
+        self.assertEqual(metrics['actions_dispatched'], 3)
+        self.assertEqual(metrics['actions_succeeded'], 3)
+        self.assertEqual(metrics['actions_active'], 0)
+        self.assertEqual(metrics['actions_peak'], 1)
+        self.assertGreater(metrics['throughput'], 0)
+
+    def test_run_parallel_branches(self):
+        wf_def = fixture_loader.get_fixture_content('native/join.yaml', 'workflows', raw=True)
+        conductor = self.get_conductor(wf_def)
+
+        runner = asyncio_runner.run(conductor, sleeper(0.05), loop=self.loop)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+        # The two branches are dispatched together so the workflow
+        # takes the time of the critical path and not of all the tasks.
+        metrics = runner.get_metrics()
+        self.assertEqual(metrics['actions_succeeded'], 7)
+        self.assertEqual(metrics['actions_peak'], 2)
+        self.assertLess(metrics['elapsed'], 7 * 0.05)
+
+    def test_run_with_items(self):
+        wf_def = """
+        version: 1.0
+
+        vars:
+          - xs: <% range(20).select(str($)) %>
+
+        tasks:
+          task1:
+            with: <% ctx(xs) %>
+            action: core.echo message=<% item() %>
+            next:
+              - publish:
+                  - items: <% result() %>
+
+        output:
+          - items: <% ctx(items) %>
+        """
+
+        conductor = self.get_conductor(wf_def)
+        runner = asyncio_runner.run(conductor, sleeper(0.05), loop=self.loop)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        expected_output = {'items': [str(i) for i in range(20)]}
+        self.assertDictEqual(conductor.get_workflow_output(), expected_output)
+
+        metrics = runner.get_metrics()
+        self.assertEqual(metrics['tasks_dispatched'], 1)
+        self.assertEqual(metrics['actions_succeeded'], 20)
+        self.assertEqual(metrics['actions_peak'], 20)
+        self.assertLess(metrics['elapsed'], 20 * 0.05)
+
+    def test_run_with_items_concurrency(self):
+        wf_def = fixture_loader.get_fixture_content(
+            'native/with-items-concurrency.yaml',
+            'workflows',
+            raw=True
+        )
+
+        members = ['Lakshmi', 'Lindsay', 'Tomaz', 'Matt', 'Drew']
+        conductor = self.get_conductor(wf_def, inputs={'members': members})
+        runner = asyncio_runner.run(conductor, sleeper(0.01), loop=self.loop)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+        task_state_entry = conductor.get_task_state_entry('task1', 0)
+        self.assertEqual(task_state_entry['status'], statuses.SUCCEEDED)
+
+        metrics = runner.get_metrics()
+        self.assertEqual(metrics['actions_succeeded'], 5)
+        self.assertEqual(metrics['actions_peak'], 2)
+
+    def test_run_with_empty_items_and_no_action(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            with: <% list() %>
+            action: core.echo message=<% item() %>
+            next:
+              - do: task2
+          task2:
+            next:
+              - publish: xyz=123
+
+        output:
+          - xyz: <% ctx(xyz) %>
+        """
+
+        conductor = self.get_conductor(wf_def)
+        runner = asyncio_runner.run(conductor, echo, loop=self.loop)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertDictEqual(conductor.get_workflow_output(), {'xyz': 123})
+        self.assertEqual(runner.get_metrics()['tasks_dispatched'], 2)
+        self.assertEqual(runner.get_metrics()['actions_dispatched'], 0)
+
+    def test_run_with_delay(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            delay: 1
+            action: core.noop
+        """
+
+        conductor = self.get_conductor(wf_def)
+
+        start = time.time()
+        runner = asyncio_runner.run(conductor, echo, loop=self.loop)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertGreaterEqual(time.time() - start, 0.9)
+        self.assertEqual(runner.get_metrics()['tasks_delayed'], 1)
+        self.assertEqual(runner.get_metrics()['actions_succeeded'], 1)
+
+    def test_run_with_action_failure(self):
+        wf_def = fixture_loader.get_fixture_content('native/sequential.yaml', 'workflows', raw=True)
+        conductor = self.get_conductor(wf_def, inputs={'name': 'Stanley'})
+
+        def action(action_spec, task):
+            if task['id'] == 'task2':
+                raise ValueError('Boom!')
+
+            return echo(action_spec, task)
+
+        runner = asyncio_runner.run(conductor, action, loop=self.loop)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.FAILED)
+        self.assertEqual(conductor.get_task_state_entry('task2', 0)['status'], statuses.FAILED)
+        self.assertIsNone(conductor.get_task_state_entry('task3', 0))
+
+        expected_errors = [
+            {
+                'type': 'error',
+                'message': 'Execution failed. See result for details.',
+                'task_id': 'task2',
+                'result': {'error': 'ValueError: Boom!'}
+            }
+        ]
+
+        self.assertListEqual(conductor.errors, expected_errors)
+        self.assertEqual(runner.get_metrics()['actions_failed'], 1)
+
+    def test_run_with_action_event(self):
+        wf_def = fixture_loader.get_fixture_content('native/sequential.yaml', 'workflows', raw=True)
+        conductor = self.get_conductor(wf_def, inputs={'name': 'Stanley'})
+
+        def action(action_spec, task):
+            return asyncio.sleep(0, result=events.ActionExecutionEvent(statuses.FAILED, 'Nope'))
+
+        asyncio_runner.run(conductor, action, loop=self.loop)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.FAILED)
+        self.assertEqual(conductor.get_task_state_entry('task1', 0)['status'], statuses.FAILED)
+
+    def test_pause_and_resume(self):
+        wf_def = fixture_loader.get_fixture_content('native/sequential.yaml', 'workflows', raw=True)
+        conductor = self.get_conductor(wf_def, inputs={'name': 'Stanley'})
+        runner = asyncio_runner.AsyncioRunner(conductor, sleeper(0.05), loop=self.loop)
+
+        # Pause while the first task is running. The task completes before the workflow pauses.
+        self.loop.call_later(0.01, runner.pause)
+        status = self.loop.run_until_complete(runner.run())
+
+        self.assertEqual(status, statuses.PAUSED)
+        self.assertEqual(conductor.get_task_state_entry('task1', 0)['status'], statuses.SUCCEEDED)
+        self.assertIsNone(conductor.get_task_state_entry('task2', 0))
+
+        status = self.loop.run_until_complete(runner.run())
+
+        self.assertEqual(status, statuses.SUCCEEDED)
+        self.assertEqual(runner.get_metrics()['actions_succeeded'], 3)
+
+    def test_pause_with_items(self):
+        wf_def = fixture_loader.get_fixture_content(
+            'native/with-items-concurrency.yaml',
+            'workflows',
+            raw=True
+        )
+
+        members = ['Lakshmi', 'Lindsay', 'Tomaz', 'Matt', 'Drew']
+        conductor = self.get_conductor(wf_def, inputs={'members': members})
+        runner = asyncio_runner.AsyncioRunner(conductor, sleeper(0.05), loop=self.loop)
+
+        self.loop.call_later(0.01, runner.pause)
+        status = self.loop.run_until_complete(runner.run())
+
+        self.assertEqual(status, statuses.PAUSED)
+        self.assertEqual(runner.get_metrics()['actions_succeeded'], 2)
+
+        status = self.loop.run_until_complete(runner.run())
+
+        self.assertEqual(status, statuses.SUCCEEDED)
+        self.assertEqual(runner.get_metrics()['actions_succeeded'], 5)
+
+    def test_pause_while_delayed(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            delay: 10
+            action: core.noop
+        """
+
+        conductor = self.get_conductor(wf_def)
+        runner = asyncio_runner.AsyncioRunner(conductor, echo, loop=self.loop)
+
+        self.loop.call_later(0.01, runner.pause)
+        status = self.loop.run_until_complete(asyncio.wait_for(runner.run(), 5, loop=self.loop))
+
+        self.assertEqual(status, statuses.PAUSED)
+        self.assertEqual(runner.get_metrics()['actions_dispatched'], 0)
+
+    def test_cancel(self):
+        wf_def = fixture_loader.get_fixture_content('native/join.yaml', 'workflows', raw=True)
+        conductor = self.get_conductor(wf_def)
+        runner = asyncio_runner.AsyncioRunner(conductor, sleeper(10), loop=self.loop)
+
+        # The actions in progress are canceled so the run does not wait for them to complete.
+        self.loop.call_later(0.01, runner.cancel)
+        status = self.loop.run_until_complete(asyncio.wait_for(runner.run(), 5, loop=self.loop))
+
+        self.assertEqual(status, statuses.CANCELED)
+        self.assertEqual(conductor.get_task_state_entry('task1', 0)['status'], statuses.CANCELED)
+        self.assertIsNone(conductor.get_task_state_entry('task2', 0))
+
+        metrics = runner.get_metrics()
+        self.assertEqual(metrics['actions_canceled'], 1)
+        self.assertEqual(metrics['actions_active'], 0)
@@ -0,0 +1,304 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+import time
+import unittest
+
+from orquesta import conducting
+from orquesta import events
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.fixtures import loader as fixture_loader
+
+try:
+    from orquesta.runners import pool as pool_runner
+except ImportError:
+    pool_runner = None
+
+
+def echo(message=None):
+    return message
+
+
+def noop():
+    return None
+
+
+def square_sum(n):
+    return {'pid': os.getpid(), 'value': sum(i * i for i in range(n))}
+
+
+class Tracker(object):
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, message=None):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+        time.sleep(self.delay)
+
+        with self.lock:
+            self.active -= 1
+
+        return message
+
+
+@unittest.skipIf(pool_runner is None, 'The concurrent.futures module is not available.')
+class PoolRunnerTest(unittest.TestCase):
+
+    def get_conductor(self, wf_def, inputs=None):
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        return conducting.WorkflowConductor(spec, inputs=inputs)
+
+    def test_run_sequential(self):
+        wf_def = fixture_loader.get_fixture_content('native/sequential.yaml', 'workflows', raw=True)
+        conductor = self.get_conductor(wf_def, inputs={'name': 'Stanley'})
+
+        runner = pool_runner.run(conductor, {'core.echo': echo})
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        expected_output = {'greeting': 'Stanley, All your base are belong to us!'}
+        self.assertDictEqual(conductor.get_workflow_output(), expected_output)
+
+        metrics = runner.get_metrics()
+        self.assertEqual(metrics['actions_succeeded'], 3)
+        self.assertEqual(metrics['actions_active'], 0)
+
+    def test_run_parallel_branches(self):
+        wf_def = fixture_loader.get_fixture_content('native/join.yaml', 'workflows', raw=True)
+        conductor = self.get_conductor(wf_def)
+        tracker = Tracker()
+
+        runner = pool_runner.run(conductor, {'core.noop': tracker}, max_workers=4)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertEqual(runner.get_metrics()['actions_succeeded'], 7)
+        self.assertEqual(tracker.peak, 2)
+
+    def test_run_with_items_max_workers(self):
+        wf_def = """
+        version: 1.0
+
+        vars:
+          - xs: <% range(8).select(str($)) %>
+
+        tasks:
+          task1:
+            with: <% ctx(xs) %>
+            action: core.echo message=<% item() %>
+            next:
+              - publish:
+                  - items: <% result() %>
+
+        output:
+          - items: <% ctx(items) %>
+        """
+
+        conductor = self.get_conductor(wf_def)
+        tracker = Tracker()
+
+        runner = pool_runner.run(conductor, {'core.echo': tracker}, max_workers=2)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        expected_output = {'items': [str(i) for i in range(8)]}
+        self.assertDictEqual(conductor.get_workflow_output(), expected_output)
+
+        # All the items are submitted together and the pool limits how many run at once.
+        self.assertEqual(runner.get_metrics()['actions_peak'], 8)
+        self.assertEqual(tracker.peak, 2)
+
+    def test_run_with_items_concurrency(self):
+        wf_def = fixture_loader.get_fixture_content(
+            'native/with-items-concurrency.yaml',
+            'workflows',
+            raw=True
+        )
+
+        members = ['Lakshmi', 'Lindsay', 'Tomaz', 'Matt', 'Drew']
+        conductor = self.get_conductor(wf_def, inputs={'members': members})
+        tracker = Tracker()
+
+        runner = pool_runner.run(conductor, {'core.echo': tracker}, max_workers=8)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertEqual(runner.get_metrics()['actions_succeeded'], 5)
+        self.assertEqual(runner.get_metrics()['actions_peak'], 2)
+        self.assertEqual(tracker.peak, 2)
+
+    def test_run_with_process_pool(self):
+        wf_def = """
+        version: 1.0
+
+        vars:
+          - xs: [10, 100, 1000]
+
+        tasks:
+          task1:
+            with: <% ctx(xs) %>
+            action: math.square_sum n=<% item() %>
+            next:
+              - publish:
+                  - results: <% result() %>
+
+        output:
+          - results: <% ctx(results) %>
+        """
+
+        conductor = self.get_conductor(wf_def)
+        actions = {'math.square_sum': square_sum}
+        routes = {'math.square_sum': pool_runner.POOL_PROCESS}
+
+        with pool_runner.PoolRunner(conductor, actions, max_workers=2, routes=routes) as runner:
+            self.assertEqual(runner.get_pool('math.square_sum'), pool_runner.POOL_PROCESS)
+            self.assertEqual(runner.get_pool('core.echo'), pool_runner.POOL_THREAD)
+            self.assertEqual(runner.run(), statuses.SUCCEEDED)
+
+        output = conductor.get_workflow_output()
+        self.assertIsNotNone(output)
+
+        results = output['results']
+        self.assertListEqual([r['value'] for r in results], [285, 328350, 332833500])
+        self.assertNotIn(os.getpid(), [r['pid'] for r in results])
+
+    def test_invalid_pool(self):
+        conductor = self.get_conductor(
+            fixture_loader.get_fixture_content('native/sequential.yaml', 'workflows', raw=True)
+        )
+
+        self.assertRaises(
+            ValueError,
+            pool_runner.PoolRunner,
+            conductor,
+            {'core.echo': echo},
+            routes={'core.echo': 'foobar'}
+        )
+
+    def test_run_with_unregistered_action(self):
+        wf_def = fixture_loader.get_fixture_content('native/sequential.yaml', 'workflows', raw=True)
+        conductor = self.get_conductor(wf_def, inputs={'name': 'Stanley'})
+
+        runner = pool_runner.run(conductor, {})
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.FAILED)
+
+        expected_errors = [
+            {
+                'type': 'error',
+                'message': 'Execution failed. See result for details.',
+                'task_id': 'task1',
+                'result': {'error': 'ValueError: The action "core.echo" is not registered.'}
+            }
+        ]
+
+        self.assertListEqual(conductor.errors, expected_errors)
+        self.assertEqual(runner.get_metrics()['actions_failed'], 1)
+
+    def test_run_with_action_failure(self):
+        wf_def = fixture_loader.get_fixture_content('native/sequential.yaml', 'workflows', raw=True)
+        conductor = self.get_conductor(wf_def, inputs={'name': 'Stanley'})
+
+        def fail(message=None):
+            raise ValueError('Boom!')
+
+        pool_runner.run(conductor, {'core.echo': fail})
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.FAILED)
+        self.assertEqual(conductor.get_task_state_entry('task1', 0)['status'], statuses.FAILED)
+        self.assertEqual(conductor.errors[0]['result'], {'error': 'ValueError: Boom!'})
+
+    def test_run_with_action_event(self):
+        wf_def = fixture_loader.get_fixture_content('native/sequential.yaml', 'workflows', raw=True)
+        conductor = self.get_conductor(wf_def, inputs={'name': 'Stanley'})
+
+        def fail(message=None):
+            return events.ActionExecutionEvent(statuses.FAILED, 'Nope')
+
+        pool_runner.run(conductor, {'core.echo': fail})
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.FAILED)
+
+    def test_run_with_delay(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            delay: 1
+            action: core.noop
+        """
+
+        conductor = self.get_conductor(wf_def)
+
+        start = time.time()
+        runner = pool_runner.run(conductor, {'core.noop': noop})
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertGreaterEqual(time.time() - start, 0.9)
+        self.assertEqual(runner.get_metrics()['tasks_delayed'], 1)
+
+    def test_pause_and_resume(self):
+        wf_def = fixture_loader.get_fixture_content('native/sequential.yaml', 'workflows', raw=True)
+        conductor = self.get_conductor(wf_def, inputs={'name': 'Stanley'})
+
+        with pool_runner.PoolRunner(conductor, {}) as runner:
+            def pause(message=None):
+                runner.pause()
+                time.sleep(0.05)
+                return message
+
+            # The action requests the pause and the task completes before the workflow pauses.
+            runner.actions = {'core.echo': pause}
+            self.assertEqual(runner.run(), statuses.PAUSED)
+            self.assertEqual(conductor.get_task_state_entry('task1', 0)['status'], 'succeeded')
+            self.assertIsNone(conductor.get_task_state_entry('task2', 0))
+
+            runner.actions = {'core.echo': echo}
+            self.assertEqual(runner.run(), statuses.SUCCEEDED)
+
+    def test_cancel(self):
+        wf_def = """
+        version: 1.0
+
+        vars:
+          - xs: <% range(4).select(str($)) %>
+
+        tasks:
+          task1:
+            with: <% ctx(xs) %>
+            action: core.echo message=<% item() %>
+        """
+
+        conductor = self.get_conductor(wf_def)
+
+        with pool_runner.PoolRunner(conductor, {}, max_workers=1) as runner:
+            def cancel(message=None):
+                runner.cancel()
+                time.sleep(0.05)
+                return message
+
+            # The items that are still queued in the pool are canceled.
+            runner.actions = {'core.echo': cancel}
+            self.assertEqual(runner.run(), statuses.CANCELED)
+
+        metrics = runner.get_metrics()
+        self.assertEqual(metrics['actions_succeeded'], 1)
+        self.assertEqual(metrics['actions_canceled'], 3)
@@ -0,0 +1,205 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import unittest
+
+from orquesta import conducting
+from orquesta.runners import simulation as sim_runner
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.fixtures import loader as fixture_loader
+
+
+def echo(action_spec):
+    return action_spec['input']['message']
+
+
+class SimulationRunnerTest(unittest.TestCase):
+
+    def get_spec(self, wf_def):
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        return spec
+
+    def get_fixture_spec(self, wf_name):
+        wf_def = fixture_loader.get_fixture_content(
+            'native/%s.yaml' % wf_name,
+            'workflows',
+            raw=True
+        )
+
+        return self.get_spec(wf_def)
+
+    def get_conductor(self, wf_name, inputs=None):
+        return conducting.WorkflowConductor(self.get_fixture_spec(wf_name), inputs=inputs)
+
+    def test_run_sequential(self):
+        conductor = self.get_conductor('sequential', inputs={'name': 'Stanley'})
+
+        runner = sim_runner.run(
+            conductor,
+            durations={'core.echo': 2.0},
+            results={'core.echo': echo}
+        )
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        expected_output = {'greeting': 'Stanley, All your base are belong to us!'}
+        self.assertDictEqual(conductor.get_workflow_output(), expected_output)
+
+        report = runner.get_report()
+        self.assertEqual(report['makespan'], 6.0)
+        self.assertEqual(report['peak_parallelism'], 1)
+        self.assertEqual(report['actions'], 3)
+        self.assertEqual(report['task_latency']['count'], 3)
+        self.assertEqual(report['task_latency']['p99'], 2.0)
+
+    def test_run_parallel_branches(self):
+        conductor = self.get_conductor('join-context')
+
+        runner = sim_runner.run(conductor, default_duration=1.0)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+        # The longest path has four tasks and the four branches run in parallel.
+        report = runner.get_report()
+        self.assertEqual(report['makespan'], 4.0)
+        self.assertEqual(report['peak_parallelism'], 4)
+        self.assertEqual(report['actions'], 10)
+
+    def test_run_with_workers(self):
+        conductor = self.get_conductor('join-context')
+
+        runner = sim_runner.run(conductor, default_duration=1.0, workers=1)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+        # The actions wait for the worker so the latency of the tasks includes the wait.
+        report = runner.get_report()
+        self.assertEqual(report['makespan'], 10.0)
+        self.assertEqual(report['peak_parallelism'], 1)
+        self.assertGreater(report['task_latency']['max'], 1.0)
+
+    def test_run_with_items_concurrency(self):
+        members = ['Lakshmi', 'Lindsay', 'Tomaz', 'Matt', 'Drew', 'Kirk', 'Spock', 'Uhura']
+        conductor = self.get_conductor('with-items-concurrency', inputs={'members': members})
+
+        runner = sim_runner.run(conductor, default_duration=1.0)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+        report = runner.get_report()
+        self.assertEqual(report['makespan'], 4.0)
+        self.assertEqual(report['peak_parallelism'], 2)
+        self.assertDictEqual(report['tasks']['task1'], sim_runner.get_summary([4.0]))
+
+    def test_run_with_delay(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            delay: 5
+            action: core.noop
+        """
+
+        conductor = conducting.WorkflowConductor(self.get_spec(wf_def))
+
+        runner = sim_runner.run(conductor, default_duration=1.0)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertEqual(runner.get_makespan(), 6.0)
+        self.assertEqual(runner.get_metrics()['tasks_delayed'], 1)
+
+    def test_run_with_failures(self):
+        conductor = self.get_conductor('sequential', inputs={'name': 'Stanley'})
+
+        runner = sim_runner.run(conductor, default_duration=1.0, failures={'core.echo': 1.0})
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.FAILED)
+        self.assertEqual(runner.get_makespan(), 1.0)
+        self.assertEqual(runner.get_metrics()['actions_failed'], 1)
+
+    def test_simulation_conductor(self):
+        members = ['Lakshmi', 'Lindsay', 'Tomaz', 'Matt', 'Drew', 'Kirk', 'Spock', 'Uhura']
+        fixtures = ['cycles', 'join-context', 'splits-mixed', 'with-items-concurrency']
+
+        kwargs = {
+            'seed': 1,
+            'default_duration': sim_runner.exponential(1.0),
+            'failures': {'core.noop': 0.2},
+            'workers': 2
+        }
+
+        # The simulation conductor reads the workflow state in place to evaluate the expressions
+        # instead of a copy so the run must be the same as the run of the workflow conductor.
+        for wf_name in fixtures:
+            spec = self.get_fixture_spec(wf_name)
+            conductors = [
+                conducting.WorkflowConductor(spec, inputs={'members': members}),
+                sim_runner.SimulationConductor(spec, inputs={'members': members})
+            ]
+
+            reports = [sim_runner.run(conductor, **kwargs).get_report() for conductor in conductors]
+
+            self.assertDictEqual(reports[1], reports[0])
+            self.assertDictEqual(conductors[1].serialize(), conductors[0].serialize())
+
+    def test_distributions(self):
+        rng = random.Random(1)
+
+        self.assertEqual(sim_runner.constant(2.0)(rng), 2.0)
+        self.assertEqual(sim_runner.get_distribution(3)(rng), 3)
+        self.assertEqual(sim_runner.get_distribution(None)(rng), 0.0)
+
+        samples = [sim_runner.uniform(1.0, 2.0)(rng) for i in range(0, 1000)]
+        self.assertTrue(all(1.0 <= x <= 2.0 for x in samples))
+
+        for dist in [sim_runner.exponential(2.0), sim_runner.lognormal(2.0, 0.5)]:
+            samples = [dist(rng) for i in range(0, 10000)]
+            self.assertAlmostEqual(sum(samples) / len(samples), 2.0, delta=0.1)
+
+        samples = [sim_runner.normal(0.0, 1.0)(rng) for i in range(0, 1000)]
+        self.assertTrue(all(x >= 0.0 for x in samples))
+
+    def test_get_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        random.shuffle(values)
+
+        self.assertEqual(sim_runner.get_percentile(values, 50), 50.0)
+        self.assertEqual(sim_runner.get_percentile(values, 99), 99.0)
+        self.assertEqual(sim_runner.get_percentile(values, 100), 100.0)
+        self.assertEqual(sim_runner.get_percentile(values, 0), 1.0)
+        self.assertEqual(sim_runner.get_percentile([], 50), 0.0)
+
+    def test_simulate(self):
+        spec = self.get_fixture_spec('join-context')
+
+        kwargs = {
+            'runs': 20,
+            'seed': 1,
+            'default_duration': sim_runner.exponential(1.0),
+            'workers': 2
+        }
+
+        report = sim_runner.simulate(spec, **kwargs)
+
+        self.assertEqual(report['runs'], 20)
+        self.assertDictEqual(report['statuses'], {statuses.SUCCEEDED: 20})
+        self.assertEqual(report['makespan']['count'], 20)
+        self.assertEqual(report['peak_parallelism']['max'], 2)
+        self.assertEqual(report['task_latency']['count'], 200)
+        self.assertLessEqual(report['makespan']['p50'], report['makespan']['p99'])
+
+        # The same seed produces the same report.
+        self.assertDictEqual(sim_runner.simulate(spec, **kwargs), report)
@@ -146,3 +146,8 @@ class WorkflowSpecTest(test_base.MistralWorkflowSpecTest):
         wf_spec = self.get_wf_spec(wf_name)
 
         self.assertTrue(wf_spec.tasks.in_cycle('task1'))
+
+    def test_inspect_context_with_cycles(self):
+        for wf_name in ['cycle', 'cycles']:
+            wf_spec = self.get_wf_spec(wf_name)
+            self.assertDictEqual(wf_spec.inspect(), {})
@@ -109,6 +109,77 @@ class TaskSpecTest(test_base.OrchestraWorkflowSpecTest):
 
         self.assertDictEqual(wf_spec.inspect(), expected_errors)
 
+    def test_priority_bad_syntax(self):
+        wf_def = """
+            version: 1.0
+            description: A basic workflow with a priority in task.
+            tasks:
+              task1:
+                priority: 1.5
+                action: core.noop
+        """
+
+        expected_errors = {
+            'syntax': [
+                {
+                    'message': '1.5 is not valid under any of the given schemas',
+                    'schema_path': (
+                        'properties.tasks.patternProperties.^\\w+$.'
+                        'properties.priority.oneOf'
+                    ),
+                    'spec_path': 'tasks.task1.priority'
+                }
+            ]
+        }
+
+        wf_spec = self.instantiate(wf_def)
+
+        self.assertDictEqual(wf_spec.inspect(), expected_errors)
+
+    def test_priority(self):
+        wf_def = """
+            version: 1.0
+            description: A basic workflow with a priority in task.
+            tasks:
+              task1:
+                priority: -10
+                action: core.noop
+        """
+
+        wf_spec = self.instantiate(wf_def)
+
+        self.assertDictEqual(wf_spec.inspect(), {})
+
+        task1 = wf_spec.tasks['task1']
+
+        self.assertEqual(task1.priority, -10)
+
+    def test_priority_with_bad_vars(self):
+        wf_def = """
+            version: 1.0
+            description: A basic workflow with a priority in task.
+            tasks:
+              task1:
+                priority: <% ctx().priority %>
+                action: core.noop
+        """
+
+        expected_errors = {
+            'context': [
+                {
+                    'type': 'yaql',
+                    'expression': '<% ctx().priority %>',
+                    'message': 'Variable "priority" is referenced before assignment.',
+                    'schema_path': 'properties.tasks.patternProperties.^\\w+$.properties.priority',
+                    'spec_path': 'tasks.task1.priority'
+                }
+            ]
+        }
+
+        wf_spec = self.instantiate(wf_def)
+
+        self.assertDictEqual(wf_spec.inspect(), expected_errors)
+
     def test_with_items_bad_syntax(self):
         wf_def = """
             version: 1.0
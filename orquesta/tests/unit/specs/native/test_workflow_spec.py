@@ -198,3 +198,157 @@ class WorkflowSpecTest(test_base.OrchestraWorkflowSpecTest):
         self.assertTrue(wf_spec.tasks.in_cycle('task3'))
         self.assertTrue(wf_spec.tasks.in_cycle('task4'))
         self.assertTrue(wf_spec.tasks.in_cycle('task5'))
+
+    def test_in_cycle_of_self(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            action: core.noop
+            next:
+              - when: <% failed() %>
+                do: task1
+              - when: <% succeeded() %>
+                do: task2
+          task2:
+            action: core.noop
+            next:
+              - do: task3, fail
+          task3:
+            action: core.noop
+        """
+
+        wf_spec = native_specs.WorkflowSpec(wf_def)
+
+        self.assertTrue(wf_spec.tasks.has_cycles())
+        self.assertTrue(wf_spec.tasks.in_cycle('task1'))
+        self.assertFalse(wf_spec.tasks.in_cycle('task2'))
+        self.assertFalse(wf_spec.tasks.in_cycle('task3'))
+        self.assertFalse(wf_spec.tasks.in_cycle('fail'))
+
+    def test_get_next_and_prev_tasks(self):
+        wf_name = 'cycles'
+        wf_spec = self.get_wf_spec(wf_name)
+
+        self.assertListEqual(
+            wf_spec.tasks.get_next_tasks('task2'),
+            [
+                ('task3', '<% succeeded() and not ctx().proceed %>', 0),
+                ('task5', '<% succeeded() and ctx().proceed %>', 1)
+            ]
+        )
+
+        self.assertListEqual(
+            wf_spec.tasks.get_prev_tasks('task2'),
+            [
+                ('task1', '<% succeeded() %>', 0),
+                ('task4', '<% succeeded() %>', 0)
+            ]
+        )
+
+        self.assertListEqual(wf_spec.tasks.get_prev_tasks('prep'), [])
+        self.assertListEqual(wf_spec.tasks.get_next_tasks('noop'), [])
+        self.assertRaises(KeyError, wf_spec.tasks.get_next_tasks, 'task9')
+
+        # The returned lists are copies and changes do not affect the spec.
+        wf_spec.tasks.get_next_tasks('task2').pop()
+        wf_spec.tasks.get_prev_tasks('task2').pop()
+        self.assertEqual(len(wf_spec.tasks.get_next_tasks('task2')), 2)
+        self.assertEqual(len(wf_spec.tasks.get_prev_tasks('task2')), 2)
+
+    def test_concurrency(self):
+        wf_def = """
+        version: 1.0
+
+        input:
+          - concurrency: 10
+
+        concurrency: <% ctx().concurrency %>
+
+        tasks:
+          task1:
+            action: core.noop
+        """
+
+        wf_spec = native_specs.WorkflowSpec(wf_def)
+
+        self.assertDictEqual(wf_spec.inspect(), {})
+        self.assertEqual(wf_spec.concurrency, '<% ctx().concurrency %>')
+
+    def test_concurrency_with_bad_vars(self):
+        wf_def = """
+        version: 1.0
+
+        concurrency: <% ctx().concurrency %>
+
+        tasks:
+          task1:
+            action: core.noop
+        """
+
+        expected_errors = {
+            'context': [
+                {
+                    'type': 'yaql',
+                    'expression': '<% ctx().concurrency %>',
+                    'message': 'Variable "concurrency" is referenced before assignment.',
+                    'schema_path': 'properties.concurrency',
+                    'spec_path': 'concurrency'
+                }
+            ]
+        }
+
+        wf_spec = native_specs.WorkflowSpec(wf_def)
+
+        self.assertDictEqual(wf_spec.inspect(), expected_errors)
+
+    def test_concurrency_bad_syntax(self):
+        wf_def = """
+        version: 1.0
+
+        concurrency: -1
+
+        tasks:
+          task1:
+            action: core.noop
+        """
+
+        expected_errors = {
+            'syntax': [
+                {
+                    'message': '-1 is not valid under any of the given schemas',
+                    'schema_path': 'properties.concurrency.oneOf',
+                    'spec_path': 'concurrency'
+                }
+            ]
+        }
+
+        wf_spec = native_specs.WorkflowSpec(wf_def)
+
+        self.assertDictEqual(wf_spec.inspect(), expected_errors)
+
+    def test_concurrency_zero(self):
+        wf_def = """
+        version: 1.0
+
+        concurrency: 0
+
+        tasks:
+          task1:
+            action: core.noop
+        """
+
+        expected_errors = {
+            'syntax': [
+                {
+                    'message': '0 is not valid under any of the given schemas',
+                    'schema_path': 'properties.concurrency.oneOf',
+                    'spec_path': 'concurrency'
+                }
+            ]
+        }
+
+        wf_spec = native_specs.WorkflowSpec(wf_def)
+
+        self.assertDictEqual(wf_spec.inspect(), expected_errors)
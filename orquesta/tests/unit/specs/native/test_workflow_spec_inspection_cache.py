@@ -0,0 +1,108 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import shutil
+import tempfile
+
+from orquesta import exceptions as exc
+from orquesta.specs import base as spec_base
+from orquesta.specs import native as native_specs
+from orquesta.tests.unit.specs.native import base as test_base
+
+
+WF_DEF = """
+version: 1.0
+
+input:
+  - x
+
+tasks:
+  task1:
+    action: core.echo message=<% ctx().x %>
+    next:
+      - when: <% succeeded() %>
+        publish: y=<% ctx().z %>
+        do: task2
+  task2:
+    action: core.noop
+"""
+
+
+class WorkflowSpecInspectionCacheTest(test_base.OrchestraWorkflowSpecTest):
+
+    def setUp(self):
+        super(WorkflowSpecInspectionCacheTest, self).setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        spec_base.configure_inspection_cache(enabled=True)
+        spec_base.clear_inspection_cache()
+
+    def tearDown(self):
+        spec_base.configure_inspection_cache(enabled=False, max_size=1024, path='')
+        spec_base.clear_inspection_cache()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        super(WorkflowSpecInspectionCacheTest, self).tearDown()
+
+    def test_inspection_cached(self):
+        wf_spec = native_specs.WorkflowSpec(WF_DEF)
+        errors = wf_spec.inspect()
+        self.assertEqual(len(errors['context']), 1)
+
+        # Inspect again with a new instance of the same definition.
+        wf_spec = native_specs.WorkflowSpec(WF_DEF)
+
+        with mock.patch.object(native_specs.WorkflowSpec, '_inspect') as mocked:
+            self.assertDictEqual(wf_spec.inspect(), errors)
+            self.assertRaises(exc.WorkflowInspectionError, wf_spec.inspect, raise_exception=True)
+            mocked.assert_not_called()
+
+        # Changes to the returned errors do not affect the cache.
+        wf_spec.inspect().pop('context')
+        self.assertDictEqual(wf_spec.inspect(), errors)
+
+    def test_inspection_cache_key(self):
+        wf_spec = native_specs.WorkflowSpec(WF_DEF)
+        key = wf_spec.get_inspection_cache_key()
+
+        self.assertEqual(key, native_specs.WorkflowSpec(WF_DEF).get_inspection_cache_key())
+        self.assertNotEqual(key, wf_spec.get_inspection_cache_key(app_ctx={'z': 123}))
+
+        wf_def = WF_DEF.replace('core.noop', 'core.local')
+        self.assertNotEqual(key, native_specs.WorkflowSpec(wf_def).get_inspection_cache_key())
+
+    def test_inspection_cached_by_app_ctx(self):
+        wf_spec = native_specs.WorkflowSpec(WF_DEF)
+        self.assertIn('context', wf_spec.inspect())
+        self.assertDictEqual(wf_spec.inspect(app_ctx={'z': 123}), {})
+        self.assertIn('context', wf_spec.inspect())
+
+    def test_inspection_cache_disabled(self):
+        spec_base.configure_inspection_cache(enabled=False)
+        wf_spec = native_specs.WorkflowSpec(WF_DEF)
+        wf_spec.inspect()
+
+        with mock.patch.object(
+                native_specs.WorkflowSpec, '_inspect', return_value={}) as mocked:
+            self.assertDictEqual(wf_spec.inspect(), {})
+            mocked.assert_called_once_with(app_ctx=None)
+
+    def test_inspection_cached_on_disk(self):
+        spec_base.configure_inspection_cache(path=self.cache_dir)
+        wf_spec = native_specs.WorkflowSpec(WF_DEF)
+        errors = wf_spec.inspect()
+
+        # Clear the in memory cache so the result is read from disk.
+        spec_base.configure_inspection_cache(max_size=16)
+
+        with mock.patch.object(native_specs.WorkflowSpec, '_inspect') as mocked:
+            self.assertDictEqual(native_specs.WorkflowSpec(WF_DEF).inspect(), errors)
+            mocked.assert_not_called()
@@ -0,0 +1,158 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import time
+
+import mock
+
+from orquesta.specs import native as native_specs
+from orquesta.tests.unit.specs.native import base as test_base
+
+
+class WorkflowSpecStressTest(test_base.OrchestraWorkflowSpecTest):
+
+    def _prep_wf_def(self, num_tasks):
+        wf_def = {
+            'version': 1.0,
+            'input': ['x'],
+            'tasks': {}
+        }
+
+        for i in range(1, num_tasks):
+            task_name = 't' + str(i)
+            next_task_name = 't' + str(i + 1)
+
+            wf_def['tasks'][task_name] = {
+                'action': 'core.echo message=<% ctx().x %>',
+                'next': [
+                    {
+                        'when': '<% succeeded() %>',
+                        'publish': [{'y' + str(i % 10): '<% result() %>'}],
+                        'do': next_task_name
+                    }
+                ]
+            }
+
+        task_name = 't' + str(num_tasks)
+        wf_def['tasks'][task_name] = {'action': 'core.noop'}
+
+        return wf_def
+
+    def _time_inspection(self, num_tasks, num_runs=2):
+        wf_spec = native_specs.WorkflowSpec(self._prep_wf_def(num_tasks))
+        runtimes = []
+
+        for i in range(0, num_runs):
+            start = time.time()
+            self.assertDictEqual(wf_spec.inspect(), {})
+            runtimes.append(time.time() - start)
+
+        return min(runtimes)
+
+    def test_inspection_runtime_function_of_graph_size(self):
+        small_size = 250
+        large_size = small_size * 4
+
+        small_runtime = self._time_inspection(small_size)
+        large_runtime = self._time_inspection(large_size)
+
+        # The runtime should grow close to linear with the number of tasks. A quadratic
+        # growth would result in the runtime of the large graph being about 16 times
+        # of the runtime of the small graph.
+        self.assertLess(large_runtime, small_runtime * 10)
+
+    def _prep_split_join_wf_def(self, num_branches):
+        branches = ['b' + str(i) for i in range(0, num_branches)]
+        join_action = 'core.echo message=<% ctx().y0 %><% ctx().y' + str(num_branches - 1) + ' %>'
+
+        wf_def = {
+            'version': 1.0,
+            'input': ['x'],
+            'tasks': {
+                'init': {
+                    'action': 'core.noop',
+                    'next': [{'do': branches}]
+                },
+                'join': {
+                    'join': 'all',
+                    'action': join_action,
+                    'next': [{'do': 'task1'}]
+                },
+                'task1': {
+                    'action': 'core.echo message=<% ctx().y1 %>',
+                    'next': [{'do': 'task2'}]
+                },
+                'task2': {
+                    'action': 'core.noop'
+                }
+            }
+        }
+
+        for i, task_name in enumerate(branches):
+            wf_def['tasks'][task_name] = {
+                'action': 'core.echo message=<% ctx().x %>',
+                'next': [{'publish': [{'y' + str(i): '<% result() %>'}], 'do': 'join'}]
+            }
+
+        return wf_def
+
+    def _count_visits(self, visits, method, key):
+        def wrapper(*args, **kwargs):
+            visits[key(*args, **kwargs)] += 1
+            return method(*args, **kwargs)
+
+        return wrapper
+
+    def test_inspection_visits_split_join_tasks_once(self):
+        num_branches = 50
+        num_tasks = num_branches + 4
+        wf_spec = native_specs.WorkflowSpec(self._prep_split_join_wf_def(num_branches))
+        parent = {'spec_path': 'tasks', 'schema_path': 'properties.tasks', 'ctx': ['x']}
+        task_spec_cls = native_specs.TaskSpec
+        task_mapping_cls = native_specs.TaskMappingSpec
+
+        # The join task is inspected once with the context merged from all of the branches.
+        visits = collections.Counter()
+
+        inspect_context = self._count_visits(
+            visits,
+            task_spec_cls.inspect_context,
+            lambda task_spec, parent=None: parent['spec_path']
+        )
+
+        with mock.patch.object(task_spec_cls, 'inspect_context', inspect_context):
+            errors, ctx = wf_spec.tasks.inspect_context(parent=parent)
+
+        self.assertListEqual(errors, [])
+        self.assertIn('y' + str(num_branches - 1), ctx)
+        self.assertEqual(len(visits), num_tasks)
+        self.assertEqual(max(visits.values()), 1)
+
+        # Each task is processed once when identifying undefined and unreachable tasks.
+        for detect, method_name in [('detect_unreachable_tasks', 'get_next_tasks'),
+                                    ('detect_undefined_tasks', 'get_task')]:
+            visits = collections.Counter()
+
+            method = self._count_visits(
+                visits,
+                getattr(task_mapping_cls, method_name),
+                lambda task_mapping_spec, task_name: task_name
+            )
+
+            with mock.patch.object(task_mapping_cls, method_name, method):
+                self.assertListEqual(getattr(wf_spec.tasks, detect)(parent=parent), [])
+
+            self.assertEqual(len(visits), num_tasks)
+            self.assertEqual(max(visits.values()), 1)
+
+        self.assertDictEqual(wf_spec.inspect(), {})
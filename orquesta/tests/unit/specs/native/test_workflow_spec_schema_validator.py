@@ -0,0 +1,91 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import glob
+import os
+
+import mock
+
+from orquesta.specs import native as native_specs
+from orquesta.tests.fixtures import loader as fixture_loader
+from orquesta.tests.unit.specs.native import base as test_base
+from orquesta.utils import schema as schema_util
+
+
+INVALID_WF_DEFS = [
+    {'tasks': {}},
+    {'input': 'x', 'tasks': {'task1': {'action': 'core.noop'}}},
+    {'tasks': {'task1': {'action': 'core.noop', 'next': [{'when': 123}]}}},
+    {'tasks': {'task1': {'action': 'core.noop', 'foobar': 'fubar'}}},
+    {'tasks': {'task1': {'delay': -1, 'action': 'core.noop'}}},
+    {'tasks': {'task1': {'with': {'items': 'x in <% ctx().xs %>', 'concurrency': [1]}}}},
+    {'vars': [{'x': 1}, {'x': 2}, 'y', 'y'], 'tasks': {'task1': {'action': 'core.noop'}}}
+]
+
+
+class WorkflowSpecSchemaValidatorTest(test_base.OrchestraWorkflowSpecTest):
+
+    def tearDown(self):
+        schema_util.set_validator_backend('compiled')
+        super(WorkflowSpecSchemaValidatorTest, self).tearDown()
+
+    def _get_fixture_wf_defs(self):
+        path = os.path.join(fixture_loader.get_workflow_fixtures_base_path(), 'native', '*.yaml')
+
+        return [
+            fixture_loader.get_fixture_content('native/' + os.path.basename(p), 'workflows')
+            for p in sorted(glob.glob(path))
+        ]
+
+    def _inspect_syntax(self, wf_defs, backend):
+        schema_util.set_validator_backend(backend)
+
+        return [native_specs.WorkflowSpec(wf_def).inspect_syntax() for wf_def in wf_defs]
+
+    def test_validator_backend(self):
+        schema_util.set_validator_backend('compiled')
+        validator = native_specs.WorkflowSpec.get_schema_validator()
+        self.assertIsInstance(validator, schema_util.CompiledValidator)
+
+        schema_util.set_validator_backend('jsonschema')
+        validator = native_specs.WorkflowSpec.get_schema_validator()
+        self.assertNotIsInstance(validator, schema_util.CompiledValidator)
+
+    def test_same_errors_across_backends(self):
+        wf_defs = self._get_fixture_wf_defs() + INVALID_WF_DEFS
+
+        expected = self._inspect_syntax(wf_defs, 'jsonschema')
+        actual = self._inspect_syntax(wf_defs, 'compiled')
+
+        self.assertListEqual(actual, expected)
+
+        # Ensure the invalid definitions are actually reported with errors.
+        for errors in expected[-len(INVALID_WF_DEFS):]:
+            self.assertGreater(len(errors), 0)
+
+    def test_valid_definitions_skip_jsonschema(self):
+        wf_defs = self._get_fixture_wf_defs() + INVALID_WF_DEFS
+        wf_specs = [native_specs.WorkflowSpec(wf_def) for wf_def in wf_defs]
+
+        schema_util.set_validator_backend('compiled')
+        validator = native_specs.WorkflowSpec.get_schema_validator()
+        iter_errors = validator._validator.iter_errors
+
+        # The jsonschema validator is only used to report the errors of invalid definitions.
+        with mock.patch.object(validator, '_validator') as jsonschema_validator:
+            jsonschema_validator.iter_errors.side_effect = iter_errors
+            errors = [wf_spec.inspect_syntax() for wf_spec in wf_specs]
+
+        invalid_errors = errors[-len(INVALID_WF_DEFS):]
+
+        self.assertTrue(all(invalid_errors))
+        self.assertEqual(jsonschema_validator.iter_errors.call_count, len(INVALID_WF_DEFS))
@@ -670,3 +670,151 @@ class WorkflowSpecVarsValidationTest(test_base.OrchestraWorkflowSpecTest):
         wf_spec = self.instantiate(wf_def)
 
         self.assertDictEqual(wf_spec.inspect(), {})
+
+    def test_vars_in_task_with_multiple_inbounds(self):
+        wf_def = """
+            version: 1.0
+            description: A task reached by more than one branch without a join.
+            output:
+              - y: <% ctx().y %>
+            tasks:
+              task1:
+                action: core.noop
+                next:
+                  - when: <% succeeded() %>
+                    publish: x=1
+                    do: task2
+                  - when: <% failed() %>
+                    publish: y=1
+                    do: task2
+              task2:
+                action: core.echo message=<% ctx().x %>
+                next:
+                  - do: task3
+              task3:
+                action: core.echo message=<% ctx().y %>
+        """
+
+        wf_spec = self.instantiate(wf_def)
+
+        # The task is inspected with the context of each inbound branch. The variables
+        # published by any of the branches are available to the workflow output.
+        expected_errors = {
+            'context': [
+                {
+                    'type': 'yaql',
+                    'expression': '<% ctx().x %>',
+                    'message': 'Variable "x" is referenced before assignment.',
+                    'schema_path': 'properties.tasks.patternProperties.^\\w+$.properties.input',
+                    'spec_path': 'tasks.task2.input'
+                },
+                {
+                    'type': 'yaql',
+                    'expression': '<% ctx().y %>',
+                    'message': 'Variable "y" is referenced before assignment.',
+                    'schema_path': 'properties.tasks.patternProperties.^\\w+$.properties.input',
+                    'spec_path': 'tasks.task3.input'
+                }
+            ]
+        }
+
+        self.assertDictEqual(wf_spec.inspect(), expected_errors)
+
+    def test_vars_in_join_task_with_unequal_branches(self):
+        wf_def = """
+            version: 1.0
+            description: A join task reached by branches of different length.
+            tasks:
+              init:
+                action: core.noop
+                next:
+                  - do: task1, task2
+              task1:
+                action: core.noop
+                next:
+                  - publish: x=1
+                    do: task3
+              task3:
+                action: core.noop
+                next:
+                  - do: task4
+              task4:
+                action: core.noop
+                next:
+                  - do: join
+              task2:
+                action: core.noop
+                next:
+                  - publish: y=1
+                    do: join
+              join:
+                join: all
+                action: core.echo message="<% ctx().x %> <% ctx().y %>"
+        """
+
+        wf_spec = self.instantiate(wf_def)
+
+        # The join task is inspected as each inbound branch reaches it so
+        # the variable from the longer branch is reported as undefined.
+        expected_errors = {
+            'context': [
+                {
+                    'type': 'yaql',
+                    'expression': '<% ctx().x %> <% ctx().y %>',
+                    'message': 'Variable "x" is referenced before assignment.',
+                    'schema_path': 'properties.tasks.patternProperties.^\\w+$.properties.input',
+                    'spec_path': 'tasks.join.input'
+                }
+            ]
+        }
+
+        self.assertDictEqual(wf_spec.inspect(), expected_errors)
+
+    def test_vars_in_join_task_in_cycle(self):
+        wf_def = """
+            version: 1.0
+            description: A join task in a cycle.
+            vars:
+              - count: 0
+            tasks:
+              init:
+                action: core.noop
+                next:
+                  - do: task1, task2
+              task1:
+                action: core.noop
+                next:
+                  - publish: x=1
+                    do: join
+              task2:
+                action: core.noop
+                next:
+                  - publish: y=1
+                    do: join
+              join:
+                join: all
+                action: core.echo message="<% ctx().x %> <% ctx().y %> <% ctx().z %>"
+                next:
+                  - when: <% ctx().count < 3 %>
+                    publish: count=<% ctx().count + 1 %>
+                    do: loop
+              loop:
+                action: core.noop
+                next:
+                  - publish: z=1
+                    do: task1, task2
+        """
+
+        wf_spec = self.instantiate(wf_def)
+
+        # The join task is inspected once for each inbound branch and the tasks are not
+        # inspected again when the cycle returns to them.
+        error = {
+            'type': 'yaql',
+            'expression': '<% ctx().x %> <% ctx().y %> <% ctx().z %>',
+            'message': 'Variable "z" is referenced before assignment.',
+            'schema_path': 'properties.tasks.patternProperties.^\\w+$.properties.input',
+            'spec_path': 'tasks.join.input'
+        }
+
+        self.assertDictEqual(wf_spec.inspect(), {'context': [error, error]})
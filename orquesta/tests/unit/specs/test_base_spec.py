@@ -257,6 +257,41 @@ class SpecTest(unittest.TestCase):
         # Test non-existent attribute.
         self.assertRaises(AttributeError, getattr, spec_obj, 'attr9')
 
+    def test_spec_immutable(self):
+        spec = {
+            'name': 'mock',
+            'version': '1.0',
+            'attr1': 'foobar',
+            'attr5': {
+                'attr1': {
+                    'attr1': 'wunderbar'
+                }
+            },
+            'attr6': {
+                'attr1': {
+                    'attr1': {
+                        'attr1': 'wunderbar'
+                    }
+                }
+            }
+        }
+
+        spec_obj = test_specs.MockSpec(spec)
+
+        self.assertRaises(exc.SpecImmutableError, setattr, spec_obj, 'attr1', 'fubar')
+        self.assertRaises(exc.SpecImmutableError, setattr, spec_obj, 'attr9', 'fubar')
+        self.assertRaises(exc.SpecImmutableError, delattr, spec_obj, 'attr5')
+        self.assertRaises(exc.SpecImmutableError, setattr, spec_obj.attr5.attr1, 'attr1', 'x')
+        self.assertRaises(exc.SpecImmutableError, setattr, spec_obj.attr6, 'attr1', None)
+
+        # Immutable error is also an attribute error.
+        self.assertRaises(AttributeError, setattr, spec_obj, 'attr1', 'fubar')
+
+        self.assertEqual(spec_obj.attr1, 'foobar')
+        self.assertEqual(spec_obj.attr5.attr1.attr1, 'wunderbar')
+        self.assertIsNone(spec_obj.attr2)
+        self.assertIsNone(spec_obj.attr6.attr2)
+
     def test_spec_serialize(self):
         spec = {
             'name': 'mock',
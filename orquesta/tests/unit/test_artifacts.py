@@ -0,0 +1,162 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import shutil
+import tempfile
+
+import mock
+
+import orquesta
+from orquesta import artifacts
+from orquesta import conducting
+from orquesta import exceptions as exc
+from orquesta.expressions import base as expr_base
+from orquesta.expressions import yql as yaql_expr
+from orquesta import statuses
+from orquesta.tests.unit import base as test_base
+
+
+WF_DEF = """
+version: 1.0
+
+input:
+  - x
+
+vars:
+  - y: <% ctx().x %>
+
+tasks:
+  task1:
+    action: core.noop
+    next:
+      - when: <% succeeded() %>
+        publish: z=<% ctx().y %>
+        do: task2
+  task2:
+    action: core.echo message={{ ctx().z }}
+
+output:
+  - z: <% ctx().z %>
+"""
+
+
+class WorkflowArtifactTest(test_base.WorkflowConductorTest):
+
+    def setUp(self):
+        super(WorkflowArtifactTest, self).setUp()
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        super(WorkflowArtifactTest, self).tearDown()
+
+    def test_build(self):
+        artifact = artifacts.WorkflowArtifact.build(WF_DEF)
+        data = artifact.serialize()
+
+        self.assertEqual(data['format'], artifacts.ARTIFACT_FORMAT)
+        self.assertEqual(data['orquesta'], orquesta.__version__)
+        self.assertEqual(data['digest'], artifact.spec.get_digest())
+        self.assertDictEqual(data['spec'], artifact.spec.serialize())
+        self.assertDictEqual(data['graph'], artifact.graph.serialize())
+        self.assertDictEqual(data['topology'], artifact.graph.get_topology())
+
+        expected_expressions = [
+            '<% ctx().x %>',
+            '<% ctx().z %>',
+            '<% succeeded() %>',
+            'core.echo message={{ ctx().z }}',
+            'z=<% ctx().y %>'
+        ]
+
+        self.assertListEqual(data['expressions'], expected_expressions)
+
+        # Ensure the artifact is serializable to JSON.
+        self.assertDictEqual(json.loads(json.dumps(data)), data)
+
+    def test_build_with_errors(self):
+        wf_def = WF_DEF.replace('do: task2', 'do: task3')
+
+        self.assertRaises(
+            exc.WorkflowInspectionError,
+            artifacts.WorkflowArtifact.build,
+            wf_def
+        )
+
+    def test_dump_and_load(self):
+        path = os.path.join(self.temp_dir, 'sequential.json')
+        artifact = artifacts.WorkflowArtifact.build(WF_DEF)
+        artifacts.dump(artifact, path)
+
+        yaql_expr.YAQLEvaluator._parsed_exprs.clear()
+        engine = yaql_expr.YAQLEvaluator.get_engine()
+
+        with mock.patch.object(yaql_expr.YAQLEvaluator, '_engine', wraps=engine) as engine:
+            loaded = artifacts.load(path)
+
+            self.assertEqual(engine.call_count, 4)
+
+        self.assertDictEqual(loaded.serialize(), artifact.serialize())
+        self.assertIsNotNone(loaded.graph._topology)
+
+        # Ensure the expressions are parsed on load and not again on evaluation.
+        with mock.patch.object(yaql_expr.YAQLEvaluator, '_engine') as engine:
+            self.assertEqual(expr_base.evaluate('<% ctx().x %>', {'x': 123}), 123)
+            engine.assert_not_called()
+
+    def test_load_unsupported(self):
+        data = artifacts.WorkflowArtifact.build(WF_DEF).serialize()
+
+        data['format'] = artifacts.ARTIFACT_FORMAT + 1
+        self.assertRaises(ValueError, artifacts.WorkflowArtifact.deserialize, data)
+
+        data['format'] = artifacts.ARTIFACT_FORMAT
+        data['orquesta'] = '0.0'
+        self.assertRaises(ValueError, artifacts.WorkflowArtifact.deserialize, data)
+
+    def test_load_digest_mismatch(self):
+        data = artifacts.WorkflowArtifact.build(WF_DEF).serialize()
+        data['spec']['spec']['tasks']['task2']['action'] = 'core.noop'
+
+        self.assertRaises(ValueError, artifacts.WorkflowArtifact.deserialize, data)
+
+        data = artifacts.WorkflowArtifact.build(WF_DEF).serialize()
+        data.pop('digest')
+
+        self.assertRaises(ValueError, artifacts.WorkflowArtifact.deserialize, data)
+
+    def test_run_workflow(self):
+        path = os.path.join(self.temp_dir, 'sequential.json')
+        artifacts.dump(artifacts.WorkflowArtifact.build(WF_DEF), path)
+        artifact = artifacts.load(path)
+
+        conductor = artifact.get_conductor(inputs={'x': 'foobar'})
+        self.assertIs(conductor.graph, artifact.graph)
+
+        conductor.request_workflow_status(statuses.RUNNING)
+        self.forward_task_statuses(conductor, 'task1', [statuses.RUNNING, statuses.SUCCEEDED])
+        self.forward_task_statuses(conductor, 'task2', [statuses.RUNNING, statuses.SUCCEEDED])
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertDictEqual(conductor.get_workflow_output(), {'z': 'foobar'})
+
+    def test_conductor_with_invalid_graph(self):
+        artifact = artifacts.WorkflowArtifact.build(WF_DEF)
+
+        self.assertRaises(
+            ValueError,
+            conducting.WorkflowConductor,
+            artifact.spec,
+            graph=artifact.graph.serialize()
+        )
@@ -0,0 +1,178 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import mock
+
+from orquesta import artifacts
+from orquesta import bootstrap
+from orquesta.expressions import jinja as jinja_expr
+from orquesta.expressions import yql as yaql_expr
+from orquesta.specs import native as native_specs
+from orquesta.tests.fixtures import loader as fixture_loader
+
+
+# Run a workflow to completion in a child process forked from a fresh interpreter and
+# report the modules imported and the expressions parsed by the child. If warm, the parent
+# calls warmup before fork.
+CHILD_SCRIPT = """
+import json
+import os
+import sys
+
+from orquesta import bootstrap
+from orquesta import conducting
+from orquesta import events
+from orquesta.expressions import jinja as jinja_expr
+from orquesta.expressions import yql as yaql_expr
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+
+
+
+def count_parsed():
+    yaql_exprs = yaql_expr.YAQLEvaluator._parsed_exprs
+    jinja_exprs = jinja_expr.JinjaEvaluator._compiled_exprs
+
+    return len(yaql_exprs) + len(jinja_exprs)
+
+
+warm, path = sys.argv[1] == 'warm', sys.argv[2]
+
+with open(path, 'r') as f:
+    definition = f.read()
+
+compiled = bootstrap.warmup([definition]) if warm else []
+
+r, w = os.pipe()
+pid = os.fork()
+
+if pid == 0:
+    os.close(r)
+    modules = set(sys.modules.keys())
+    parsed = count_parsed()
+
+    if warm:
+        conductor = compiled[0].get_conductor(inputs={'name': 'Stanley'})
+    else:
+        spec = native_specs.WorkflowSpec(definition)
+        spec.inspect(raise_exception=True)
+        conductor = conducting.WorkflowConductor(spec, inputs={'name': 'Stanley'})
+
+    conductor.request_workflow_status(statuses.RUNNING)
+    next_tasks = conductor.get_next_tasks()
+
+    while next_tasks:
+        for task in next_tasks:
+            for status in [statuses.RUNNING, statuses.SUCCEEDED]:
+                event = events.ActionExecutionEvent(status, result='foobar')
+                conductor.update_task_state(task['id'], task['route'], event)
+
+        next_tasks = conductor.get_next_tasks()
+
+    result = {
+        'status': conductor.get_workflow_status(),
+        'modules': sorted(set(sys.modules.keys()) - modules),
+        'parsed': count_parsed() - parsed
+    }
+
+    with os.fdopen(w, 'w') as f:
+        f.write(json.dumps(result))
+
+    os._exit(0)
+
+os.close(w)
+
+with os.fdopen(r, 'r') as f:
+    output = f.read()
+
+os.waitpid(pid, 0)
+
+print(output)
+"""
+
+# Modules with heavy dependencies that the child must not import if the parent is warm.
+HEAVY_MODULES = ['jinja2', 'jsonschema', 'networkx', 'yaml', 'yaql']
+
+
+class BootstrapTest(unittest.TestCase):
+
+    def test_warmup(self):
+        wf_def = fixture_loader.get_fixture_content('native/sequential.yaml', 'workflows', raw=True)
+
+        with mock.patch.object(bootstrap, 'freeze') as freeze:
+            compiled = bootstrap.warmup([wf_def])
+            freeze.assert_called_once_with()
+
+        self.assertIsNotNone(jinja_expr.JinjaEvaluator._jinja_env)
+        self.assertIsNotNone(yaql_expr.YAQLEvaluator._engine)
+        self.assertIsNotNone(yaql_expr.YAQLEvaluator._root_ctx)
+        self.assertIsNotNone(native_specs.WorkflowSpec.__dict__.get('_schema_validator'))
+
+        self.assertEqual(len(compiled), 1)
+        self.assertIsInstance(compiled[0], artifacts.WorkflowArtifact)
+        self.assertEqual(compiled[0].spec.get_catalog(), 'native')
+
+    def test_warmup_without_freeze(self):
+        with mock.patch.object(bootstrap, 'freeze') as freeze:
+            self.assertListEqual(bootstrap.warmup(freeze_gc=False), [])
+            freeze.assert_not_called()
+
+    def test_freeze(self):
+        with mock.patch.object(bootstrap, 'gc') as gc:
+            self.assertTrue(bootstrap.freeze())
+            gc.collect.assert_called_once_with()
+            gc.freeze.assert_called_once_with()
+
+        with mock.patch.object(bootstrap, 'gc', mock.MagicMock(spec=['collect'])) as gc:
+            self.assertFalse(bootstrap.freeze())
+            gc.collect.assert_called_once_with()
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'The test requires fork.')
+class BootstrapForkTest(unittest.TestCase):
+
+    def _run(self, mode):
+        path = os.path.join(
+            fixture_loader.get_workflow_fixtures_base_path(),
+            'native/sequential.yaml'
+        )
+
+        output = subprocess.check_output([sys.executable, '-c', CHILD_SCRIPT, mode, path])
+        result = json.loads(output.decode('utf-8'))
+
+        self.assertEqual(result['status'], 'succeeded')
+
+        result['heavy_modules'] = sorted(set(
+            m.split('.')[0] for m in result['modules']
+            if m.split('.')[0] in HEAVY_MODULES
+        ))
+
+        return result
+
+    def test_child_without_warmup(self):
+        result = self._run('cold')
+
+        self.assertIn('yaql', result['heavy_modules'])
+        self.assertGreater(result['parsed'], 0)
+
+    def test_child_with_warmup(self):
+        result = self._run('warm')
+
+        # The dependencies are imported and the expressions are parsed before fork.
+        self.assertListEqual(result['heavy_modules'], [])
+        self.assertEqual(result['parsed'], 0)
@@ -0,0 +1,280 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import mock
+
+import orquesta
+from orquesta import conducting
+from orquesta import events
+from orquesta import exceptions as exc
+from orquesta import hosting
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.fixtures import loader as fixture_loader
+
+
+BENCHMARK_SCRIPT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(orquesta.__file__))),
+    'bin/orquesta-benchmark-host'
+)
+
+
+class HashRingTest(unittest.TestCase):
+
+    def test_empty_ring(self):
+        ring = hosting.HashRing()
+
+        self.assertEqual(len(ring), 0)
+        self.assertRaises(ValueError, ring.get_node, 'wf1')
+
+    def test_distribution(self):
+        ring = hosting.HashRing(nodes=range(0, 4))
+        keys = ['wf%s' % i for i in range(0, 4000)]
+        counts = collections.Counter([ring.get_node(k) for k in keys])
+
+        self.assertListEqual(ring.get_nodes(), [0, 1, 2, 3])
+
+        for node in range(0, 4):
+            self.assertGreater(counts[node], 600)
+
+    def test_minimal_movement(self):
+        ring = hosting.HashRing(nodes=range(0, 4))
+        keys = ['wf%s' % i for i in range(0, 4000)]
+        before = {k: ring.get_node(k) for k in keys}
+
+        ring.add_node(4)
+        after = {k: ring.get_node(k) for k in keys}
+        moved = [k for k in keys if before[k] != after[k]]
+
+        # Only the keys that are taken over by the new node move.
+        self.assertTrue(all([after[k] == 4 for k in moved]))
+        self.assertLess(len(moved), len(keys) / 3)
+
+        ring.remove_node(4)
+        self.assertDictEqual({k: ring.get_node(k) for k in keys}, before)
+
+
+class ConductorHostTest(unittest.TestCase):
+
+    def setUp(self):
+        super(ConductorHostTest, self).setUp()
+        self.wf_def = fixture_loader.get_fixture_content(
+            'native/sequential.yaml',
+            'workflows',
+            raw=True
+        )
+
+        self.spec = native_specs.WorkflowSpec(self.wf_def)
+
+    def get_conductor(self, name):
+        conductor = conducting.WorkflowConductor(self.spec, inputs={'name': name})
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        return conductor
+
+    def get_updates(self, dispatched):
+        return [
+            (
+                d['workflow_id'],
+                d['task_id'],
+                d['route'],
+                events.ActionExecutionEvent(statuses.SUCCEEDED, result=d['input']['message'])
+            )
+            for d in dispatched
+        ]
+
+    def complete(self, host, dispatched):
+        return host.update_task_states(self.get_updates(dispatched))
+
+    def run_to_completion(self, host, dispatched):
+        completed = {}
+
+        while dispatched:
+            result = self.complete(host, dispatched)
+            dispatched = result['dispatched']
+
+            completed.update({
+                k: v for k, v in result['statuses'].items()
+                if v in statuses.COMPLETED_STATUSES
+            })
+
+        return completed
+
+    def test_invalid_shards(self):
+        self.assertRaises(ValueError, hosting.ConductorHost, shards=0)
+
+    def test_run_workflows(self):
+        with hosting.ConductorHost(shards=2) as host:
+            self.assertListEqual(host.get_shards(), [0, 1])
+
+            dispatched = []
+
+            for i in range(0, 20):
+                dispatched.extend(host.add('wf%s' % i, self.get_conductor('wf%s' % i)))
+
+            self.assertEqual(len(dispatched), 20)
+
+            completed = self.run_to_completion(host, dispatched)
+
+            self.assertEqual(len(completed), 20)
+            self.assertSetEqual(set(completed.values()), set([statuses.SUCCEEDED]))
+
+            # Both shards own some of the workflows.
+            stats = host.get_stats()
+            self.assertEqual(sum([s['workflows'] for s in stats.values()]), 20)
+            self.assertTrue(all([s['workflows'] > 0 for s in stats.values()]))
+
+            conductor = host.get_conductor('wf7')
+            expected_output = {'greeting': 'wf7, All your base are belong to us!'}
+            self.assertDictEqual(conductor.get_workflow_output(), expected_output)
+
+            conductor = host.remove('wf7')
+            self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+            self.assertEqual(len(host.get_workflow_ids()), 19)
+
+        self.assertListEqual(host.get_shards(), [])
+
+    def test_errors(self):
+        with hosting.ConductorHost(shards=2) as host:
+            host.add('wf1', self.get_conductor('wf1'))
+
+            self.assertRaises(exc.ConductorHostError, host.get_conductor, 'wf2')
+
+            event = events.ActionExecutionEvent(statuses.SUCCEEDED)
+            result = host.update_task_state('wf2', 'task1', 0, event)
+            self.assertListEqual(result['dispatched'], [])
+            self.assertEqual(len(result['errors']), 1)
+            self.assertEqual(result['errors'][0]['workflow_id'], 'wf2')
+            self.assertEqual(result['errors'][0]['task_id'], 'task1')
+
+            # The shard keeps serving after an error.
+            self.assertEqual(host.get_conductor('wf1').get_workflow_status(), statuses.RUNNING)
+
+    def test_update_errors_keep_dispatched(self):
+        with hosting.ConductorHost(shards=2) as host:
+            dispatched = []
+
+            for i in range(0, 10):
+                dispatched.extend(host.add('wf%s' % i, self.get_conductor('wf%s' % i)))
+
+            # The actions dispatched for the valid updates are returned with the errors.
+            event = events.ActionExecutionEvent(statuses.SUCCEEDED, result='foobar')
+            invalid = [('wf99', 'task1', 0, event), ('wf0', 'foobar', 0, event)]
+            result = host.update_task_states(self.get_updates(dispatched) + invalid)
+
+            self.assertEqual(len(result['dispatched']), 10)
+            errors = sorted(e['workflow_id'] for e in result['errors'])
+            self.assertListEqual(errors, ['wf0', 'wf99'])
+
+            completed = self.run_to_completion(host, result['dispatched'])
+            self.assertEqual(len(completed), 10)
+
+    def test_update_reads_all_shard_replies(self):
+        with hosting.ConductorHost(shards=2) as host:
+            dispatched = []
+
+            for i in range(0, 10):
+                dispatched.extend(host.add('wf%s' % i, self.get_conductor('wf%s' % i)))
+
+            recv = host._recv
+
+            def recv_and_fail(shard_id):
+                shard_result = recv(shard_id)
+
+                if shard_id == 0:
+                    raise exc.ConductorHostError('KeyError: foobar')
+
+                return shard_result
+
+            with mock.patch.object(host, '_recv', side_effect=recv_and_fail):
+                result = self.complete(host, dispatched)
+
+            expected_errors = [
+                {'type': 'error', 'message': 'ConductorHostError: KeyError: foobar', 'shard_id': 0}
+            ]
+
+            self.assertListEqual(result['errors'], expected_errors)
+            self.assertGreater(len(result['dispatched']), 0)
+
+            # The next call to each shard reads its own reply and not a stale one.
+            self.assertEqual(len(host.get_workflow_ids()), 10)
+            stats = host.get_stats()
+            self.assertEqual(sum([s['workflows'] for s in stats.values()]), 10)
+
+    def test_pause_and_resume(self):
+        with hosting.ConductorHost(shards=2) as host:
+            dispatched = host.add('wf1', self.get_conductor('wf1'))
+
+            self.assertListEqual(host.request_workflow_status('wf1', statuses.PAUSING), [])
+
+            result = self.complete(host, dispatched)
+            self.assertDictEqual(result['statuses'], {'wf1': statuses.PAUSED})
+            self.assertListEqual(result['dispatched'], [])
+
+            dispatched = host.request_workflow_status('wf1', statuses.RESUMING)
+            self.assertEqual(len(dispatched), 1)
+            self.assertEqual(dispatched[0]['task_id'], 'task2')
+
+    def test_resize(self):
+        with hosting.ConductorHost(shards=2) as host:
+            dispatched = []
+
+            for i in range(0, 30):
+                dispatched.extend(host.add('wf%s' % i, self.get_conductor('wf%s' % i)))
+
+            # Grow while the first actions are in progress. The workflows
+            # are handed over to the new shard with their actions in progress.
+            result = host.resize(3)
+
+            self.assertListEqual(host.get_shards(), [0, 1, 2])
+            self.assertGreater(result['moved'], 0)
+            self.assertLess(result['moved'], 30)
+            self.assertListEqual(result['dispatched'], [])
+
+            stats = host.get_stats()
+            self.assertEqual(sum([s['active'] for s in stats.values()]), 30)
+            self.assertGreater(stats[2]['workflows'], 0)
+
+            completed = self.run_to_completion(host, dispatched)
+            self.assertEqual(len(completed), 30)
+
+            # Shrink and check the workflows are still reachable.
+            host.resize(1)
+
+            self.assertListEqual(host.get_shards(), [0])
+            self.assertEqual(len(host.get_workflow_ids()), 30)
+
+            for i in range(0, 30):
+                conductor = host.get_conductor('wf%s' % i)
+                self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+
+class ConductorHostBenchmarkTest(unittest.TestCase):
+
+    def test_benchmark(self):
+        cmd = [sys.executable, BENCHMARK_SCRIPT, '-s', '1,2', '-w', '10', '-i', '2']
+        output = subprocess.check_output(cmd).decode('utf-8')
+        results = [json.loads(line) for line in output.strip().split('\n')]
+
+        self.assertListEqual([r['shards'] for r in results], [1, 2])
+
+        for result in results:
+            self.assertEqual(result['completed'], 10)
+            self.assertEqual(result['events'], 30)
+            self.assertGreater(result['events_per_second'], 0)
@@ -0,0 +1,80 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import subprocess
+import sys
+import unittest
+
+
+# Modules with heavy dependencies that are only imported on first use.
+DEFERRED_MODULES = [
+    'jinja2',
+    'jsonschema',
+    'networkx',
+    'stevedore',
+    'yaml',
+    'yaql'
+]
+
+# Generous upper bound on the time to import the conductor so the test is not flaky on slow
+# machines but still catches regressions such as building an expression environment on import.
+MAX_IMPORT_TIME = 0.5
+
+IMPORT_SCRIPT = """
+import json
+import sys
+import time
+
+start = time.time()
+
+import orquesta.conducting
+
+elapsed = time.time() - start
+
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules.keys())}))
+"""
+
+
+class ImportTimeTest(unittest.TestCase):
+
+    def _import(self):
+        output = subprocess.check_output([sys.executable, '-c', IMPORT_SCRIPT])
+
+        return json.loads(output.decode('utf-8'))
+
+    def test_deferred_modules_not_imported(self):
+        result = self._import()
+
+        imported = [
+            m for m in result['modules']
+            if m.split('.')[0] in DEFERRED_MODULES
+        ]
+
+        self.assertListEqual(imported, [])
+
+    def test_expression_functions_not_loaded(self):
+        code = (
+            'import sys; '
+            'from orquesta.expressions import jinja, yql; '
+            'assert jinja.JinjaEvaluator._custom_functions is None; '
+            'assert yql.YAQLEvaluator._custom_functions is None; '
+            'assert "orquesta.expressions.functions.workflow" not in sys.modules'
+        )
+
+        self.assertEqual(subprocess.call([sys.executable, '-c', code]), 0)
+
+    def test_import_time(self):
+        # Take the best of a few runs to reduce noise from the machine.
+        elapsed = min([self._import()['elapsed'] for i in range(0, 3)])
+
+        self.assertLess(elapsed, MAX_IMPORT_TIME)
@@ -0,0 +1,166 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import orquesta
+from orquesta.tests.fixtures import loader as fixture_loader
+from orquesta.utils import cache as cache_util
+from orquesta.utils import specs as spec_util
+
+
+INSPECT_SCRIPT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(orquesta.__file__))),
+    'bin/orquesta-inspect'
+)
+
+INVALID_WF_DEF = """
+version: 1.0
+
+tasks:
+  task1:
+    action: core.noop
+    next:
+      - do: task2
+"""
+
+
+class InspectScriptTest(unittest.TestCase):
+
+    def setUp(self):
+        super(InspectScriptTest, self).setUp()
+        self.temp_dir = tempfile.mkdtemp()
+
+        for fixture_type, wf_name in [('native', 'sequential'), ('mistral', 'sequential')]:
+            dir_path = os.path.join(self.temp_dir, fixture_type)
+            os.makedirs(dir_path)
+
+            fixture_path = os.path.join(
+                fixture_loader.get_workflow_fixtures_base_path(),
+                fixture_type,
+                '%s.yaml' % wf_name
+            )
+
+            shutil.copy(fixture_path, dir_path)
+
+        with open(os.path.join(self.temp_dir, 'native', 'README.txt'), 'w') as f:
+            f.write('Not a workflow definition.')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        super(InspectScriptTest, self).tearDown()
+
+    def _run(self, *args):
+        cmd = [sys.executable, INSPECT_SCRIPT] + list(args)
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+        output = process.communicate()[0].decode('utf-8')
+
+        return process.returncode, output
+
+    def _write_invalid_wf_def(self):
+        file_path = os.path.join(self.temp_dir, 'invalid.yml')
+
+        with open(file_path, 'w') as f:
+            f.write(INVALID_WF_DEF)
+
+        return file_path
+
+    def test_inspect_directory(self):
+        returncode, output = self._run(self.temp_dir, '--workers', '2')
+        report = json.loads(output)
+
+        expected_results = [
+            (os.path.join(self.temp_dir, 'mistral', 'sequential.yaml'), 'mistral'),
+            (os.path.join(self.temp_dir, 'native', 'sequential.yaml'), 'native')
+        ]
+
+        actual_results = [(r['file'], r['catalog']) for r in report['results']]
+
+        self.assertEqual(returncode, 0)
+        self.assertListEqual(actual_results, expected_results)
+        self.assertListEqual([r['errors'] for r in report['results']], [{}, {}])
+        self.assertEqual(report['summary']['files'], 2)
+        self.assertEqual(report['summary']['failed'], 0)
+        self.assertEqual(report['summary']['cached'], 0)
+
+    def test_inspect_glob_without_duplicates(self):
+        file_path = os.path.join(self.temp_dir, 'native', 'sequential.yaml')
+        pattern = os.path.join(self.temp_dir, '*', '*.yaml')
+
+        returncode, output = self._run(file_path, pattern, self.temp_dir, '--workers', '1')
+        report = json.loads(output)
+
+        expected_files = [
+            file_path,
+            os.path.join(self.temp_dir, 'mistral', 'sequential.yaml')
+        ]
+
+        self.assertEqual(returncode, 0)
+        self.assertListEqual([r['file'] for r in report['results']], expected_files)
+
+    def test_inspect_with_errors(self):
+        file_path = self._write_invalid_wf_def()
+        missing_file_path = os.path.join(self.temp_dir, 'missing.yaml')
+
+        returncode, output = self._run(file_path, missing_file_path, '--workers', '1')
+        results = json.loads(output)['results']
+
+        self.assertEqual(returncode, 1)
+        self.assertListEqual([r['file'] for r in results], [file_path, missing_file_path])
+        self.assertIn('semantics', results[0]['errors'])
+        self.assertIn('load', results[1]['errors'])
+
+    def test_inspect_with_cache_dir(self):
+        cache_dir = os.path.join(self.temp_dir, 'cache')
+        file_path = os.path.join(self.temp_dir, 'native', 'sequential.yaml')
+
+        for cached in [False, True]:
+            returncode, output = self._run(file_path, '--cache-dir', cache_dir)
+            report = json.loads(output)
+
+            self.assertEqual(returncode, 0)
+            self.assertEqual(report['results'][0]['cached'], cached)
+            self.assertEqual(report['summary']['cached'], int(cached))
+
+        # The results are stored in the inspection cache of the specs.
+        with open(file_path, 'r') as f:
+            wf_spec = spec_util.instantiate('native', spec_util.load_definition(f.read()))
+
+        cache = cache_util.FileCache(cache_dir)
+        self.assertDictEqual(cache.get(wf_spec.get_inspection_cache_key()), {})
+
+    def test_inspect_with_bad_workers(self):
+        file_path = os.path.join(self.temp_dir, 'native', 'sequential.yaml')
+
+        for workers in ['0', '-1', 'foobar']:
+            cmd = [sys.executable, INSPECT_SCRIPT, file_path, '--workers', workers]
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            error = process.communicate()[1].decode('utf-8')
+
+            self.assertEqual(process.returncode, 2)
+            self.assertIn('--workers', error)
+
+    def test_inspect_text_format(self):
+        file_path = self._write_invalid_wf_def()
+
+        returncode, output = self._run(file_path, '--format', 'text', '--workers', '1')
+        lines = output.strip().split('\n')
+
+        self.assertEqual(returncode, 1)
+        self.assertTrue(lines[0].startswith('FAILED %s [native]' % file_path))
+        self.assertTrue(lines[-1].startswith('Inspected 1 file(s)'))
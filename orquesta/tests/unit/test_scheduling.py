@@ -0,0 +1,340 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import unittest
+
+from orquesta import conducting
+from orquesta import events
+from orquesta import scheduling
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.fixtures import loader as fixture_loader
+
+
+WITH_ITEMS_WF_DEF = """
+version: 1.0
+
+input:
+  - xs
+
+tasks:
+  task1:
+    with: <% ctx(xs) %>
+    action: core.echo message=<% item() %>
+    next:
+      - publish:
+          - items: <% result() %>
+
+output:
+  - items: <% ctx(items) %>
+"""
+
+
+class WorkflowSchedulerTest(unittest.TestCase):
+
+    def get_conductor(self, wf_def, inputs=None):
+        spec = native_specs.WorkflowSpec(wf_def)
+        conductor = conducting.WorkflowConductor(spec, inputs=inputs)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        return conductor
+
+    def get_items_conductor(self, count):
+        return self.get_conductor(WITH_ITEMS_WF_DEF, inputs={'xs': list(range(count))})
+
+    def complete(self, scheduler, dispatch, status=statuses.SUCCEEDED, result=None):
+        context = {'item_id': dispatch['item_id']} if 'item_id' in dispatch else None
+
+        if result is None and dispatch['input']:
+            result = dispatch['input'].get('message')
+
+        ac_ex_event = events.ActionExecutionEvent(status, result=result, context=context)
+
+        return scheduler.update_task_state(
+            dispatch['workflow_id'],
+            dispatch['task_id'],
+            dispatch['route'],
+            ac_ex_event
+        )
+
+    def test_invalid_policy(self):
+        self.assertRaises(ValueError, scheduling.WorkflowScheduler, policy='foobar')
+
+    def test_add_and_remove(self):
+        scheduler = scheduling.WorkflowScheduler()
+        conductor = self.get_items_conductor(2)
+
+        scheduler.add('wf1', conductor)
+        self.assertIn('wf1', scheduler)
+        self.assertEqual(len(scheduler), 1)
+        self.assertRaises(KeyError, scheduler.add, 'wf1', conductor)
+        self.assertRaises(ValueError, scheduler.add, 'wf2', conductor, weight=0)
+
+        self.assertIs(scheduler.remove('wf1'), conductor)
+        self.assertNotIn('wf1', scheduler)
+        self.assertRaises(KeyError, scheduler.get_conductor, 'wf1')
+
+    def test_add_with_active_actions(self):
+        scheduler = scheduling.WorkflowScheduler(max_active=3)
+        scheduler.add('wf1', self.get_items_conductor(4), active=[('task1', 0, 3)])
+
+        self.assertListEqual(scheduler.get_workflow_ids(), ['wf1'])
+        self.assertEqual(scheduler.get_active_count('wf1'), 1)
+        self.assertListEqual(scheduler.get_active_actions('wf1'), [('task1', 0, 3)])
+
+        dispatched = scheduler.schedule()
+        self.assertListEqual([d['item_id'] for d in dispatched], [0, 1])
+
+        # The completion of the action that is handed over releases its slot.
+        self.complete(scheduler, {'workflow_id': 'wf1', 'task_id': 'task1', 'route': 0,
+                                  'item_id': 3, 'input': {'message': 3}})
+
+        self.assertEqual(scheduler.get_active_count('wf1'), 2)
+        self.assertListEqual([d['item_id'] for d in scheduler.schedule()], [2])
+
+    def test_completion_of_action_not_dispatched(self):
+        scheduler = scheduling.WorkflowScheduler(max_active=2)
+        scheduler.add('wf1', self.get_items_conductor(4))
+
+        dispatched = scheduler.schedule()
+        self.assertListEqual([d['item_id'] for d in dispatched], [0, 1])
+
+        # The item is started and completed outside of the scheduler.
+        dispatch = {'workflow_id': 'wf1', 'task_id': 'task1', 'route': 0, 'item_id': 2,
+                    'input': {'message': 2}}
+
+        self.complete(scheduler, dispatch, status=statuses.RUNNING)
+        self.complete(scheduler, dispatch)
+
+        # The slots of the actions dispatched by the scheduler are not released.
+        self.assertEqual(scheduler.get_active_count(), 2)
+        self.assertEqual(scheduler.get_active_count('wf1'), 2)
+        self.assertEqual(scheduler.get_stats()['completed'], 0)
+        self.assertListEqual(scheduler.schedule(), [])
+
+        self.complete(scheduler, dispatched[0])
+        self.assertEqual(scheduler.get_active_count(), 1)
+        self.assertListEqual([d['item_id'] for d in scheduler.schedule()], [3])
+
+    def test_round_robin(self):
+        scheduler = scheduling.WorkflowScheduler()
+
+        for wf_ex_id in ['wf1', 'wf2', 'wf3']:
+            scheduler.add(wf_ex_id, self.get_items_conductor(4))
+
+        dispatched = scheduler.schedule(limit=6)
+
+        self.assertListEqual(
+            [d['workflow_id'] for d in dispatched],
+            ['wf1', 'wf2', 'wf3', 'wf1', 'wf2', 'wf3']
+        )
+
+        self.assertListEqual([d['item_id'] for d in dispatched], [0, 0, 0, 1, 1, 1])
+        self.assertEqual(scheduler.get_active_count(), 6)
+        self.assertEqual(scheduler.get_active_count('wf1'), 2)
+
+        # The remaining items are dispatched without asking the conductors again.
+        dispatched = scheduler.schedule()
+
+        self.assertEqual(len(dispatched), 6)
+        self.assertEqual(scheduler.get_stats()['ready'], 0)
+
+    def test_weighted(self):
+        scheduler = scheduling.WorkflowScheduler(policy=scheduling.POLICY_WEIGHTED)
+        scheduler.add('wf1', self.get_items_conductor(20), weight=1)
+        scheduler.add('wf2', self.get_items_conductor(20), weight=3)
+
+        dispatched = scheduler.schedule(limit=12)
+        counts = collections.Counter([d['workflow_id'] for d in dispatched])
+
+        self.assertEqual(counts['wf1'], 3)
+        self.assertEqual(counts['wf2'], 9)
+
+    def test_new_workflow_does_not_starve_others(self):
+        scheduler = scheduling.WorkflowScheduler()
+        scheduler.add('wf1', self.get_items_conductor(10))
+        scheduler.schedule(limit=5)
+
+        # The new workflow starts at the current virtual time and shares the
+        # capacity instead of taking it over until it catches up with the first.
+        scheduler.add('wf2', self.get_items_conductor(10))
+        dispatched = scheduler.schedule(limit=4)
+
+        self.assertListEqual(
+            [d['workflow_id'] for d in dispatched],
+            ['wf2', 'wf1', 'wf2', 'wf1']
+        )
+
+    def test_max_active(self):
+        scheduler = scheduling.WorkflowScheduler(max_active=3)
+
+        for wf_ex_id in ['wf1', 'wf2']:
+            scheduler.add(wf_ex_id, self.get_items_conductor(3))
+
+        dispatched = scheduler.schedule()
+        self.assertEqual(len(dispatched), 3)
+        self.assertListEqual(scheduler.schedule(), [])
+
+        # Completing an action frees a slot for the next action.
+        self.complete(scheduler, dispatched[0])
+        self.assertEqual(scheduler.get_active_count(), 2)
+        self.assertEqual(len(scheduler.schedule()), 1)
+
+    def test_run_to_completion(self):
+        wf_def = fixture_loader.get_fixture_content('native/sequential.yaml', 'workflows', raw=True)
+        scheduler = scheduling.WorkflowScheduler(max_active=10)
+
+        for i in range(30):
+            scheduler.add('wf%s' % i, self.get_conductor(wf_def, inputs={'name': 'wf%s' % i}))
+
+        completed = {}
+        dispatched = scheduler.schedule()
+
+        while dispatched:
+            self.assertLessEqual(scheduler.get_active_count(), 10)
+
+            for dispatch in dispatched:
+                status = self.complete(scheduler, dispatch)
+
+                if status in statuses.COMPLETED_STATUSES:
+                    completed[dispatch['workflow_id']] = status
+
+            dispatched = scheduler.schedule()
+
+        self.assertEqual(len(completed), 30)
+        self.assertSetEqual(set(completed.values()), set([statuses.SUCCEEDED]))
+
+        for i in range(30):
+            conductor = scheduler.remove('wf%s' % i)
+            expected_output = {'greeting': 'wf%s, All your base are belong to us!' % i}
+            self.assertDictEqual(conductor.get_workflow_output(), expected_output)
+
+        self.assertEqual(scheduler.get_stats()['dispatched'], 90)
+        self.assertEqual(scheduler.get_stats()['completed'], 90)
+
+    def test_evict_and_restore(self):
+        scheduler = scheduling.WorkflowScheduler()
+        scheduler.add('wf1', self.get_items_conductor(2))
+
+        # The workflow is not idle until the ready actions are dispatched.
+        self.assertRaises(ValueError, scheduler.evict, 'wf1')
+
+        dispatched = scheduler.schedule()
+        self.assertEqual(len(dispatched), 2)
+
+        self.assertTrue(scheduler.evict('wf1'))
+        self.assertFalse(scheduler.is_loaded('wf1'))
+        self.assertIn('wf1', scheduler.store)
+        self.assertFalse(scheduler.evict('wf1'))
+
+        # The conductor is restored when an event for the workflow is received.
+        for dispatch in dispatched:
+            self.complete(scheduler, dispatch)
+
+        self.assertTrue(scheduler.is_loaded('wf1'))
+        self.assertNotIn('wf1', scheduler.store)
+
+        conductor = scheduler.get_conductor('wf1')
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertDictEqual(conductor.get_workflow_output(), {'items': [0, 1]})
+
+        stats = scheduler.get_stats()
+        self.assertEqual(stats['evicted'], 1)
+        self.assertEqual(stats['restored'], 1)
+
+    def test_max_loaded(self):
+        wf_def = fixture_loader.get_fixture_content('native/sequential.yaml', 'workflows', raw=True)
+        scheduler = scheduling.WorkflowScheduler(max_loaded=5)
+
+        for i in range(20):
+            scheduler.add('wf%s' % i, self.get_conductor(wf_def, inputs={'name': 'wf%s' % i}))
+
+        dispatched = scheduler.schedule()
+
+        while dispatched:
+            self.assertLessEqual(scheduler.get_stats()['loaded'], 5)
+
+            for dispatch in dispatched:
+                self.complete(scheduler, dispatch)
+
+            dispatched = scheduler.schedule()
+
+        self.assertGreater(scheduler.get_stats()['evicted'], 0)
+
+        for i in range(20):
+            conductor = scheduler.get_conductor('wf%s' % i)
+            self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+    def test_evict_idle(self):
+        scheduler = scheduling.WorkflowScheduler(idle_timeout=0)
+
+        for wf_ex_id in ['wf1', 'wf2']:
+            scheduler.add(wf_ex_id, self.get_items_conductor(2))
+
+        self.assertListEqual(scheduler.evict_idle(), [])
+
+        scheduler.schedule()
+
+        self.assertListEqual(sorted(scheduler.evict_idle()), ['wf1', 'wf2'])
+        self.assertEqual(scheduler.get_stats()['loaded'], 0)
+        self.assertListEqual(scheduler.evict_idle(idle_timeout=3600), [])
+
+    def test_pause_and_resume(self):
+        scheduler = scheduling.WorkflowScheduler()
+        scheduler.add('wf1', self.get_items_conductor(4))
+
+        dispatched = scheduler.schedule(limit=2)
+        scheduler.request_workflow_status('wf1', statuses.PAUSING)
+
+        # The ready actions are dropped once the workflow is pausing.
+        self.assertListEqual(scheduler.schedule(), [])
+
+        for dispatch in dispatched:
+            self.complete(scheduler, dispatch)
+
+        self.assertEqual(scheduler.get_conductor('wf1').get_workflow_status(), statuses.PAUSED)
+
+        scheduler.request_workflow_status('wf1', statuses.RESUMING)
+        dispatched = scheduler.schedule()
+
+        self.assertListEqual([d['item_id'] for d in dispatched], [2, 3])
+
+    def test_task_with_no_action(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            next:
+              - publish: xyz=123
+                do: task2
+          task2:
+            action: core.echo message=<% ctx(xyz) %>
+        """
+
+        scheduler = scheduling.WorkflowScheduler()
+        scheduler.add('wf1', self.get_conductor(wf_def))
+
+        dispatched = scheduler.schedule()
+
+        expected = [
+            {
+                'workflow_id': 'wf1',
+                'task_id': 'task2',
+                'route': 0,
+                'action': 'core.echo',
+                'input': {'message': 123}
+            }
+        ]
+
+        self.assertListEqual(dispatched, expected)
@@ -0,0 +1,106 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from orquesta.utils import cache as cache_util
+
+
+class CacheUtilsTest(unittest.TestCase):
+
+    def setUp(self):
+        super(CacheUtilsTest, self).setUp()
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        super(CacheUtilsTest, self).tearDown()
+
+    def test_get_digest(self):
+        self.assertEqual(
+            cache_util.get_digest({'a': 1, 'b': [1, 2, 3]}),
+            cache_util.get_digest({'b': [1, 2, 3], 'a': 1})
+        )
+
+        self.assertNotEqual(
+            cache_util.get_digest({'a': 1, 'b': [1, 2, 3]}),
+            cache_util.get_digest({'a': 1, 'b': [3, 2, 1]})
+        )
+
+    def test_lru_cache(self):
+        cache = cache_util.LRUCache(max_size=2)
+
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+
+        # Entry b is evicted since entry a is more recently used.
+        cache.set('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('b', 'foobar'), 'foobar')
+
+        cache.delete('a')
+        self.assertNotIn('a', cache)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_cache_bad_max_size(self):
+        self.assertRaises(ValueError, cache_util.LRUCache, max_size=0)
+        self.assertRaises(ValueError, cache_util.LRUCache, max_size='foobar')
+
+    def test_file_cache(self):
+        cache_dir = os.path.join(self.cache_dir, 'inspection')
+        cache = cache_util.FileCache(cache_dir)
+        self.assertTrue(os.path.isdir(cache_dir))
+
+        key = cache_util.get_digest('foobar')
+        value = {'syntax': [{'message': 'foobar', 'spec_path': None, 'schema_path': None}]}
+
+        self.assertNotIn(key, cache)
+        self.assertIsNone(cache.get(key))
+
+        cache.set(key, value)
+        self.assertIn(key, cache)
+        self.assertDictEqual(cache.get(key), value)
+
+        # Entries are persisted and available to other instances.
+        self.assertDictEqual(cache_util.FileCache(cache_dir).get(key), value)
+
+        cache.delete(key)
+        self.assertNotIn(key, cache)
+
+        cache.set(key, value)
+        cache.clear()
+        self.assertNotIn(key, cache)
+
+    def test_file_cache_bad_path(self):
+        self.assertRaises(ValueError, cache_util.FileCache, None)
+
+    def test_file_cache_value_not_serializable(self):
+        cache = cache_util.FileCache(self.cache_dir)
+        key = cache_util.get_digest('foobar')
+
+        # The entry is not written and the temporary file is removed.
+        cache.set(key, {'foobar': object()})
+
+        self.assertNotIn(key, cache)
+
+        for root, dirs, files in os.walk(self.cache_dir):
+            self.assertListEqual(files, [])
@@ -18,6 +18,35 @@ from orquesta.utils import context as ctx_util
 
 class ContextUtilTest(unittest.TestCase):
 
+    def test_copy_context(self):
+        state = {'tasks': {'t1__r0': 0}, 'sequence': [{'id': 't1', 'status': 'running'}]}
+        context = {'var1': {'foo': 'bar'}, '__state': state}
+
+        ctx = ctx_util.copy_context(context)
+
+        self.assertDictEqual(ctx, context)
+        self.assertIsNot(ctx['var1'], context['var1'])
+        self.assertIs(ctx['__state'], state)
+
+    def test_set_current_task_shares_state(self):
+        state = {'tasks': {}, 'sequence': []}
+        context = {'var1': 'foobar', '__state': state}
+
+        ctx = ctx_util.set_current_task(context, {'id': 't1', 'route': 0})
+
+        self.assertIs(ctx['__state'], state)
+        self.assertNotIn('__current_task', context)
+
+    def test_set_current_item_shares_state(self):
+        state = {'tasks': {}, 'sequence': []}
+        context = {'var1': {'foo': 'bar'}, '__state': state}
+
+        ctx = ctx_util.set_current_item(context, 'fee')
+
+        self.assertIs(ctx['__state'], state)
+        self.assertIsNot(ctx['var1'], context['var1'])
+        self.assertNotIn('__current_item', context)
+
     def test_set_current_task(self):
         context = {'var1': 'foobar'}
         task = {'id': 't1', 'route': 0}
@@ -0,0 +1,31 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from orquesta.utils import imports as import_util
+
+
+class LazyModuleTest(unittest.TestCase):
+
+    def test_lazy_import(self):
+        module = import_util.lazy_import('json')
+
+        self.assertFalse(module.is_loaded())
+        self.assertEqual(module.dumps({'a': 1}), '{"a": 1}')
+        self.assertTrue(module.is_loaded())
+
+    def test_lazy_import_nonexistent_module(self):
+        module = import_util.lazy_import('foobar')
+
+        self.assertFalse(module.is_loaded())
+        self.assertRaises(ImportError, getattr, module, 'dumps')
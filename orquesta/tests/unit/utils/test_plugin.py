@@ -10,12 +10,28 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import ast
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
 import unittest
 
+import mock
+
+import orquesta
+from orquesta.composers import native as native_comp
 from orquesta import exceptions as exc
 from orquesta.utils import plugin as plugin_util
 
 
+SETUP_SCRIPT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(orquesta.__file__))),
+    'setup.py'
+)
+
+
 class FakePlugin(object):
     pass
 
@@ -46,3 +62,105 @@ class PluginFactoryTest(unittest.TestCase):
             plugin_util.get_module,
             'orquesta.tests',
             'foobar')
+
+
+class PluginRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        super(PluginRegistryTest, self).setUp()
+        self.temp_dir = tempfile.mkdtemp()
+        plugin_util.clear()
+
+    def tearDown(self):
+        plugin_util.configure(discovery=True, path='')
+        plugin_util.clear()
+        shutil.rmtree(self.temp_dir)
+        super(PluginRegistryTest, self).tearDown()
+
+    @mock.patch.object(plugin_util, 'scan_entry_points', return_value={})
+    def test_get_builtin_module_without_scan(self, scan):
+        self.assertEqual(
+            plugin_util.get_module('orquesta.composers', 'native'),
+            native_comp.WorkflowComposer
+        )
+
+        scan.assert_not_called()
+
+    def test_builtins_match_setup_entry_points(self):
+        with open(SETUP_SCRIPT, 'r') as f:
+            tree = ast.parse(f.read())
+
+        setup_kwargs = {
+            kw.arg: kw.value
+            for node in ast.walk(tree) if isinstance(node, ast.Call)
+            for kw in node.keywords
+        }
+
+        entry_points = {
+            namespace: dict(tuple(s.strip() for s in ep.split('=', 1)) for ep in eps)
+            for namespace, eps in ast.literal_eval(setup_kwargs['entry_points']).items()
+            if namespace != 'orquesta.tests'
+        }
+
+        self.assertDictEqual(plugin_util._PLUGIN_BUILTINS, entry_points)
+
+    def test_get_module_with_discovery_disabled(self):
+        plugin_util.configure(discovery=False)
+
+        with mock.patch.object(plugin_util, 'scan_entry_points') as scan:
+            plugins = plugin_util.get_plugins('orquesta.expressions.evaluators')
+
+            self.assertListEqual(sorted(plugins.keys()), ['jinja', 'yaql'])
+
+            self.assertRaises(
+                exc.PluginFactoryError,
+                plugin_util.get_module,
+                'orquesta.tests',
+                'fake'
+            )
+
+            scan.assert_not_called()
+
+    def test_get_plugins_with_discovery(self):
+        plugins = plugin_util.get_plugins('orquesta.tests')
+
+        self.assertDictEqual(plugins, {'fake': 'orquesta.tests.unit.utils.test_plugin:FakePlugin'})
+
+    def test_scan_entry_points_without_importlib_metadata(self):
+        # Import pkg_resources in advance since it uses import_module while it is imported.
+        import pkg_resources  # noqa
+
+        with mock.patch.object(plugin_util.importlib, 'import_module', side_effect=ImportError):
+            entry_points = plugin_util.scan_entry_points('orquesta.tests')
+
+        self.assertDictEqual(
+            entry_points,
+            {'fake': 'orquesta.tests.unit.utils.test_plugin:FakePlugin'}
+        )
+
+    def test_discovery_index(self):
+        plugin_util.configure(path=self.temp_dir)
+        scan = plugin_util.scan_entry_points
+
+        with mock.patch.object(plugin_util, 'scan_entry_points', wraps=scan) as mock_scan:
+            self.assertIn('fake', plugin_util.discover('orquesta.tests'))
+            self.assertEqual(mock_scan.call_count, 1)
+
+        # Clear the entry points in memory and ensure the index is used instead of a scan.
+        plugin_util.clear()
+
+        with mock.patch.object(plugin_util, 'scan_entry_points', wraps=scan) as mock_scan:
+            self.assertIn('fake', plugin_util.discover('orquesta.tests'))
+            mock_scan.assert_not_called()
+
+    def test_import_without_discovery(self):
+        code = (
+            'import sys; '
+            'import orquesta.conducting; '
+            'from orquesta.utils import plugin; '
+            'assert "stevedore" not in sys.modules; '
+            'assert "importlib_metadata" not in sys.modules; '
+            'assert not plugin._PLUGIN_ENTRY_POINTS'
+        )
+
+        self.assertEqual(subprocess.call([sys.executable, '-c', code]), 0)
@@ -12,6 +12,9 @@
 
 import unittest
 
+import jsonschema
+import mock
+
 from orquesta import exceptions as exc
 from orquesta.utils import schema as schema_util
 
@@ -349,3 +352,149 @@ class SchemaUtilsTest(unittest.TestCase):
         }
 
         self.assertDictEqual(expected, schema_util.merge_schema(s1, s2))
+
+
+class SchemaCompileTest(unittest.TestCase):
+
+    def tearDown(self):
+        schema_util.set_validator_backend('compiled')
+        super(SchemaCompileTest, self).tearDown()
+
+    def assert_compiled_schema(self, schema, instances):
+        check = schema_util.compile_schema(schema)
+        validator = jsonschema.Draft4Validator(schema)
+
+        for instance in instances:
+            self.assertEqual(
+                check(instance),
+                validator.is_valid(instance),
+                'Compiled schema does not match jsonschema for %s.' % repr(instance)
+            )
+
+    def test_type(self):
+        instances = [None, True, False, 0, 1, 1.5, 'a', u'b', [], {}]
+
+        for schema_type in schema_util.SCHEMA_TYPE_CHECKS.keys():
+            self.assert_compiled_schema({'type': schema_type}, instances)
+
+        self.assert_compiled_schema({'type': ['string', 'null']}, instances)
+
+    def test_object(self):
+        schema = {
+            'type': 'object',
+            'properties': {
+                'a': {'type': 'integer', 'minimum': 0, 'exclusiveMinimum': True},
+                'b': {'type': 'string', 'minLength': 1, 'pattern': '^[a-z]+$'}
+            },
+            'patternProperties': {
+                '^x-': {'type': 'boolean'}
+            },
+            'required': ['a'],
+            'additionalProperties': False,
+            'minProperties': 1,
+            'maxProperties': 3
+        }
+
+        instances = [
+            {'a': 1},
+            {'a': 0},
+            {'a': 1, 'b': 'abc'},
+            {'a': 1, 'b': 'ABC'},
+            {'a': 1, 'b': ''},
+            {'a': 1, 'x-foo': True},
+            {'a': 1, 'x-foo': 'bar'},
+            {'a': 1, 'c': 1},
+            {'a': 1, 'b': 'a', 'x-a': True, 'x-b': False},
+            {'b': 'abc'},
+            {},
+            []
+        ]
+
+        self.assert_compiled_schema(schema, instances)
+
+    def test_additional_properties_schema(self):
+        schema = {
+            'type': 'object',
+            'properties': {'a': {'type': 'string'}},
+            'additionalProperties': {'type': 'integer'}
+        }
+
+        instances = [{'a': 'b'}, {'a': 'b', 'c': 1}, {'a': 'b', 'c': 'd'}]
+
+        self.assert_compiled_schema(schema, instances)
+
+    def test_array(self):
+        schema = {
+            'type': 'array',
+            'items': {'type': ['string', 'integer']},
+            'minItems': 1,
+            'maxItems': 3,
+            'uniqueItems': True
+        }
+
+        instances = [
+            [], ['a'], ['a', 1], ['a', 'a'], [1, True], [1, 1.0], ['a', None], [1, 2, 3, 4]
+        ]
+
+        self.assert_compiled_schema(schema, instances)
+
+    def test_array_items_list(self):
+        schema = {
+            'type': 'array',
+            'items': [{'type': 'string'}, {'type': 'integer'}],
+            'additionalItems': False
+        }
+
+        instances = [[], ['a'], ['a', 1], [1, 'a'], ['a', 1, 2]]
+
+        self.assert_compiled_schema(schema, instances)
+
+    def test_combinations(self):
+        schema = {
+            'oneOf': [
+                {'type': 'string', 'enum': ['a', 'b']},
+                {'type': 'string', 'pattern': '^b'},
+                {'anyOf': [{'type': 'integer'}, {'type': 'null'}]},
+                {'type': 'object', 'not': {'required': ['a']}}
+            ]
+        }
+
+        instances = ['a', 'b', 'bc', 'c', 1, None, 1.5, {}, {'a': 1}, {'b': 1}, True, 0]
+
+        self.assert_compiled_schema(schema, instances)
+
+    def test_unsupported_keyword(self):
+        schema = {'type': 'object', 'properties': {'a': {'$ref': '#/definitions/a'}}}
+
+        self.assertRaises(ValueError, schema_util.compile_schema, schema)
+
+        # Ensure the jsonschema validator is used if the schema cannot be compiled.
+        self.assertIsInstance(schema_util.get_validator(schema), jsonschema.Draft4Validator)
+
+    def test_get_validator(self):
+        schema = {'type': 'object', 'required': ['a']}
+
+        validator = schema_util.get_validator(schema)
+        self.assertIsInstance(validator, schema_util.CompiledValidator)
+        self.assertListEqual(list(validator.iter_errors({'a': 1})), [])
+
+        expected = [e.message for e in jsonschema.Draft4Validator(schema).iter_errors({})]
+        self.assertListEqual([e.message for e in validator.iter_errors({})], expected)
+
+        validator = schema_util.get_validator(schema, backend='jsonschema')
+        self.assertIsInstance(validator, jsonschema.Draft4Validator)
+
+    def test_get_validator_backend_unavailable(self):
+        schema = {'type': 'object'}
+
+        with mock.patch.dict(
+                schema_util.SCHEMA_VALIDATOR_BACKENDS,
+                {'fastjsonschema': mock.MagicMock(side_effect=ImportError())}):
+            schema_util.set_validator_backend('fastjsonschema')
+            self.assertIsInstance(schema_util.get_validator(schema), jsonschema.Draft4Validator)
+
+    def test_set_validator_backend(self):
+        schema_util.set_validator_backend('jsonschema')
+        self.assertEqual(schema_util.get_validator_backend(), 'jsonschema')
+
+        self.assertRaises(ValueError, schema_util.set_validator_backend, 'foobar')
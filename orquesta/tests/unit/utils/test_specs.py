@@ -10,9 +10,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import glob
+import os
+
+import mock
 import yaml
 
 from orquesta.specs import loader as spec_loader
+from orquesta.tests.fixtures import loader as fixture_loader
 from orquesta.tests.unit import base as test_base
 from orquesta.utils import specs as spec_util
 
@@ -22,6 +27,11 @@ class SpecsUtilTest(test_base.WorkflowSpecTest):
     def setUp(self):
         super(SpecsUtilTest, self).setUp()
         self.spec_module = spec_loader.get_spec_module(self.spec_module_name)
+        spec_util.clear_definition_cache()
+
+    def tearDown(self):
+        spec_util.configure_definition_cache(enabled=True, max_size=128)
+        super(SpecsUtilTest, self).tearDown()
 
     def test_convert_wf_def_dict_to_spec(self):
         wf_name = 'basic'
@@ -97,6 +107,12 @@ class SpecsUtilTest(test_base.WorkflowSpecTest):
             wf_def
         )
 
+    def test_detect_catalog(self):
+        self.assertEqual(spec_util.detect_catalog({'version': 1.0}), 'native')
+        self.assertEqual(spec_util.detect_catalog({'version': '2.0'}), 'mistral')
+        self.assertRaises(ValueError, spec_util.detect_catalog, {'version': 99.0})
+        self.assertRaises(ValueError, spec_util.detect_catalog, {})
+
     def test_deserialize(self):
         wf_name = 'basic'
         wf_def = self.get_wf_def(wf_name)
@@ -106,3 +122,60 @@ class SpecsUtilTest(test_base.WorkflowSpecTest):
         self.assertIsInstance(wf_spec_2, self.spec_module.WorkflowSpec)
         self.assertEqual(wf_name, wf_spec_2.name)
         self.assertDictEqual(wf_def[wf_name], wf_spec_2.spec)
+
+    def test_yaml_loader(self):
+        expected = yaml.CSafeLoader if hasattr(yaml, 'CSafeLoader') else yaml.SafeLoader
+
+        self.assertEqual(spec_util.get_yaml_loader(), expected)
+
+    def test_load_definition_cached(self):
+        wf_def = self.get_wf_def('basic', raw=True)
+
+        with mock.patch.object(spec_util, 'load_yaml', wraps=spec_util.load_yaml) as load_yaml:
+            definition_1 = spec_util.load_definition(wf_def)
+            definition_2 = spec_util.load_definition(wf_def)
+
+            self.assertEqual(load_yaml.call_count, 1)
+
+        self.assertDictEqual(definition_1, yaml.safe_load(wf_def))
+        self.assertDictEqual(definition_2, definition_1)
+
+        # Ensure a copy of the cached definition is returned.
+        self.assertIsNot(definition_2, definition_1)
+        definition_1.pop('version')
+        self.assertIn('version', spec_util.load_definition(wf_def))
+
+    def test_load_definition_cache_disabled(self):
+        spec_util.configure_definition_cache(enabled=False)
+        wf_def = self.get_wf_def('basic', raw=True)
+
+        with mock.patch.object(spec_util, 'load_yaml', wraps=spec_util.load_yaml) as load_yaml:
+            spec_util.load_definition(wf_def)
+            spec_util.load_definition(wf_def)
+
+            self.assertEqual(load_yaml.call_count, 2)
+
+    def test_load_definition_fixtures_from_cache(self):
+        path = os.path.join(fixture_loader.get_workflow_fixtures_base_path(), '*', '*.yaml')
+        wf_defs = []
+
+        # Skip the fixtures that are not valid yaml on purpose.
+        for file_path in sorted(glob.glob(path)):
+            with open(file_path, 'r') as f:
+                text = f.read()
+
+            try:
+                yaml.safe_load(text)
+                wf_defs.append(text)
+            except yaml.YAMLError:
+                continue
+
+        expected = [yaml.load(wf_def, Loader=yaml.SafeLoader) for wf_def in wf_defs]
+
+        with mock.patch.object(spec_util, 'load_yaml', wraps=spec_util.load_yaml) as load_yaml:
+            for i in range(0, 3):
+                actual = [spec_util.load_definition(wf_def) for wf_def in wf_defs]
+                self.assertListEqual(actual, expected)
+
+            # Each unique definition is parsed once and then served from the cache.
+            self.assertEqual(load_yaml.call_count, len(set(wf_defs)))
@@ -0,0 +1,133 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+
+
+LOG = logging.getLogger(__name__)
+
+
+def get_digest(value):
+    text = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class LRUCache(object):
+
+    def __init__(self, max_size=1024):
+        if not isinstance(max_size, int) or max_size < 1:
+            raise ValueError('The max size of the cache must be a positive integer.')
+
+        self.max_size = max_size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+
+            value = self._entries.pop(key)
+            self._entries[key] = value
+
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class FileCache(object):
+
+    def __init__(self, path):
+        if not path:
+            raise ValueError('The path to the cache directory is not provided.')
+
+        self.path = os.path.abspath(path)
+
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+    def _get_file_path(self, key):
+        return os.path.join(self.path, key[:2], key + '.json')
+
+    def __contains__(self, key):
+        return os.path.isfile(self._get_file_path(key))
+
+    def get(self, key, default=None):
+        try:
+            with open(self._get_file_path(key), 'r') as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return default
+
+    def set(self, key, value):
+        file_path = self._get_file_path(key)
+        file_dir = os.path.dirname(file_path)
+        tmp_file_path = None
+
+        try:
+            if not os.path.isdir(file_dir):
+                os.makedirs(file_dir)
+
+            # Write to a temporary file first and then rename it so that concurrent
+            # readers never see a partially written entry.
+            fd, tmp_file_path = tempfile.mkstemp(dir=file_dir, suffix='.tmp')
+
+            with os.fdopen(fd, 'w') as f:
+                json.dump(value, f)
+
+            os.rename(tmp_file_path, file_path)
+            tmp_file_path = None
+        except Exception as e:
+            LOG.warning('Unable to write cache entry to "%s". %s', file_path, str(e))
+        finally:
+            # Remove the temporary file if the entry is not written.
+            if tmp_file_path and os.path.isfile(tmp_file_path):
+                os.remove(tmp_file_path)
+
+    def delete(self, key):
+        try:
+            os.remove(self._get_file_path(key))
+        except (IOError, OSError):
+            pass
+
+    def clear(self):
+        for root, dirs, files in os.walk(self.path):
+            for file_name in files:
+                if file_name.endswith('.json'):
+                    os.remove(os.path.join(root, file_name))
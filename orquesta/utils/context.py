@@ -16,6 +16,20 @@ import logging
 
 LOG = logging.getLogger(__name__)
 
+# The workflow state in the context is a snapshot taken for the evaluation of the expressions
+# and is not changed after, so the copies of the context share it instead of copying it.
+SHARED_CONTEXT_KEYS = ['__state']
+
+
+def copy_context(context):
+    ctx = copy.deepcopy({k: v for k, v in context.items() if k not in SHARED_CONTEXT_KEYS})
+
+    for key in SHARED_CONTEXT_KEYS:
+        if key in context:
+            ctx[key] = context[key]
+
+    return ctx
+
 
 def set_current_task(context, task):
     if context and not isinstance(context, dict):
@@ -27,7 +41,7 @@ def set_current_task(context, task):
     if not isinstance(task, dict):
         raise TypeError('The task is not type of dict.')
 
-    ctx = copy.deepcopy(context) if context else dict()
+    ctx = copy_context(context) if context else dict()
 
     ctx['__current_task'] = {
         'id': task.get('id'),
@@ -44,7 +58,7 @@ def set_current_item(context, item):
     if context and not isinstance(context, dict):
         raise TypeError('The context is not type of dict.')
 
-    ctx = copy.deepcopy(context) if context else dict()
+    ctx = copy_context(context) if context else dict()
     ctx['__current_item'] = item
 
     return ctx
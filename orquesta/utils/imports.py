@@ -0,0 +1,54 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import logging
+import threading
+
+
+LOG = logging.getLogger(__name__)
+
+
+class LazyModule(object):
+    # A proxy to a module that is imported on first access of an attribute so
+    # modules with heavy dependencies can be imported without the import cost.
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+        self.__dict__['_lock'] = threading.Lock()
+
+    def _load(self):
+        if self.__dict__['_module'] is None:
+            with self.__dict__['_lock']:
+                if self.__dict__['_module'] is None:
+                    self.__dict__['_module'] = importlib.import_module(self.__dict__['_name'])
+
+        return self.__dict__['_module']
+
+    def is_loaded(self):
+        return self.__dict__['_module'] is not None
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._load(), name, value)
+
+    def __repr__(self):
+        name = self.__dict__['_name']
+
+        return '<lazy module %s>' % name
+
+
+def lazy_import(name):
+    return LazyModule(name)
@@ -38,11 +38,22 @@ REGEX_INLINE_PARAM_VARIATIONS = [
     REGEX_NULL
 ]
 
-REGEX_INLINE_PARAM_VARIATIONS.extend(
-    [e._regex_pattern for e in expr_base.get_evaluators().values()]
-)
+# The patterns of the expressions are added on first use so the expression
+# evaluators are not loaded when this module is imported.
+REGEX_INLINE_PARAMS = None
 
-REGEX_INLINE_PARAMS = '([\w]+)=(%s)' % '|'.join(REGEX_INLINE_PARAM_VARIATIONS)
+
+def get_inline_params_regex():
+    global REGEX_INLINE_PARAMS
+
+    if REGEX_INLINE_PARAMS is None:
+        variations = REGEX_INLINE_PARAM_VARIATIONS + [
+            e._regex_pattern for e in expr_base.get_evaluators().values()
+        ]
+
+        REGEX_INLINE_PARAMS = '([\w]+)=(%s)' % '|'.join(variations)
+
+    return REGEX_INLINE_PARAMS
 
 
 def parse_inline_params(s, preserve_order=True):
@@ -52,7 +63,7 @@ def parse_inline_params(s, preserve_order=True):
     if s is None or not isinstance(s, six.string_types) or s == str():
         return params
 
-    for k, v in re.findall(REGEX_INLINE_PARAMS, s):
+    for k, v in re.findall(get_inline_params_regex(), s):
         # Remove leading and trailing whitespaces.
         v = v.strip()
 
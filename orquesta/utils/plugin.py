@@ -10,41 +10,174 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib
 import logging
-
-from stevedore import driver
+import os
+import sys
+import threading
 
 from orquesta import exceptions as exc
+from orquesta.utils import cache as cache_util
 
 
 LOG = logging.getLogger(__name__)
 
+# Registry of the plugins that are shipped with orquesta. The plugins are identified by the
+# import path of the target so they can be loaded without scanning the entry points of the
+# installed packages. This must be kept in sync with the entry points in setup.py.
+_PLUGIN_BUILTINS = {
+    'orquesta.composers': {
+        'native': 'orquesta.composers.native:WorkflowComposer',
+        'mistral': 'orquesta.composers.mistral:WorkflowComposer',
+        'mock': 'orquesta.composers.mock:WorkflowComposer'
+    },
+    'orquesta.expressions.evaluators': {
+        'yaql': 'orquesta.expressions.yql:YAQLEvaluator',
+        'jinja': 'orquesta.expressions.jinja:JinjaEvaluator'
+    },
+    'orquesta.expressions.functions': {
+        'ctx': 'orquesta.expressions.functions.common:ctx_',
+        'json': 'orquesta.expressions.functions.common:json_',
+        'zip': 'orquesta.expressions.functions.common:zip_',
+        'item': 'orquesta.expressions.functions.workflow:item_',
+        'task_status': 'orquesta.expressions.functions.workflow:task_status_',
+        'succeeded': 'orquesta.expressions.functions.workflow:succeeded_',
+        'failed': 'orquesta.expressions.functions.workflow:failed_',
+        'completed': 'orquesta.expressions.functions.workflow:completed_',
+        'result': 'orquesta.expressions.functions.workflow:result_'
+    }
+}
 
-def get_module(namespace, name):
+# Options for the discovery of plugins from other packages. If discovery is disabled, only
+# the builtin plugins are available. The entry points are scanned on first use and not on
+# import. If a path is given, the scanned entry points are stored in an index under the path
+# and reused by other processes until the packages in the python path are changed.
+_PLUGIN_DISCOVERY = {
+    'enabled': True,
+    'index': None
+}
+
+_PLUGIN_ENTRY_POINTS = {}
+_PLUGIN_ENTRY_POINTS_LOCK = threading.RLock()
+
+
+def configure(discovery=None, path=None):
+    if discovery is not None:
+        _PLUGIN_DISCOVERY['enabled'] = discovery
+
+    if path is not None:
+        _PLUGIN_DISCOVERY['index'] = cache_util.FileCache(path) if path else None
+
+
+def clear():
+    with _PLUGIN_ENTRY_POINTS_LOCK:
+        _PLUGIN_ENTRY_POINTS.clear()
+
+
+def get_index_key():
+    paths = [
+        (p, os.stat(p).st_mtime) for p in sys.path
+        if p and os.path.isdir(p)
+    ]
+
+    return cache_util.get_digest([sys.version, paths])
+
+
+def scan_entry_points(namespace):
+    # The entry points are read from the package metadata and the plugins are not imported.
+    # The metadata libraries are imported here since they are slow to import.
+    # On python 2.7, and on python 3 before 3.8 without the importlib_metadata backport,
+    # the entry points are read with pkg_resources from setuptools.
     try:
-        mgr = driver.DriverManager(
-            namespace=namespace,
-            name=name,
-            invoke_on_load=False
-        )
-    except RuntimeError as e:
-        raise exc.PluginFactoryError(
-            'Unable to load plugin %s.%s. %s' % (namespace, name, str(e)))
+        importlib_metadata = importlib.import_module('importlib.metadata')
+    except ImportError:
+        try:
+            importlib_metadata = importlib.import_module('importlib_metadata')
+        except ImportError:
+            importlib_metadata = None
 
-    return mgr.driver
+    if importlib_metadata is not None:
+        entry_points = importlib_metadata.entry_points()
 
+        if hasattr(entry_points, 'select'):
+            entry_points = entry_points.select(group=namespace)
+        else:
+            entry_points = entry_points.get(namespace, [])
+
+        return {ep.name: ep.value for ep in entry_points}
+
+    import pkg_resources
+
+    return {
+        ep.name: '%s:%s' % (ep.module_name, '.'.join(ep.attrs))
+        for ep in pkg_resources.iter_entry_points(namespace)  # pylint: disable=E1102
+    }
+
+
+def discover(namespace):
+    with _PLUGIN_ENTRY_POINTS_LOCK:
+        if namespace in _PLUGIN_ENTRY_POINTS:
+            return dict(_PLUGIN_ENTRY_POINTS[namespace])
+
+        index = _PLUGIN_DISCOVERY['index']
+        index_key = get_index_key() if index else None
+        entry_points = index.get(index_key, {}) if index else {}
+
+        if namespace not in entry_points:
+            entry_points[namespace] = scan_entry_points(namespace)
+
+            if index:
+                index.set(index_key, entry_points)
+
+        _PLUGIN_ENTRY_POINTS[namespace] = entry_points[namespace]
+
+        return dict(_PLUGIN_ENTRY_POINTS[namespace])
+
+
+def get_plugins(namespace):
+    plugins = {}
+
+    if _PLUGIN_DISCOVERY['enabled']:
+        plugins.update(discover(namespace))
+
+    plugins.update(_PLUGIN_BUILTINS.get(namespace, {}))
+
+    return plugins
+
+
+def get_target(namespace, name):
+    target = _PLUGIN_BUILTINS.get(namespace, {}).get(name)
+
+    if not target and _PLUGIN_DISCOVERY['enabled']:
+        target = discover(namespace).get(name)
+
+    return target
+
+
+def load_target(target):
+    module_name, attrs = target.split(':', 1)
+    value = importlib.import_module(module_name)
+
+    for attr in attrs.split('.'):
+        value = getattr(value, attr)
+
+    return value
+
+
+def get_module(namespace, name):
+    target = get_target(namespace, name)
+
+    if not target:
+        raise exc.PluginFactoryError(
+            'Unable to load plugin %s.%s. No plugin is registered with the name.' %
+            (namespace, name))
 
-def get_instance(namespace, name, *args, **kwargs):
     try:
-        mgr = driver.DriverManager(
-            namespace=namespace,
-            name=name,
-            invoke_on_load=True,
-            invoke_args=args,
-            invoke_kwds=kwargs
-        )
-    except RuntimeError as e:
+        return load_target(target)
+    except (ImportError, AttributeError, ValueError) as e:
         raise exc.PluginFactoryError(
             'Unable to load plugin %s.%s. %s' % (namespace, name, str(e)))
 
-    return mgr.driver
+
+def get_instance(namespace, name, *args, **kwargs):
+    return get_module(namespace, name)(*args, **kwargs)
@@ -11,9 +11,20 @@
 # limitations under the License.
 
 import copy
+import logging
+import numbers
+import re
+import six
 
 from orquesta import exceptions as exc
 from orquesta.utils import dictionary as dict_util
+from orquesta.utils import imports as import_util
+
+fastjsonschema = import_util.lazy_import('fastjsonschema')
+jsonschema = import_util.lazy_import('jsonschema')
+
+
+LOG = logging.getLogger(__name__)
 
 
 def get_schema_type(s):
@@ -167,3 +178,382 @@ SCHEMA_MERGE_FUNCTIONS = {
     'object': merge_object_schema,
     'array': merge_array_schema
 }
+
+
+# The validator backend to use for the schema of the specs. The jsonschema backend interprets
+# the schema on every validation. The other backends compile the schema once into functions
+# that check if the instance is valid. The jsonschema validator is only used to report errors
+# if the instance is invalid so the errors are the same regardless of the backend.
+_SCHEMA_VALIDATOR = {
+    'backend': 'compiled'
+}
+
+# Type checks that follow the semantics of the jsonschema Draft4Validator.
+SCHEMA_TYPE_CHECKS = {
+    'array': lambda x: isinstance(x, list),
+    'boolean': lambda x: isinstance(x, bool),
+    'integer': lambda x: isinstance(x, six.integer_types) and not isinstance(x, bool),
+    'null': lambda x: x is None,
+    'number': lambda x: isinstance(x, numbers.Number) and not isinstance(x, bool),
+    'object': lambda x: isinstance(x, dict),
+    'string': lambda x: isinstance(x, six.string_types)
+}
+
+# Keywords that are not used for validation or that are checked along with other keywords.
+SCHEMA_SKIPPED_KEYWORDS = [
+    '$schema',
+    'additionalItems',
+    'default',
+    'definitions',
+    'description',
+    'exclusiveMaximum',
+    'exclusiveMinimum',
+    'format',
+    'id',
+    'title'
+]
+
+
+def _compile_all(checks):
+    if not checks:
+        return lambda x: True
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def check(x):
+        for c in checks:
+            if not c(x):
+                return False
+
+        return True
+
+    return check
+
+
+def _compile_type(value, schema):
+    types = value if isinstance(value, list) else [value]
+
+    for t in types:
+        if t not in SCHEMA_TYPE_CHECKS:
+            raise ValueError('The schema type "%s" is not supported.' % str(t))
+
+    checks = [SCHEMA_TYPE_CHECKS[t] for t in types]
+
+    if len(checks) == 1:
+        return checks[0]
+
+    return lambda x: any(c(x) for c in checks)
+
+
+def _compile_properties(value, schema):
+    checks = [(k, compile_schema(v)) for k, v in six.iteritems(value)]
+
+    def check(x):
+        if not isinstance(x, dict):
+            return True
+
+        for k, c in checks:
+            if k in x and not c(x[k]):
+                return False
+
+        return True
+
+    return check
+
+
+def _compile_pattern_properties(value, schema):
+    checks = [(re.compile(k), compile_schema(v)) for k, v in six.iteritems(value)]
+
+    def check(x):
+        if not isinstance(x, dict):
+            return True
+
+        for k, v in six.iteritems(x):
+            # Let the jsonschema validator handle keys that cannot be matched by pattern.
+            if not isinstance(k, six.string_types):
+                return False
+
+            for regex, c in checks:
+                if regex.search(k) and not c(v):
+                    return False
+
+        return True
+
+    return check
+
+
+def _compile_additional_properties(value, schema):
+    if value is True:
+        return None
+
+    properties = schema.get('properties', {})
+    patterns = '|'.join(schema.get('patternProperties', {}))
+    regex = re.compile(patterns) if patterns else None
+    extra_check = compile_schema(value) if isinstance(value, dict) else None
+
+    def check(x):
+        if not isinstance(x, dict):
+            return True
+
+        for k, v in six.iteritems(x):
+            if k in properties:
+                continue
+
+            if regex is not None:
+                if not isinstance(k, six.string_types):
+                    return False
+
+                if regex.search(k):
+                    continue
+
+            if extra_check is None or not extra_check(v):
+                return False
+
+        return True
+
+    return check
+
+
+def _compile_required(value, schema):
+    return lambda x: not isinstance(x, dict) or all(k in x for k in value)
+
+
+def _compile_min_properties(value, schema):
+    return lambda x: not isinstance(x, dict) or len(x) >= value
+
+
+def _compile_max_properties(value, schema):
+    return lambda x: not isinstance(x, dict) or len(x) <= value
+
+
+def _compile_items(value, schema):
+    if isinstance(value, dict):
+        item_check = compile_schema(value)
+
+        return lambda x: not isinstance(x, list) or all(item_check(i) for i in x)
+
+    item_checks = [compile_schema(v) for v in value]
+    additional = schema.get('additionalItems', True)
+    extra_check = compile_schema(additional) if isinstance(additional, dict) else None
+
+    def check(x):
+        if not isinstance(x, list):
+            return True
+
+        for i, c in zip(x, item_checks):
+            if not c(i):
+                return False
+
+        extras = x[len(item_checks):]
+
+        if additional is False and extras:
+            return False
+
+        if extra_check is not None and not all(extra_check(i) for i in extras):
+            return False
+
+        return True
+
+    return check
+
+
+def _compile_min_items(value, schema):
+    return lambda x: not isinstance(x, list) or len(x) >= value
+
+
+def _compile_max_items(value, schema):
+    return lambda x: not isinstance(x, list) or len(x) <= value
+
+
+def _compile_unique_items(value, schema):
+    if not value:
+        return None
+
+    def check(x):
+        if not isinstance(x, list):
+            return True
+
+        # Let the jsonschema validator handle booleans which are not unique from 0 and 1.
+        if any(isinstance(i, bool) for i in x):
+            return False
+
+        for i in range(0, len(x)):
+            for j in range(i + 1, len(x)):
+                if x[i] == x[j]:
+                    return False
+
+        return True
+
+    return check
+
+
+def _compile_enum(value, schema):
+    return lambda x: x in value
+
+
+def _compile_pattern(value, schema):
+    regex = re.compile(value)
+
+    return lambda x: not isinstance(x, six.string_types) or regex.search(x) is not None
+
+
+def _compile_min_length(value, schema):
+    return lambda x: not isinstance(x, six.string_types) or len(x) >= value
+
+
+def _compile_max_length(value, schema):
+    return lambda x: not isinstance(x, six.string_types) or len(x) <= value
+
+
+def _compile_minimum(value, schema):
+    is_number = SCHEMA_TYPE_CHECKS['number']
+
+    if schema.get('exclusiveMinimum', False):
+        return lambda x: not is_number(x) or x > value
+
+    return lambda x: not is_number(x) or x >= value
+
+
+def _compile_maximum(value, schema):
+    is_number = SCHEMA_TYPE_CHECKS['number']
+
+    if schema.get('exclusiveMaximum', False):
+        return lambda x: not is_number(x) or x < value
+
+    return lambda x: not is_number(x) or x <= value
+
+
+def _compile_all_of(value, schema):
+    return _compile_all([compile_schema(v) for v in value])
+
+
+def _compile_any_of(value, schema):
+    checks = [compile_schema(v) for v in value]
+
+    return lambda x: any(c(x) for c in checks)
+
+
+def _compile_one_of(value, schema):
+    checks = [compile_schema(v) for v in value]
+
+    return lambda x: len([c for c in checks if c(x)]) == 1
+
+
+def _compile_not(value, schema):
+    not_check = compile_schema(value)
+
+    return lambda x: not not_check(x)
+
+
+SCHEMA_KEYWORD_COMPILERS = {
+    'additionalProperties': _compile_additional_properties,
+    'allOf': _compile_all_of,
+    'anyOf': _compile_any_of,
+    'enum': _compile_enum,
+    'items': _compile_items,
+    'maxItems': _compile_max_items,
+    'maxLength': _compile_max_length,
+    'maxProperties': _compile_max_properties,
+    'maximum': _compile_maximum,
+    'minItems': _compile_min_items,
+    'minLength': _compile_min_length,
+    'minProperties': _compile_min_properties,
+    'minimum': _compile_minimum,
+    'not': _compile_not,
+    'oneOf': _compile_one_of,
+    'pattern': _compile_pattern,
+    'patternProperties': _compile_pattern_properties,
+    'properties': _compile_properties,
+    'required': _compile_required,
+    'type': _compile_type,
+    'uniqueItems': _compile_unique_items
+}
+
+
+def compile_schema(schema):
+    if not isinstance(schema, dict):
+        raise ValueError('The schema is not type of dict.')
+
+    checks = []
+
+    for keyword, value in six.iteritems(schema):
+        if keyword in SCHEMA_SKIPPED_KEYWORDS:
+            continue
+
+        if keyword not in SCHEMA_KEYWORD_COMPILERS:
+            raise ValueError('The schema keyword "%s" is not supported.' % keyword)
+
+        check = SCHEMA_KEYWORD_COMPILERS[keyword](value, schema)
+
+        if check is not None:
+            checks.append(check)
+
+    return _compile_all(checks)
+
+
+def compile_fastjsonschema(schema):
+    validate = fastjsonschema.compile(schema)
+
+    def check(x):
+        try:
+            validate(x)
+        except fastjsonschema.JsonSchemaException:
+            return False
+
+        return True
+
+    return check
+
+
+SCHEMA_VALIDATOR_BACKENDS = {
+    'compiled': compile_schema,
+    'fastjsonschema': compile_fastjsonschema,
+    'jsonschema': None
+}
+
+
+class CompiledValidator(object):
+
+    def __init__(self, schema, check):
+        self.schema = schema
+        self._check = check
+        self._validator = jsonschema.Draft4Validator(schema)
+
+    def is_valid(self, instance):
+        return self._check(instance)
+
+    def iter_errors(self, instance):
+        if self._check(instance):
+            return iter([])
+
+        return self._validator.iter_errors(instance)
+
+
+def get_validator_backend():
+    return _SCHEMA_VALIDATOR['backend']
+
+
+def set_validator_backend(backend):
+    if backend not in SCHEMA_VALIDATOR_BACKENDS:
+        raise ValueError('The schema validator backend "%s" is not supported.' % backend)
+
+    _SCHEMA_VALIDATOR['backend'] = backend
+
+
+def get_validator(schema, backend=None):
+    backend = backend or get_validator_backend()
+    compiler = SCHEMA_VALIDATOR_BACKENDS.get(backend)
+
+    if compiler is None:
+        return jsonschema.Draft4Validator(schema)
+
+    try:
+        return CompiledValidator(schema, compiler(schema))
+    except Exception as e:
+        LOG.warning(
+            'Unable to compile schema with the "%s" validator backend. Falling back '
+            'to the jsonschema validator. %s', backend, str(e)
+        )
+
+        return jsonschema.Draft4Validator(schema)
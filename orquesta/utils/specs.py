@@ -10,22 +10,80 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import logging
 import six
-import yaml
 
 from orquesta.specs import loader as spec_loader
+from orquesta.utils import cache as cache_util
+from orquesta.utils import imports as import_util
+
+yaml = import_util.lazy_import('yaml')
 
 
 LOG = logging.getLogger(__name__)
 
+CATALOGS = ['native', 'mistral']
+
+# Cache of the parsed workflow definitions by the digest of the text. A copy of the cached
+# definition is returned on load since the specs may modify the definition on construction.
+_DEFINITION_CACHE = {
+    'enabled': True,
+    'memory': cache_util.LRUCache(max_size=128)
+}
+
+
+def configure_definition_cache(enabled=None, max_size=None):
+    if enabled is not None:
+        _DEFINITION_CACHE['enabled'] = enabled
+
+    if max_size is not None:
+        _DEFINITION_CACHE['memory'] = cache_util.LRUCache(max_size=max_size)
+
+
+def clear_definition_cache():
+    _DEFINITION_CACHE['memory'].clear()
+
+
+def get_yaml_loader():
+    # Use the loader that is implemented in C if PyYAML is built with libyaml.
+    return getattr(yaml, 'CSafeLoader', None) or yaml.SafeLoader
+
+
+def load_yaml(text):
+    return yaml.load(text, Loader=get_yaml_loader())
+
+
+def load_definition(text):
+    if not _DEFINITION_CACHE['enabled']:
+        return load_yaml(text)
+
+    key = cache_util.get_digest(text)
+    definition = _DEFINITION_CACHE['memory'].get(key)
+
+    if definition is None:
+        definition = load_yaml(text)
+        _DEFINITION_CACHE['memory'].set(key, definition)
+
+    return copy.deepcopy(definition)
+
+
+def detect_catalog(definition):
+    version = str(definition.get('version'))
+
+    for catalog in CATALOGS:
+        if version == str(spec_loader.get_spec_module(catalog).VERSION):
+            return catalog
+
+    raise ValueError('Unable to identify the workflow catalog from version "%s".' % version)
+
 
 def instantiate(spec_type, definition):
     if not definition:
         raise ValueError('Workflow definition is empty.')
 
     if isinstance(definition, six.string_types):
-        definition = yaml.safe_load(definition)
+        definition = load_definition(definition)
 
     if not isinstance(definition, dict):
         raise ValueError('Unable to convert workflow definition into dict.')